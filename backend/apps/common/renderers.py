@@ -0,0 +1,62 @@
+"""
+API Renderers
+
+FastJSONRenderer: drop-in for DRF's JSONRenderer built on orjson, which
+encodes str/int/dict/list/datetime/UUID natively straight to bytes. Other
+types (Decimal, lazy translations, ...) go through DRF's JSONEncoder, so
+the output is the same as JSONRenderer's. ?indent= other than 2 falls
+back to JSONRenderer.
+
+MessagePackRenderer: application/msgpack, chosen with the Accept header
+(or ?format=msgpack) by the map and mobile clients. Values that have no
+MessagePack type are converted like in JSON.
+
+Both are in DEFAULT_RENDERER_CLASSES; JSON stays the default.
+"""
+
+import msgpack
+import orjson
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+ORJSON_OPTIONS = orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS
+
+_encoder = JSONEncoder()
+
+
+def encode_default(obj):
+    """Value for a type the fast encoders don't know, as DRF's JSONEncoder would give it"""
+    return _encoder.default(obj)
+
+
+class FastJSONRenderer(JSONRenderer):
+    """JSONRenderer with orjson: same output, no intermediate str"""
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+
+        indent = self.get_indent(accepted_media_type, renderer_context or {})
+        if indent is not None and indent != 2:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        options = ORJSON_OPTIONS | (orjson.OPT_INDENT_2 if indent else 0)
+        ret = orjson.dumps(data, default=encode_default, option=options)
+
+        # Escape U+2028/U+2029 like JSONRenderer (JSON must be a JavaScript subset)
+        if b'\xe2\x80\xa8' in ret or b'\xe2\x80\xa9' in ret:
+            ret = ret.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
+        return ret
+
+
+class MessagePackRenderer(BaseRenderer):
+    """Renders to MessagePack (application/msgpack)"""
+    media_type = 'application/msgpack'
+    format = 'msgpack'
+    charset = None
+    render_style = 'binary'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        return msgpack.packb(data, default=encode_default, use_bin_type=True)
@@ -0,0 +1,363 @@
+"""
+Response Cache
+
+Caches anonymous GET responses of the public read API (events, organizers,
+gallery images) in the default cache (Redis in production, see CACHES).
+
+Keys are built from the view, host, path, normalized query params (lang
+included) and the data versions of the models the view depends on.
+Versions are bumped by the post_save/post_delete signals of those models
+(events/signals.py, gallery/signals.py), so a change invalidates every
+dependent response at once without deleting keys; stale entries expire.
+A version is bumped when the writer's transaction commits: bumped earlier,
+a concurrent GET could still read the old rows and cache them (and their
+ETag) under the new version.
+
+The same versions give every response a cheap ETag (and Last-Modified
+from the time of the latest change), so conditional GETs get a 304
+without querying or serializing anything.
+
+Entries hold the rendered body (JSON or MessagePack, per the negotiated
+renderer), so a hit is returned without serializing or encoding again.
+
+Hit/miss/bypass/not_modified counters are kept in the cache as well, so
+they are shared by all workers (see stats() and /api/cache/stats/). Each
+process counts in memory and adds its counts to the shared ones every
+RESPONSE_CACHE_STATS_INTERVAL seconds, so a request costs no extra cache
+write; other workers' latest counts show up within that interval.
+"""
+
+import functools
+import hashlib
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from typing import Iterable
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection, transaction
+from django.utils.cache import get_conditional_response, patch_cache_control, patch_vary_headers
+from django.utils.http import http_date, quote_etag
+from rest_framework.response import Response
+
+_state = threading.local()
+
+STATS = ('hit', 'miss', 'bypass', 'not_modified')
+
+# This process's counts not yet added to the shared counters
+_counts = Counter()
+_counts_lock = threading.Lock()
+_flushed_at = time.monotonic()
+
+
+def namespace() -> str:
+    # Per database, so test runs sharing a Redis with a dev server never see its entries
+    return f"response-cache:{connection.settings_dict['NAME']}"
+
+
+def timeout() -> int:
+    return getattr(settings, 'RESPONSE_CACHE_TIMEOUT', 300)
+
+
+def stats_interval() -> float:
+    return getattr(settings, 'RESPONSE_CACHE_STATS_INTERVAL', 10)
+
+
+def model_label(model) -> str:
+    return model if isinstance(model, str) else model._meta.label_lower
+
+
+def version_keys(models: Iterable) -> list[str]:
+    return [f'{namespace()}:version:{model_label(model)}' for model in models]
+
+
+def modified_keys(models: Iterable) -> list[str]:
+    return [f'{namespace()}:modified:{model_label(model)}' for model in models]
+
+
+def get_state(models: Iterable) -> tuple[list[int], float]:
+    """Data versions of models and the time of the latest change, in one cache round trip"""
+    models = list(models)
+    keys = version_keys(models) + modified_keys(models)
+    values = cache.get_many(keys)
+    now = time.time()
+    # Start versions from the clock so a version lost on eviction is never reused;
+    # an unknown change time counts as "now"
+    missing = {
+        key: time.time_ns() if ':version:' in key else now
+        for key in keys if key not in values
+    }
+    if missing:
+        cache.set_many(missing, None)
+        values.update(missing)
+    versions = [values[key] for key in keys[:len(models)]]
+    modified = max((values[key] for key in keys[len(models):]), default=now)
+    return versions, modified
+
+
+def get_versions(models: Iterable) -> list[int]:
+    return get_state(models)[0]
+
+
+def invalidate(*models):
+    """
+    Bump the data version of models when the current transaction commits
+    (right away outside one), or defer it inside deferred_invalidation()
+    """
+    labels = {model_label(model) for model in models}
+    pending = getattr(_state, 'pending_models', None)
+    if pending is not None:
+        pending.update(labels)
+    elif labels:
+        transaction.on_commit(lambda: bump(labels))
+
+
+def bump(models: Iterable):
+    """Bump the data version of models now"""
+    models = set(models)
+    for key in version_keys(models):
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.set(key, time.time_ns(), None)
+    cache.set_many({key: time.time() for key in modified_keys(models)}, None)
+
+
+@contextmanager
+def deferred_invalidation():
+    """
+    Collect invalidations and bump each model version once, when the
+    transaction open on exit commits. Use around bulk writes (e.g.
+    EventImporter) to avoid a bump per row.
+    """
+    if getattr(_state, 'pending_models', None) is not None:
+        # Nested block - the outermost one bumps
+        yield
+        return
+
+    _state.pending_models = set()
+    try:
+        yield
+    finally:
+        pending = _state.pending_models
+        _state.pending_models = None
+        invalidate(*pending)
+
+
+def normalized_params(request, set_params: Iterable[str] = ()) -> list[tuple[str, str]]:
+    """
+    Query params sorted, with empty values dropped and lang lower-cased.
+    Values of set_params are comma-separated sets: sorted and deduplicated.
+    """
+    params = []
+    for key, values in request.query_params.lists():
+        for value in values:
+            if value == '':
+                continue
+            if key == 'lang':
+                value = value.lower()
+            elif key in set_params:
+                value = ','.join(sorted({item.strip() for item in value.split(',') if item.strip()}))
+            params.append((key, value))
+    return sorted(params)
+
+
+def request_digest(request, set_params: Iterable[str] = ()) -> str:
+    # Host too: pagination links in the payload are absolute URLs
+    query = urlencode(normalized_params(request, set_params))
+    return hashlib.md5(f'{request.get_host()}{request.path}?{query}'.encode('utf-8')).hexdigest()
+
+
+def cache_key(view, request, versions: list[int]) -> str:
+    """
+    Key of the view's response to request. Views can list query params
+    whose value order doesn't matter in `cache_set_params`.
+    """
+    name = getattr(view, 'basename', None) or type(view).__name__
+    digest = request_digest(request, getattr(view, 'cache_set_params', ()))
+    # Bodies are stored encoded, so each renderer has its own entry
+    renderer = getattr(request, 'accepted_renderer', None)
+    return (
+        f"{namespace()}:{name}:{getattr(renderer, 'format', '')}:{digest}:"
+        f"{'.'.join(map(str, versions))}"
+    )
+
+
+def etag(view, request, versions: list[int]) -> str:
+    """
+    Strong validator of the response: same request and same data versions
+    mean the same payload, so nothing has to be serialized to compute it
+    """
+    return quote_etag(hashlib.md5(cache_key(view, request, versions).encode('utf-8')).hexdigest())
+
+
+def last_modified(modified: float):
+    """
+    Last-Modified timestamp for the time of the latest change. A change within
+    the current second could share it with the previous one, so it is only
+    used (None until then) once that second has passed.
+    """
+    return int(modified) if time.time() - modified >= 1 else None
+
+
+def set_validators(response, etag_value: str, timestamp):
+    response['ETag'] = etag_value
+    if timestamp is not None:
+        response['Last-Modified'] = http_date(timestamp)
+    # Let clients keep the response but revalidate it on every use
+    patch_cache_control(response, no_cache=True)
+    # JSON and MessagePack bodies of the same URL
+    patch_vary_headers(response, ['Accept'])
+
+
+class EncodedResponse(Response):
+    """
+    Response with an already rendered body (from the cache, or rendered on a miss
+    to be stored). `data` is only kept on a miss.
+    """
+
+    def __init__(self, content: bytes, content_type: str, status=None, data=None):
+        super().__init__(data, status=status, content_type=content_type)
+        self.encoded_content = content
+
+    @property
+    def rendered_content(self):
+        if self.encoded_content:
+            self['Content-Type'] = self.content_type
+        else:
+            del self['Content-Type']
+        return self.encoded_content
+
+
+def encode(view, request, response) -> EncodedResponse:
+    """Render a view's Response with the negotiated renderer, as Response.render() would"""
+    renderer = request.accepted_renderer
+    content_type = response.content_type
+    if content_type is None:
+        content_type = (
+            f'{renderer.media_type}; charset={renderer.charset}' if renderer.charset
+            else renderer.media_type
+        )
+    context = view.get_renderer_context()
+    context['response'] = response
+    content = renderer.render(response.data, request.accepted_media_type, context)
+    if isinstance(content, str):
+        content = content.encode(renderer.charset)
+
+    encoded = EncodedResponse(content, content_type, status=response.status_code, data=response.data)
+    for header, value in response.items():
+        if header != 'Content-Type':
+            encoded[header] = value
+    return encoded
+
+
+def is_cacheable(request) -> bool:
+    return (
+        request.method == 'GET'
+        and not request.user.is_authenticated
+        and 'no-cache' not in request.headers.get('Cache-Control', '')
+    )
+
+
+def count(stat: str):
+    """Count in memory; the counts go to the cache once stats_interval() has passed"""
+    with _counts_lock:
+        _counts[stat] += 1
+        due = time.monotonic() - _flushed_at >= stats_interval()
+    if due:
+        flush_stats()
+
+
+def flush_stats():
+    """Add this process's counts to the shared counters"""
+    global _flushed_at
+    with _counts_lock:
+        pending = dict(_counts)
+        _counts.clear()
+        _flushed_at = time.monotonic()
+    for stat, value in pending.items():
+        key = f'{namespace()}:stats:{stat}'
+        try:
+            cache.incr(key, value)
+        except ValueError:
+            cache.add(key, 0, None)
+            cache.incr(key, value)
+
+
+def stats() -> dict[str, int]:
+    flush_stats()
+    keys = {stat: f'{namespace()}:stats:{stat}' for stat in STATS}
+    values = cache.get_many(keys.values())
+    return {stat: values.get(key, 0) for stat, key in keys.items()}
+
+
+def reset_stats():
+    global _flushed_at
+    with _counts_lock:
+        _counts.clear()
+        _flushed_at = time.monotonic()
+    cache.delete_many([f'{namespace()}:stats:{stat}' for stat in STATS])
+
+
+def cache_response(method):
+    """
+    Cache a view method's successful responses for anonymous GETs and
+    answer conditional GETs (If-None-Match / If-Modified-Since) with 304.
+    The view lists the models its output depends on in `cache_models`.
+    """
+    @functools.wraps(method)
+    def wrapper(view, request, *args, **kwargs):
+        if request.method != 'GET':
+            return method(view, request, *args, **kwargs)
+
+        versions, modified = get_state(view.cache_models)
+        etag_value = etag(view, request, versions)
+        timestamp = last_modified(modified)
+        not_modified = get_conditional_response(
+            request._request, etag=etag_value, last_modified=timestamp
+        )
+        if not_modified is not None:
+            count('not_modified')
+            set_validators(not_modified, etag_value, timestamp)
+            return not_modified
+
+        if not is_cacheable(request):
+            count('bypass')
+            response = method(view, request, *args, **kwargs)
+            response['X-Cache'] = 'BYPASS'
+        elif (cached := cache.get(key := cache_key(view, request, versions))) is not None:
+            count('hit')
+            content, content_type, status = cached
+            response = EncodedResponse(content, content_type, status=status)
+            response['X-Cache'] = 'HIT'
+        else:
+            count('miss')
+            response = method(view, request, *args, **kwargs)
+            if response.status_code == 200 and isinstance(response, Response):
+                response = encode(view, request, response)
+                cache.set(
+                    key, (response.encoded_content, response.content_type, response.status_code),
+                    timeout(),
+                )
+            response['X-Cache'] = 'MISS'
+
+        if response.status_code == 200:
+            set_validators(response, etag_value, timestamp)
+        return response
+    return wrapper
+
+
+class CachedResponseMixin:
+    """Response caching for the list and retrieve actions of a ViewSet"""
+    cache_models = ()
+
+    @cache_response
+    def list(self, request, *args, **kwargs):
+        return super().list(request, *args, **kwargs)
+
+    @cache_response
+    def retrieve(self, request, *args, **kwargs):
+        return super().retrieve(request, *args, **kwargs)
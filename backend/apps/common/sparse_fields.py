@@ -0,0 +1,64 @@
+"""
+Sparse Fieldsets
+
+?fields=a,b,c returns only those top-level fields, ?omit=a,b drops them.
+Unknown names are ignored. Nested serializers are returned whole.
+
+Views also use the selection to build a smaller query: each serializer
+declares in Meta.field_requirements what its non-column fields need
+(model columns, or relations to join/prefetch); any other field needs
+the model field of the same name.
+"""
+
+from typing import Iterable, Optional
+
+from rest_framework.permissions import SAFE_METHODS
+
+
+def parse_names(value: Optional[str]) -> list[str]:
+    return [name.strip() for name in (value or '').split(',') if name.strip()]
+
+
+def selected_fields(request, names: Iterable[str]) -> Optional[list[str]]:
+    """
+    Names (in serializer order) left after ?fields= / ?omit=,
+    or None if the request asks for the full representation.
+    Writes always use every field.
+    """
+    if request is None or request.method not in SAFE_METHODS:
+        return None
+    fields = parse_names(request.query_params.get('fields'))
+    omit = set(parse_names(request.query_params.get('omit')))
+    if not fields and not omit:
+        return None
+    return [name for name in names if (not fields or name in fields) and name not in omit]
+
+
+def requirements(serializer_class, names: Iterable[str]) -> set[str]:
+    """What the selected fields need from the queryset (see Meta.field_requirements)"""
+    declared = getattr(serializer_class.Meta, 'field_requirements', {})
+    needs = set()
+    for name in names:
+        needs.update(declared.get(name, (name,)))
+    return needs
+
+
+def only_columns(queryset, needs: Iterable[str], *always: str):
+    """queryset.only() the concrete model fields among needs (plus always)"""
+    concrete = {field.name for field in queryset.model._meta.concrete_fields}
+    return queryset.only(*always, *(concrete & set(needs)))
+
+
+class SparseFieldsetMixin:
+    """Serializer mixin applying ?fields= / ?omit= to its top-level fields"""
+
+    def get_fields(self):
+        fields = super().get_fields()
+        root = self.parent.parent if getattr(self.parent, 'many', False) else self.parent
+        if root is not None:
+            return fields
+
+        selected = selected_fields(self.context.get('request'), fields)
+        if selected is None:
+            return fields
+        return {name: fields[name] for name in selected}
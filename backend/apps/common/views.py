@@ -0,0 +1,25 @@
+from rest_framework.permissions import IsAdminUser
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from . import response_cache
+
+
+class ResponseCacheStatsView(APIView):
+    """
+    Hit/miss/bypass counters of the API response cache (staff only).
+    URL: /api/cache/stats/ (DELETE resets the counters)
+    """
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        counters = response_cache.stats()
+        lookups = counters['hit'] + counters['miss']
+        return Response({
+            **counters,
+            'hit_ratio': round(counters['hit'] / lookups, 3) if lookups else None,
+        })
+
+    def delete(self, request):
+        response_cache.reset_stats()
+        return Response(status=204)
@@ -5,9 +5,8 @@ from django.http import HttpResponseRedirect
 from django.urls import reverse, path
 from django.utils.safestring import mark_safe
 
-from .models import Event, EventDate, Organizer, EventImage, Location
-from .services import EventImporter
-from .views import import_events_json
+from .models import Event, EventDate, Organizer, EventImage, Location, ImportJob
+from .views import import_events_json, import_job_progress, import_job_status
 
 
 class EventDateInline(admin.TabularInline):
@@ -172,6 +171,38 @@ def import_events_from_json(modeladmin, request, queryset):
 import_events_from_json.short_description = 'Importuj wydarzenia z pliku JSON'
 
 
+@admin.register(ImportJob)
+class ImportJobAdmin(admin.ModelAdmin):
+    """Import jobs are created by the JSON import view and only viewed here"""
+
+    list_display = [
+        'file_name',
+        'status',
+        'processed',
+        'imported',
+        'skipped',
+        'error_count',
+        'created_by',
+        'created_at',
+        'get_progress',
+    ]
+    list_filter = ['status', 'created_at']
+    search_fields = ['file_name']
+    readonly_fields = [
+        'file', 'file_name', 'file_size', 'checksum', 'created_by', 'status', 'processed', 'position',
+        'imported', 'skipped', 'error_count', 'errors', 'message', 'attempts',
+        'created_at', 'started_at', 'updated_at', 'finished_at',
+    ]
+
+    def has_add_permission(self, request):
+        return False
+
+    def get_progress(self, obj):
+        url = reverse('admin:events_event_import_job', args=[obj.pk])
+        return mark_safe(f'<a href="{url}">{obj.percent}%</a>')
+    get_progress.short_description = 'Postęp'
+
+
 @admin.register(Event)
 class EventAdmin(admin.ModelAdmin):
     """Admin interface for Event model"""
@@ -293,5 +324,15 @@ class EventAdmin(admin.ModelAdmin):
                 self.admin_site.admin_view(import_events_json),
                 name='events_event_import_json'
             ),
+            path(
+                'import/jobs/<int:pk>/',
+                self.admin_site.admin_view(import_job_progress),
+                name='events_event_import_job'
+            ),
+            path(
+                'import/jobs/<int:pk>/status/',
+                self.admin_site.admin_view(import_job_status),
+                name='events_event_import_job_status'
+            ),
         ]
         return custom_urls + urls
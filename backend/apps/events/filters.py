@@ -0,0 +1,243 @@
+from datetime import datetime, time, timedelta
+
+from django.db.models import Exists, F, OuterRef, Q, Subquery
+from django.db.models.functions import Least
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+from rest_framework.filters import BaseFilterBackend, SearchFilter
+
+from . import geo
+from .models import Event, EventDate
+from .services import isochrone
+
+
+class EventSearchFilter(SearchFilter):
+    """
+    ?search= for /api/events/ as PostgreSQL full-text search over the
+    stored per-language vectors (title and description, see search.py),
+    ranked best match first. An explicit ?sort= still takes precedence.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        term = request.query_params.get(self.search_param, '')
+        return queryset.search(term) if term.strip() else queryset
+
+
+class EventFilterBackend(BaseFilterBackend):
+    """
+    Server-side filters for /api/events/.
+
+    Query params (names follow openapi.yaml where it defines them):
+    - dateFrom, dateTo: YYYY-MM-DD, inclusive; events with an EventDate overlapping the range
+    - upcoming=true: events with an occurrence from now on
+    - past=true: events whose last occurrence has ended
+    - category, price_type, moderation_status: exact match (comma-separated for several)
+    - city: Location.city of the event or of any of its dates
+    - location: Location id of the event or of any of its dates
+    - lat, lng, radius (km, default 50): events at a location within the radius,
+      through Event.location or any EventDate.location
+    - lat, lng, minutes (1-120), mode=auto|pedestrian|bicycle: events at a location
+      reachable within the travel time over the road graph (replaces radius)
+    - sort=date|title|created_at|distance, order=asc|desc
+      (distance needs lat/lng and orders nearest-first by the closest location)
+
+    openapi.yaml also lists poiId; there is no POI model in this backend yet,
+    so the closest filter is location.
+    """
+    SORT_FIELDS = {
+        'date': 'next_start_date',
+        'title': 'title_pl',
+        'created_at': 'created_at',
+    }
+
+    def filter_queryset(self, request, queryset, view):
+        return self.filter_params(queryset, request.query_params)
+
+    def filter_params(self, queryset, params):
+        """Apply the filters in params (a QueryDict) to an Event queryset"""
+        date_from = self.parse_day(params.get('dateFrom'))
+        date_to = self.parse_day(params.get('dateTo'))
+        if date_from or date_to:
+            queryset = queryset.filter(Exists(self.dates_in_range(date_from, date_to)))
+
+        if params.get('upcoming') == 'true':
+            queryset = queryset.upcoming()
+        if params.get('past') == 'true':
+            queryset = queryset.past()
+
+        for param, choices in (
+            ('category', Event.CATEGORY_CHOICES),
+            ('price_type', Event.PRICE_TYPE_CHOICES),
+            ('moderation_status', Event.MODERATION_STATUS_CHOICES),
+        ):
+            values = self.parse_choices(params.get(param), choices)
+            if len(values) == 1:
+                queryset = queryset.filter(**{param: values[0]})
+            elif values:
+                queryset = queryset.filter(**{f'{param}__in': values})
+
+        if city := params.get('city'):
+            queryset = queryset.filter(
+                Q(location__city=city)
+                | Exists(EventDate.objects.filter(event=OuterRef('pk'), location__city=city))
+            )
+
+        if (location_id := params.get('location', '')).isdigit():
+            queryset = queryset.filter(
+                Q(location_id=location_id)
+                | Exists(EventDate.objects.filter(event=OuterRef('pk'), location_id=location_id))
+            )
+
+        point = geo.parse_point(params)
+        minutes = isochrone.parse_minutes(params.get('minutes'))
+        if point and minutes:
+            queryset = self.at_locations(queryset, self.reachable_locations(point, minutes, params))
+        elif point:
+            nearby = geo.locations_within(point, geo.parse_radius(params))
+            queryset = self.at_locations(queryset, nearby)
+
+        return self.sort_queryset(queryset, params, point)
+
+    def at_locations(self, queryset, locations):
+        """Events held at any of the locations (queryset of Location pks)"""
+        return queryset.filter(
+            Q(location__in=locations)
+            | Exists(EventDate.objects.filter(event=OuterRef('pk'), location__in=locations))
+        )
+
+    def reachable_locations(self, point, minutes, params):
+        """Location ids within the travel time, or a straight-line estimate without a road graph"""
+        mode = isochrone.parse_mode(params.get('mode'))
+        location_ids = isochrone.reachable_location_ids(point.y, point.x, minutes, mode)
+        if location_ids is None:
+            return geo.locations_within(point, isochrone.fallback_radius_km(minutes, mode))
+        return location_ids
+
+    def sort_queryset(self, queryset, params, point=None):
+        sort = params.get('sort')
+        if sort == 'distance' and point:
+            queryset = self.annotate_distance(queryset, point)
+            field = F('distance')
+        elif sort in self.SORT_FIELDS:
+            field = F(self.SORT_FIELDS[sort])
+        else:
+            return queryset
+
+        if params.get('order') == 'desc':
+            return queryset.order_by(field.desc(nulls_last=True), '-id')
+        return queryset.order_by(field.asc(nulls_last=True), 'id')
+
+    def annotate_distance(self, queryset, point):
+        """
+        Annotate distance (meters) to the closest location of each event,
+        using the KNN operator on the GiST-indexed Location.point
+        """
+        target = geo.geography(point)
+        closest_date = (
+            EventDate.objects
+            .filter(event=OuterRef('pk'), location__point__isnull=False)
+            .annotate(distance=geo.KnnDistance('location__point', target))
+            .order_by('distance')
+            .values('distance')[:1]
+        )
+        # LEAST skips NULLs on PostgreSQL
+        return queryset.annotate(
+            distance=Least(geo.KnnDistance('location__point', target), Subquery(closest_date))
+        )
+
+    def dates_in_range(self, date_from, date_to):
+        """EventDates of the outer event overlapping [date_from, date_to]"""
+        return EventDate.objects.filter(event=OuterRef('pk')).filter(
+            self.overlapping(date_from, date_to)
+        )
+
+    @classmethod
+    def overlapping(cls, date_from, date_to):
+        """Q for EventDates overlapping [date_from, date_to] (either may be None)"""
+        q = Q()
+        if date_to:
+            q &= Q(start_date__lt=cls.start_of_day(date_to + timedelta(days=1)))
+        if date_from:
+            start = cls.start_of_day(date_from)
+            q &= Q(end_date__gte=start) | Q(end_date__isnull=True, start_date__gte=start)
+        return q
+
+    @staticmethod
+    def parse_day(value):
+        try:
+            return parse_date(value) if value else None
+        except ValueError:
+            return None
+
+    @staticmethod
+    def start_of_day(day):
+        return timezone.make_aware(datetime.combine(day, time.min))
+
+    @staticmethod
+    def parse_choices(value, choices):
+        if not value:
+            return []
+        allowed = {key for key, _ in choices}
+        return [v for v in value.upper().split(',') if v in allowed]
+
+
+class OccurrenceFilterBackend(BaseFilterBackend):
+    """
+    Filters for /api/occurrences/ (one row per EventDate).
+
+    An occurrence takes place at its own location, or at the event's
+    location when the date has none.
+
+    Query params:
+    - dateFrom, dateTo: YYYY-MM-DD, inclusive; occurrences overlapping the range
+    - upcoming=true: occurrences that haven't ended yet
+    - event: occurrences of one event (Event id)
+    - category, price_type: of the event (comma-separated for several)
+    - city, location: Location.city / Location id of the occurrence
+    - lat, lng, radius (km, default 50): occurrences at a location within the radius
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        params = request.query_params
+
+        if (event_id := params.get('event', '')).isdigit():
+            queryset = queryset.filter(event_id=event_id)
+
+        date_from = EventFilterBackend.parse_day(params.get('dateFrom'))
+        date_to = EventFilterBackend.parse_day(params.get('dateTo'))
+        if date_from or date_to:
+            queryset = queryset.filter(EventFilterBackend.overlapping(date_from, date_to))
+
+        if params.get('upcoming') == 'true':
+            now = timezone.now()
+            queryset = queryset.filter(
+                Q(end_date__gte=now) | Q(end_date__isnull=True, start_date__gte=now)
+            )
+
+        for param, choices in (
+            ('category', Event.CATEGORY_CHOICES),
+            ('price_type', Event.PRICE_TYPE_CHOICES),
+        ):
+            values = EventFilterBackend.parse_choices(params.get(param), choices)
+            if values:
+                queryset = queryset.filter(**{f'event__{param}__in': values})
+
+        if city := params.get('city'):
+            queryset = queryset.filter(self.held_at(city=city))
+
+        if (location_id := params.get('location', '')).isdigit():
+            queryset = queryset.filter(self.held_at(id=location_id))
+
+        if point := geo.parse_point(params):
+            nearby = geo.locations_within(point, geo.parse_radius(params))
+            queryset = queryset.filter(self.held_at(pk__in=nearby))
+
+        return queryset
+
+    @staticmethod
+    def held_at(**lookups):
+        """Q for occurrences whose location (or event location, if none) matches lookups"""
+        return (
+            Q(**{f'location__{key}': value for key, value in lookups.items()})
+            | Q(location__isnull=True, **{f'event__location__{key}': value for key, value in lookups.items()})
+        )
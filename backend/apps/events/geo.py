@@ -0,0 +1,58 @@
+"""
+Geo helpers shared by the events API (radius filtering, nearest-first ordering).
+"""
+
+from django.contrib.gis.db.models import PointField
+from django.contrib.gis.geos import Point
+from django.contrib.gis.measure import D
+from django.db.models import FloatField, Func, Value
+
+from .models import Location
+
+# Default search radius in km (openapi.yaml: radius default 50)
+DEFAULT_RADIUS_KM = 50
+MAX_RADIUS_KM = 500
+
+
+class KnnDistance(Func):
+    """
+    PostGIS KNN distance operator (geography <-> geography, in meters).
+    Ordering by it lets the GiST index on Location.point return rows
+    nearest-first instead of computing ST_Distance for every row.
+    """
+    arg_joiner = ' <-> '
+    template = '%(expressions)s'
+    output_field = FloatField()
+
+
+def parse_point(params):
+    """Return a geography Point from ?lat=&lng= query params, or None"""
+    try:
+        lat = float(params['lat'])
+        lng = float(params['lng'])
+    except (KeyError, TypeError, ValueError):
+        return None
+    if not (-90 <= lat <= 90 and -180 <= lng <= 180):
+        return None
+    return Point(lng, lat, srid=4326)
+
+
+def parse_radius(params):
+    """Return the ?radius= query param in km, clamped to MAX_RADIUS_KM"""
+    try:
+        radius = float(params.get('radius', DEFAULT_RADIUS_KM))
+    except (TypeError, ValueError):
+        radius = DEFAULT_RADIUS_KM
+    return min(max(radius, 0), MAX_RADIUS_KM)
+
+
+def geography(point):
+    """Wrap a Point as a geography SQL value, comparable with Location.point"""
+    return Value(point, output_field=PointField(geography=True, srid=4326))
+
+
+def locations_within(point, radius_km):
+    """Ids of locations within radius_km of point (GiST index range scan)"""
+    return Location.objects.filter(
+        point__dwithin=(point, D(km=radius_km))
+    ).values('pk')
@@ -0,0 +1,93 @@
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+
+from apps.events.list_rows import EventListRows
+from apps.events.models import Event, Location
+from apps.events.serializers import EventListSerializer
+
+
+class Command(BaseCommand):
+    help = (
+        'Compare /api/events/ list rendering through EventListSerializer with the '
+        '.values() fast path (EventListRows), in rows per second per page size.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--sizes', nargs='+', type=int, default=[20, 100, 500],
+            help='Page sizes to measure (default: 20 100 500)'
+        )
+        parser.add_argument(
+            '--repeat', type=int, default=5,
+            help='Runs per page size; the fastest one is reported (default: 5)'
+        )
+        parser.add_argument(
+            '--create', action='store_true',
+            help='Add synthetic events up to the largest size (rolled back afterwards)'
+        )
+
+    def handle(self, *args, **options):
+        sizes = options['sizes']
+        repeat = max(options['repeat'], 1)
+
+        with transaction.atomic():
+            if options['create']:
+                self.create_events(max(sizes) - Event.objects.count())
+
+            self.stdout.write(f"{'size':>6} {'serializer rows/s':>18} {'values rows/s':>14} {'speedup':>8}")
+            for size in sizes:
+                rows = min(size, Event.objects.count())
+                if not rows:
+                    self.stdout.write(f'{size:>6} no events')
+                    continue
+                serializer_time = self.measure(lambda: self.render_serializer(size), repeat)
+                values_time = self.measure(lambda: self.render_values(size), repeat)
+                self.stdout.write(
+                    f'{size:>6} {rows / serializer_time:>18.0f} {rows / values_time:>14.0f} '
+                    f'{serializer_time / values_time:>7.1f}x'
+                )
+
+            # Never keep synthetic events
+            transaction.set_rollback(True)
+
+    def measure(self, render, repeat):
+        timings = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            render()
+            timings.append(time.perf_counter() - started)
+        return min(timings)
+
+    def render_serializer(self, size):
+        events = Event.objects.for_list()[:size]
+        return JSONRenderer().render(EventListSerializer(events, many=True).data)
+
+    def render_values(self, size):
+        rows = EventListRows()
+        return JSONRenderer().render(rows.to_representation(rows.values(Event.objects.all())[:size]))
+
+    def create_events(self, count):
+        if count <= 0:
+            return
+        location = Location.objects.create(
+            name='Benchmark', city='Ustrzyki Dolne', latitude='49.4300000', longitude='22.5900000'
+        )
+        now = timezone.now()
+        Event.objects.bulk_create(
+            Event(
+                title_pl=f'Wydarzenie {i}',
+                title_en=f'Event {i}',
+                slug=f'benchmark-{now:%Y%m%d%H%M%S}-{i}',
+                location=location,
+                start_date=now + timedelta(hours=i),
+                next_start_date=now + timedelta(hours=i),
+                price_type=Event.PAID,
+                price_amount='30.00',
+            )
+            for i in range(count)
+        )
@@ -0,0 +1,64 @@
+import time
+
+from django.core.management.base import BaseCommand
+from rest_framework.renderers import JSONRenderer
+
+from apps.common.renderers import FastJSONRenderer, MessagePackRenderer
+from apps.events.models import Event
+from apps.events.serializers import EventListSerializer, EventSerializer
+from apps.gallery.models import Image
+from apps.gallery.serializers import ImageListSerializer
+
+
+class Command(BaseCommand):
+    help = (
+        'Compare API renderers (DRF JSONRenderer, FastJSONRenderer, MessagePackRenderer) '
+        'on event detail, event list and gallery payloads built from the database.'
+    )
+
+    renderers = (
+        ('json', JSONRenderer),
+        ('fast json', FastJSONRenderer),
+        ('msgpack', MessagePackRenderer),
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--limit', type=int, default=100,
+            help='Objects per payload (default: 100)'
+        )
+        parser.add_argument(
+            '--repeat', type=int, default=20,
+            help='Renders per payload and renderer; the fastest one is reported (default: 20)'
+        )
+
+    def handle(self, *args, **options):
+        limit = options['limit']
+        repeat = max(options['repeat'], 1)
+
+        payloads = {
+            'event detail': EventSerializer(Event.objects.for_detail()[:limit], many=True).data,
+            'event list': EventListSerializer(Event.objects.for_list()[:limit], many=True).data,
+            'gallery': ImageListSerializer(Image.objects.all()[:limit], many=True).data,
+        }
+
+        self.stdout.write(f"{'payload':<14} {'objects':>7} {'renderer':<10} {'ms':>8} {'KB':>8} {'speedup':>8}")
+        for name, data in payloads.items():
+            baseline = None
+            for renderer_name, renderer_class in self.renderers:
+                renderer = renderer_class()
+                seconds = self.measure(lambda: renderer.render(data), repeat)
+                size = len(renderer.render(data))
+                baseline = baseline or seconds
+                self.stdout.write(
+                    f'{name:<14} {len(data):>7} {renderer_name:<10} {seconds * 1000:>8.2f} '
+                    f'{size / 1024:>8.1f} {baseline / seconds:>7.1f}x'
+                )
+
+    def measure(self, render, repeat):
+        timings = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            render()
+            timings.append(time.perf_counter() - started)
+        return min(timings)
@@ -0,0 +1,44 @@
+import time
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.events.services.road_graph import RoadGraph
+
+
+class Command(BaseCommand):
+    help = (
+        'Build the road graph used for travel-time filtering from an OSM XML '
+        'extract of the region (e.g. exported with osmium for the Bieszczady bbox).'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('osm_file', type=str, help='Path to .osm XML extract')
+        parser.add_argument(
+            '--output',
+            type=str,
+            default=settings.ROAD_GRAPH_PATH,
+            help='Where to write the compiled graph (default: ROAD_GRAPH_PATH)'
+        )
+
+    def handle(self, *args, **options):
+        osm_file = Path(options['osm_file'])
+        if not osm_file.exists():
+            raise CommandError(f'File not found: {osm_file}')
+
+        started = time.monotonic()
+        graph = RoadGraph.from_osm(str(osm_file))
+
+        output = Path(options['output'])
+        output.parent.mkdir(parents=True, exist_ok=True)
+        # Write to a temporary file first so running workers never load a partial graph
+        tmp = output.with_suffix(output.suffix + '.tmp')
+        with open(tmp, 'wb') as f:
+            graph.save(f)
+        tmp.replace(output)
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Road graph written to {output}: {graph.node_count} nodes, '
+            f'{graph.edge_count} edges ({time.monotonic() - started:.1f}s)'
+        ))
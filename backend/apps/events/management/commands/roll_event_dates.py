@@ -0,0 +1,32 @@
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from apps.common import response_cache
+from apps.events.models import Event
+
+
+class Command(BaseCommand):
+    help = (
+        'Roll Event.next_start_date forward once its occurrence has started. '
+        'Run periodically (e.g. every 15 minutes from cron).'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--all',
+            action='store_true',
+            help='Recompute first/next/last dates for every event, not only stale ones'
+        )
+
+    def handle(self, *args, **options):
+        now = timezone.now()
+        events = Event.objects.all()
+        if not options['all']:
+            # Only events whose "next" occurrence is already in the past
+            events = events.filter(next_start_date__lt=now)
+
+        updated = events.refresh_date_bounds(now=now)
+        if updated:
+            # Bulk UPDATE sends no signals
+            response_cache.invalidate(Event)
+        self.stdout.write(self.style.SUCCESS(f'Refreshed occurrence dates for {updated} events'))
@@ -0,0 +1,45 @@
+import logging
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import DatabaseError, close_old_connections
+
+from apps.events.services import import_jobs
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = (
+        'Run event import jobs submitted from the admin. Polls for pending jobs '
+        'until stopped; several workers can run side by side.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--once', action='store_true',
+            help='Run the pending jobs and exit'
+        )
+        parser.add_argument(
+            '--interval', type=float, default=5,
+            help='Seconds between checks for new jobs (default: 5)'
+        )
+
+    def handle(self, *args, **options):
+        try:
+            while True:
+                # Drop connections the database closed (restart, idle timeout)
+                close_old_connections()
+                try:
+                    count = import_jobs.run_pending()
+                except DatabaseError:
+                    # A job cut off here is claimed again once it's stale (see import_jobs)
+                    logger.exception('Import worker lost the database, retrying')
+                    count = 0
+                if count:
+                    self.stdout.write(f'Ran {count} import job(s)')
+                if options['once']:
+                    break
+                time.sleep(options['interval'])
+        except KeyboardInterrupt:
+            pass
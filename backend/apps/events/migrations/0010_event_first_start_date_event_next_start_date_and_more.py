@@ -0,0 +1,87 @@
+# Generated by Django 5.1.15 on 2026-10-16 10:00
+
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+
+def populate_date_bounds(apps, schema_editor):
+    Event = apps.get_model("events", "Event")
+    EventDate = apps.get_model("events", "EventDate")
+    dates = EventDate.objects.filter(event=OuterRef("pk")).order_by()
+    Event.objects.update(
+        first_start_date=Subquery(dates.order_by("start_date").values("start_date")[:1]),
+        next_start_date=Subquery(
+            dates.filter(start_date__gte=timezone.now())
+            .order_by("start_date")
+            .values("start_date")[:1]
+        ),
+        last_end_date=Subquery(
+            dates.annotate(end=Coalesce("end_date", "start_date"))
+            .order_by("-end")
+            .values("end")[:1]
+        ),
+    )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("events", "0009_eventdate_location_and_more"),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name="event",
+            options={"ordering": ["next_start_date", "id"]},
+        ),
+        migrations.AddField(
+            model_name="event",
+            name="first_start_date",
+            field=models.DateTimeField(
+                blank=True,
+                editable=False,
+                help_text="Najwcześniejszy termin wydarzenia (z EventDate)",
+                null=True,
+            ),
+        ),
+        migrations.AddField(
+            model_name="event",
+            name="last_end_date",
+            field=models.DateTimeField(
+                blank=True,
+                editable=False,
+                help_text="Zakończenie ostatniego terminu wydarzenia (z EventDate)",
+                null=True,
+            ),
+        ),
+        migrations.AddField(
+            model_name="event",
+            name="next_start_date",
+            field=models.DateTimeField(
+                blank=True,
+                editable=False,
+                help_text="Najbliższy nadchodzący termin wydarzenia (z EventDate)",
+                null=True,
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="event",
+            index=models.Index(
+                fields=["next_start_date", "id"], name="events_even_next_st_7e4495_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="event",
+            index=models.Index(
+                fields=["first_start_date"], name="events_even_first_s_9ec7c0_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="event",
+            index=models.Index(
+                fields=["last_end_date"], name="events_even_last_en_92dcc9_idx"
+            ),
+        ),
+        migrations.RunPython(populate_date_bounds, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 5.1.15 on 2026-10-16 11:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("events", "0010_event_first_start_date_event_next_start_date_and_more"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="event",
+            index=models.Index(
+                fields=["category", "next_start_date"],
+                name="events_even_categor_43a0be_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="event",
+            index=models.Index(
+                fields=["price_type", "next_start_date"],
+                name="events_even_price_t_c8443a_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="event",
+            index=models.Index(
+                condition=models.Q(("moderation_status", "APPROVED")),
+                fields=["next_start_date", "id"],
+                name="events_event_approved_next_idx",
+            ),
+        ),
+    ]
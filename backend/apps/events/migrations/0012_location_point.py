@@ -0,0 +1,35 @@
+# Generated by Django 5.1.15 on 2026-10-16 12:00
+
+import django.contrib.gis.db.models.fields
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("events", "0011_event_filter_indexes"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="location",
+            name="point",
+            field=django.contrib.gis.db.models.fields.PointField(
+                blank=True,
+                editable=False,
+                geography=True,
+                help_text="Geographic point built from latitude/longitude",
+                null=True,
+                srid=4326,
+            ),
+        ),
+        migrations.RunSQL(
+            sql="""
+                UPDATE events_location
+                SET point = ST_SetSRID(
+                    ST_MakePoint(longitude::float8, latitude::float8), 4326
+                )::geography
+                WHERE latitude IS NOT NULL AND longitude IS NOT NULL
+            """,
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+    ]
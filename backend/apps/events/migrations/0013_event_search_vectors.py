@@ -0,0 +1,90 @@
+# Generated by Django 5.1.15 on 2026-10-16 13:00
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.operations
+import django.contrib.postgres.search
+from django.db import migrations
+
+# Text search configurations used by apps/events/search.py.
+# No Polish/Ukrainian stemmers ship with PostgreSQL, so those copy "simple".
+TEXT_SEARCH_CONFIGS_SQL = """
+    CREATE TEXT SEARCH CONFIGURATION polish_unaccent (COPY = simple);
+    ALTER TEXT SEARCH CONFIGURATION polish_unaccent
+        ALTER MAPPING FOR hword, hword_part, word WITH unaccent, simple;
+    CREATE TEXT SEARCH CONFIGURATION english_unaccent (COPY = english);
+    ALTER TEXT SEARCH CONFIGURATION english_unaccent
+        ALTER MAPPING FOR hword, hword_part, word WITH unaccent, english_stem;
+    CREATE TEXT SEARCH CONFIGURATION ukrainian_unaccent (COPY = simple);
+    ALTER TEXT SEARCH CONFIGURATION ukrainian_unaccent
+        ALTER MAPPING FOR hword, hword_part, word WITH unaccent, simple;
+"""
+
+DROP_TEXT_SEARCH_CONFIGS_SQL = """
+    DROP TEXT SEARCH CONFIGURATION IF EXISTS polish_unaccent;
+    DROP TEXT SEARCH CONFIGURATION IF EXISTS english_unaccent;
+    DROP TEXT SEARCH CONFIGURATION IF EXISTS ukrainian_unaccent;
+"""
+
+# Same expression as search_vector() in apps/events/search.py
+POPULATE_SQL = "UPDATE events_event SET " + ", ".join(
+    f"""
+    search_vector_{lang} =
+        setweight(to_tsvector('{config}', COALESCE(title_{lang}, '')), 'A')
+        || setweight(to_tsvector('{config}', regexp_replace(regexp_replace(
+            COALESCE(description_{lang}, ''), '<[^>]*>', ' ', 'g'), '&[#a-zA-Z0-9]+;', ' ', 'g'
+        )), 'B')
+    """
+    for lang, config in (
+        ("pl", "polish_unaccent"),
+        ("en", "english_unaccent"),
+        ("uk", "ukrainian_unaccent"),
+    )
+)
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("events", "0012_location_point"),
+    ]
+
+    operations = [
+        django.contrib.postgres.operations.UnaccentExtension(),
+        migrations.RunSQL(
+            sql=TEXT_SEARCH_CONFIGS_SQL,
+            reverse_sql=DROP_TEXT_SEARCH_CONFIGS_SQL,
+        ),
+        migrations.AddField(
+            model_name="event",
+            name="search_vector_pl",
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name="event",
+            name="search_vector_en",
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name="event",
+            name="search_vector_uk",
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.AddIndex(
+            model_name="event",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["search_vector_pl"], name="events_event_search_pl_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="event",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["search_vector_en"], name="events_event_search_en_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="event",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["search_vector_uk"], name="events_event_search_uk_idx"
+            ),
+        ),
+        migrations.RunSQL(sql=POPULATE_SQL, reverse_sql=migrations.RunSQL.noop),
+    ]
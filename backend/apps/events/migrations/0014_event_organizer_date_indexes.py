@@ -0,0 +1,26 @@
+# Generated by Django 5.1.15 on 2026-10-16 14:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("events", "0013_event_search_vectors"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="event",
+            index=models.Index(
+                fields=["organizer", "next_start_date", "id"],
+                name="events_even_organiz_dfc112_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="event",
+            index=models.Index(
+                fields=["organizer", "last_end_date", "id"],
+                name="events_even_organiz_519bef_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,109 @@
+# Generated by Django 5.1.15 on 2026-10-16 16:00
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("events", "0014_event_organizer_date_indexes"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ImportJob",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "file",
+                    models.FileField(
+                        help_text="Uploaded JSON or NDJSON file", upload_to="imports/"
+                    ),
+                ),
+                (
+                    "file_name",
+                    models.CharField(
+                        blank=True, help_text="Original file name", max_length=255
+                    ),
+                ),
+                (
+                    "file_size",
+                    models.BigIntegerField(default=0, help_text="File size in bytes"),
+                ),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("PENDING", "Oczekuje"),
+                            ("RUNNING", "W toku"),
+                            ("DONE", "Zakończony"),
+                            ("FAILED", "Nieudany"),
+                        ],
+                        default="PENDING",
+                        max_length=20,
+                    ),
+                ),
+                (
+                    "processed",
+                    models.PositiveIntegerField(
+                        default=0, help_text="Records read so far"
+                    ),
+                ),
+                (
+                    "position",
+                    models.BigIntegerField(
+                        default=0, help_text="Bytes of the file read so far"
+                    ),
+                ),
+                ("imported", models.PositiveIntegerField(default=0)),
+                ("skipped", models.PositiveIntegerField(default=0)),
+                ("error_count", models.PositiveIntegerField(default=0)),
+                (
+                    "errors",
+                    models.JSONField(
+                        blank=True,
+                        default=list,
+                        help_text="First errors (index, title, error, offset)",
+                    ),
+                ),
+                (
+                    "message",
+                    models.TextField(blank=True, help_text="Why the job failed"),
+                ),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("started_at", models.DateTimeField(blank=True, null=True)),
+                ("finished_at", models.DateTimeField(blank=True, null=True)),
+                (
+                    "created_by",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="import_jobs",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Import wydarzeń",
+                "verbose_name_plural": "Importy wydarzeń",
+                "ordering": ["-created_at"],
+                "indexes": [
+                    models.Index(
+                        fields=["status", "created_at"],
+                        name="events_impo_status_3de6b3_idx",
+                    )
+                ],
+            },
+        ),
+    ]
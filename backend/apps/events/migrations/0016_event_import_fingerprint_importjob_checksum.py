@@ -0,0 +1,32 @@
+# Generated by Django 5.1.15 on 2026-10-16 17:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("events", "0015_importjob"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="event",
+            name="import_fingerprint",
+            field=models.CharField(
+                blank=True,
+                editable=False,
+                help_text="SHA-256 of the last imported record",
+                max_length=64,
+            ),
+        ),
+        migrations.AddField(
+            model_name="importjob",
+            name="checksum",
+            field=models.CharField(
+                blank=True,
+                db_index=True,
+                help_text="SHA-256 of the file; a file already imported is not imported again",
+                max_length=64,
+            ),
+        ),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 5.1.15 on 2026-10-16 18:00
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("events", "0016_event_import_fingerprint_importjob_checksum"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="importjob",
+            name="attempts",
+            field=models.PositiveSmallIntegerField(
+                default=0, help_text="Times a worker claimed the job"
+            ),
+        ),
+        migrations.AddField(
+            model_name="importjob",
+            name="updated_at",
+            field=models.DateTimeField(
+                auto_now=True,
+                default=django.utils.timezone.now,
+                help_text="Last progress of the running job",
+            ),
+            preserve_default=False,
+        ),
+    ]
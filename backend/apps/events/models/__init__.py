@@ -3,6 +3,7 @@ from .event_date import EventDate
 from .event import Event
 from .event_image import EventImage
 from .location import Location
+from .import_job import ImportJob
 
 __all__ = [
     'Organizer',
@@ -10,4 +11,5 @@ __all__ = [
     'Event',
     'EventImage',
     'Location',
+    'ImportJob',
 ]
@@ -1,11 +1,20 @@
 from django.contrib.gis.db import models
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
 from django.utils.text import slugify
 from django.utils import timezone
 from django.core.validators import MinValueValidator
+from django.db import IntegrityError, transaction
 from django_prose_editor.fields import ProseEditorField
 
+from apps.common import response_cache
 from .organizer import Organizer
 from .location import Location
+from .querysets import SEARCH_VECTOR_FIELDS, EventQuerySet
+from ..search import SEARCH_FIELDS
+
+# Slug allocations tried by Event.save before giving up under contention
+SLUG_ATTEMPTS = 5
 
 
 # Rich text editor configuration with security-focused extensions
@@ -129,6 +138,12 @@ class Event(models.Model):
         help_text="Event description in Ukrainian (rich text)"
     )
 
+    # Full-text search vectors (title + plain-text description) per language.
+    # Rebuilt by refresh_search_vectors when a save changes the texts (see apps/events/search.py).
+    search_vector_pl = SearchVectorField(null=True, editable=False)
+    search_vector_en = SearchVectorField(null=True, editable=False)
+    search_vector_uk = SearchVectorField(null=True, editable=False)
+
     # Category and classification
     category = models.CharField(
         max_length=20,
@@ -161,6 +176,28 @@ class Event(models.Model):
         help_text="DEPRECATED: Użyj EventDate model zamiast tego"
     )
 
+    # Occurrence bounds denormalized from EventDate for sorting and filtering.
+    # Maintained by signals on EventDate (see apps/events/signals.py) and
+    # rolled forward periodically by the roll_event_dates command.
+    first_start_date = models.DateTimeField(
+        null=True,
+        blank=True,
+        editable=False,
+        help_text="Najwcześniejszy termin wydarzenia (z EventDate)"
+    )
+    next_start_date = models.DateTimeField(
+        null=True,
+        blank=True,
+        editable=False,
+        help_text="Najbliższy nadchodzący termin wydarzenia (z EventDate)"
+    )
+    last_end_date = models.DateTimeField(
+        null=True,
+        blank=True,
+        editable=False,
+        help_text="Zakończenie ostatniego terminu wydarzenia (z EventDate)"
+    )
+
     # Location
     location = models.ForeignKey(
         Location,
@@ -232,26 +269,68 @@ class Event(models.Model):
     )
     moderation_notes = models.TextField(blank=True)
 
+    # Set by EventImporter: re-imports of an unchanged record write nothing
+    import_fingerprint = models.CharField(
+        max_length=64,
+        blank=True,
+        editable=False,
+        help_text="SHA-256 of the last imported record"
+    )
+
     # Timestamps
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = EventQuerySet.as_manager()
+
     class Meta:
-        ordering = ['start_date']  # Fallback ordering, use event_dates for actual dates
+        ordering = ['next_start_date', 'id']
         indexes = [
             models.Index(fields=['start_date']),
+            models.Index(fields=['next_start_date', 'id']),
+            models.Index(fields=['first_start_date']),
+            models.Index(fields=['last_end_date']),
             models.Index(fields=['category']),
             models.Index(fields=['moderation_status']),
             models.Index(fields=['location']),
+            # Filter combinations used by /api/events/ (see filters.py)
+            models.Index(fields=['category', 'next_start_date']),
+            models.Index(fields=['price_type', 'next_start_date']),
+            # Events of an organizer (/api/organizers/{id}/events/), upcoming and past
+            models.Index(fields=['organizer', 'next_start_date', 'id']),
+            models.Index(fields=['organizer', 'last_end_date', 'id']),
+            models.Index(
+                fields=['next_start_date', 'id'],
+                condition=models.Q(moderation_status='APPROVED'),
+                name='events_event_approved_next_idx',
+            ),
+            GinIndex(fields=['search_vector_pl'], name='events_event_search_pl_idx'),
+            GinIndex(fields=['search_vector_en'], name='events_event_search_en_idx'),
+            GinIndex(fields=['search_vector_uk'], name='events_event_search_uk_idx'),
         ]
         # Add spatial index for coordinates (PostGIS)
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember the loaded location: dates without one move with the event on the map
+        instance._loaded_location_id = instance.__dict__.get('location_id')
+        # and the loaded search texts: saves that don't change them keep the vectors
+        instance._loaded_search_values = {
+            field: instance.__dict__[field] for field in SEARCH_FIELDS if field in instance.__dict__
+        }
+        return instance
+
     def __str__(self):
         # Get Polish title, fallback to other languages
         title_val = self.title_pl or self.title_en or self.title_uk or 'No title'
 
         # Show first event date if available
-        first_date = self.event_dates.first()
+        dates = self._prefetched('event_dates')
+        if dates is None:
+            first_date = self.event_dates.first()
+        else:
+            first_date = dates[0] if dates else None
         if first_date:
             return f"{title_val} - {first_date.start_date.strftime('%Y-%m-%d')}"
         elif self.start_date:  # Fallback to legacy date
@@ -259,23 +338,78 @@ class Event(models.Model):
         return title_val
 
     def save(self, *args, **kwargs):
-        # Auto-generate slug from Polish title
-        if not self.slug:
-            if self.title_pl:
-                base_slug = slugify(self.title_pl)
-                slug = base_slug
-                counter = 1
-                while Event.objects.filter(slug=slug).exists():
-                    slug = f"{base_slug}-{counter}"
-                    counter += 1
-                self.slug = slug
-        super().save(*args, **kwargs)
+        update_fields = kwargs.get('update_fields')
+        saved_search_fields = SEARCH_FIELDS if update_fields is None else SEARCH_FIELDS.intersection(update_fields)
+        search_changed = self._search_values_changed(saved_search_fields)
+        if update_fields is None and not self._state.adding:
+            # Never write the vectors held in memory back: they are built in SQL
+            kwargs['update_fields'] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key and field.name not in SEARCH_VECTOR_FIELDS
+                and field.attname in self.__dict__
+            ]
+
+        # The row and its search vectors in one transaction. post_save's cache
+        # invalidation is collected here and runs on commit of the outermost
+        # transaction (admin, importer), so it never precedes the new vectors
+        with response_cache.deferred_invalidation(), transaction.atomic():
+            # Auto-generate slug from Polish title
+            if not self.slug and self.title_pl:
+                self._save_with_new_slug(*args, **kwargs)
+            else:
+                super().save(*args, **kwargs)
+            if search_changed:
+                Event.objects.filter(pk=self.pk).refresh_search_vectors()
+
+        self._loaded_search_values = {
+            **getattr(self, '_loaded_search_values', {}),
+            **{field: self.__dict__[field] for field in saved_search_fields if field in self.__dict__},
+        }
+
+    def _search_values_changed(self, fields):
+        """Whether saving fields writes a search text other than the one loaded from the database"""
+        loaded = getattr(self, '_loaded_search_values', None)
+        if loaded is None or self._state.adding:
+            return bool(fields)
+        return any(field not in loaded or loaded[field] != self.__dict__.get(field) for field in fields)
+
+    def _save_with_new_slug(self, *args, **kwargs):
+        """
+        Save with a free slug from the Polish title (one query to allocate),
+        allocating again if a concurrent save took it first
+        """
+        base_slug = slugify(self.title_pl)
+        for attempt in range(SLUG_ATTEMPTS):
+            self.slug = Event.objects.allocate_slugs([base_slug])[0]
+            try:
+                with transaction.atomic():
+                    super().save(*args, **kwargs)
+                return
+            except IntegrityError:
+                taken = Event.objects.filter(slug=self.slug).exists()
+                if not taken or attempt == SLUG_ATTEMPTS - 1:
+                    self.slug = ''
+                    raise
+
+    def _prefetched(self, relation):
+        """
+        Return the prefetched list for a relation, or None if it wasn't prefetched.
+        Prefetches set up by EventQuerySet are already ordered.
+        """
+        cache = getattr(self, '_prefetched_objects_cache', {})
+        if relation in cache:
+            return list(cache[relation])
+        return None
 
     @property
     def is_past(self):
         """Check if all event dates have passed"""
         # Check EventDate entries first
-        last_date = self.event_dates.order_by('-start_date').first()
+        dates = self._prefetched('event_dates')
+        if dates is not None:
+            last_date = max(dates, key=lambda d: d.start_date) if dates else None
+        else:
+            last_date = self.event_dates.order_by('-start_date').first()
         if last_date:
             return last_date.is_past
 
@@ -290,11 +424,18 @@ class Event(models.Model):
     def next_date(self):
         """Get the next upcoming event date"""
         now = timezone.now()
+        dates = self._prefetched('event_dates')
+        if dates is not None:
+            upcoming = [d for d in dates if d.start_date >= now]
+            return min(upcoming, key=lambda d: d.start_date) if upcoming else None
         return self.event_dates.filter(start_date__gte=now).order_by('start_date').first()
 
     @property
     def all_dates(self):
         """Get all event dates ordered by start_date"""
+        dates = self._prefetched('event_dates')
+        if dates is not None:
+            return sorted(dates, key=lambda d: d.start_date)
         return self.event_dates.all().order_by('start_date')
 
     @property
@@ -302,9 +443,24 @@ class Event(models.Model):
         """Check if event is free"""
         return self.price_type == self.FREE
 
+    @property
+    def ordered_event_images(self):
+        """Get EventImage links ordered for display"""
+        event_images = self._prefetched('event_images')
+        if event_images is not None:
+            return sorted(event_images, key=lambda ei: ei.order)
+        return list(self.event_images.select_related('image').order_by('order'))
+
     @property
     def main_image(self):
         """Get the main/cover image for this event"""
+        event_images = self._prefetched('event_images')
+        if event_images is not None:
+            ordered = sorted(event_images, key=lambda ei: ei.order)
+            # Marked main image first, then first image by order
+            main = next((ei for ei in ordered if ei.is_main), None) or (ordered[0] if ordered else None)
+            return main.image if main else None
+
         # Try to get marked main image first
         main = self.event_images.filter(is_main=True).first()
         if main:
@@ -318,7 +474,7 @@ class Event(models.Model):
     @property
     def all_images(self):
         """Get all images for this event, ordered"""
-        return [ei.image for ei in self.event_images.select_related('image').order_by('order')]
+        return [ei.image for ei in self.ordered_event_images]
 
     def get_title(self, language='pl'):
         """Get title in specified language with fallback"""
@@ -55,9 +55,22 @@ class EventDate(models.Model):
             models.Index(fields=['location']),
         ]
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember the loaded event/location so moving a date refreshes both
+        instance._loaded_event_id = instance.__dict__.get('event_id')
+        instance._loaded_location_id = instance.__dict__.get('location_id')
+        return instance
+
     def __str__(self):
         return f"{self.event.get_title()} - {self.start_date.strftime('%Y-%m-%d %H:%M')}"
 
+    @property
+    def venue(self):
+        """Where this date takes place: its own location, else the event's"""
+        return self.location or self.event.location
+
     @property
     def is_past(self):
         """Check if this event date has already occurred"""
@@ -0,0 +1,92 @@
+from django.conf import settings
+from django.contrib.gis.db import models
+from django.utils import timezone
+
+
+class ImportJob(models.Model):
+    """
+    Event import submitted from the admin and run in the background by
+    `manage.py run_import_jobs`.
+    Counts are updated after every batch, so the admin can show progress.
+    """
+
+    # Status choices
+    PENDING = 'PENDING'
+    RUNNING = 'RUNNING'
+    DONE = 'DONE'
+    FAILED = 'FAILED'
+
+    STATUS_CHOICES = [
+        (PENDING, 'Oczekuje'),
+        (RUNNING, 'W toku'),
+        (DONE, 'Zakończony'),
+        (FAILED, 'Nieudany'),
+    ]
+
+    # Errors kept on the job (the counts include all of them)
+    MAX_ERRORS = 100
+
+    # Runs of a job whose worker stopped (see import_jobs.claim_next) before it fails
+    MAX_ATTEMPTS = 3
+
+    file = models.FileField(upload_to='imports/', help_text="Uploaded JSON or NDJSON file")
+    file_name = models.CharField(max_length=255, blank=True, help_text="Original file name")
+    file_size = models.BigIntegerField(default=0, help_text="File size in bytes")
+    checksum = models.CharField(
+        max_length=64, blank=True, db_index=True,
+        help_text="SHA-256 of the file; a file already imported is not imported again"
+    )
+    created_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='import_jobs',
+    )
+
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default=PENDING)
+    processed = models.PositiveIntegerField(default=0, help_text="Records read so far")
+    position = models.BigIntegerField(default=0, help_text="Bytes of the file read so far")
+    imported = models.PositiveIntegerField(default=0)
+    skipped = models.PositiveIntegerField(default=0)
+    error_count = models.PositiveIntegerField(default=0)
+    errors = models.JSONField(default=list, blank=True, help_text="First errors (index, title, error, offset)")
+    message = models.TextField(blank=True, help_text="Why the job failed")
+    attempts = models.PositiveSmallIntegerField(default=0, help_text="Times a worker claimed the job")
+
+    # Timestamps
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    updated_at = models.DateTimeField(auto_now=True, help_text="Last progress of the running job")
+
+    class Meta:
+        ordering = ['-created_at']
+        verbose_name = 'Import wydarzeń'
+        verbose_name_plural = 'Importy wydarzeń'
+        indexes = [
+            models.Index(fields=['status', 'created_at']),
+        ]
+
+    def __str__(self):
+        return f"{self.file_name or self.file.name} ({self.get_status_display()})"
+
+    @property
+    def is_finished(self):
+        return self.status in (self.DONE, self.FAILED)
+
+    @property
+    def percent(self):
+        """Progress through the file (by bytes)"""
+        if self.status == self.DONE:
+            return 100
+        if not self.file_size:
+            return 0
+        return min(int(self.position * 100 / self.file_size), 99)
+
+    @property
+    def duration(self):
+        """Seconds the job has been running (until it finished), None before it started"""
+        if not self.started_at:
+            return None
+        return ((self.finished_at or timezone.now()) - self.started_at).total_seconds()
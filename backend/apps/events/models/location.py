@@ -1,4 +1,5 @@
-from django.db import models
+from django.contrib.gis.db import models
+from django.contrib.gis.geos import Point
 from django.core.validators import MinValueValidator
 
 
@@ -46,6 +47,17 @@ class Location(models.Model):
         help_text="Longitude (e.g., 22.5678)"
     )
 
+    # Geography point kept in sync with latitude/longitude (see save()).
+    # GiST-indexed, used for radius filtering and nearest-first ordering.
+    point = models.PointField(
+        geography=True,
+        srid=4326,
+        null=True,
+        blank=True,
+        editable=False,
+        help_text="Geographic point built from latitude/longitude"
+    )
+
     # Google Maps URL for easy lookup
     google_maps_url = models.URLField(
         blank=True,
@@ -132,3 +144,30 @@ class Location(models.Model):
         if self.city:
             return f"{self.name} ({self.city})"
         return self.name
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember loaded coordinates so moving a location invalidates both map tiles
+        instance._loaded_coordinates = (
+            instance.__dict__.get('latitude'),
+            instance.__dict__.get('longitude'),
+        )
+        return instance
+
+    def save(self, *args, **kwargs):
+        self.sync_point()
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and {'latitude', 'longitude'} & set(update_fields):
+            kwargs['update_fields'] = {*update_fields, 'point'}
+        super().save(*args, **kwargs)
+
+    def sync_point(self):
+        """
+        Build point from the decimal coordinates.
+        Call directly before bulk_create/bulk_update, which skip save().
+        """
+        if self.latitude is not None and self.longitude is not None:
+            self.point = Point(float(self.longitude), float(self.latitude), srid=4326)
+        else:
+            self.point = None
@@ -1,5 +1,7 @@
 from django.contrib.gis.db import models
 
+from .querysets import OrganizerQuerySet
+
 
 class Organizer(models.Model):
     """
@@ -59,6 +61,8 @@ class Organizer(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = OrganizerQuerySet.as_manager()
+
     class Meta:
         ordering = ['name']
         verbose_name = 'Organizator'
@@ -0,0 +1,221 @@
+from django.contrib.postgres.search import SearchRank
+from django.db import models
+from django.db.models import Count, Exists, OuterRef, Prefetch, Q, Subquery, Value
+from django.db.models.functions import Coalesce, Greatest, NullIf
+from django.utils import timezone
+
+from apps.common.sparse_fields import only_columns
+from ..search import LANGUAGES, search_query, search_vector
+from .event_date import EventDate
+from .event_image import EventImage
+
+
+# Translated Event fields, stored as <field>_pl/_en/_uk columns
+TRANSLATED_FIELDS = ('title', 'description')
+
+SEARCH_VECTOR_FIELDS = tuple(f'search_vector_{lang}' for lang in LANGUAGES)
+
+
+def localized(field, lang):
+    """<field>_<lang>, falling back to <field>_pl when empty"""
+    return Coalesce(NullIf(f'{field}_{lang}', Value('')), f'{field}_pl')
+
+
+def main_image_path():
+    """
+    Subquery with the file path of an event's main image: the first image
+    marked is_main, else the first by order (same as Event.main_image)
+    """
+    return Subquery(
+        EventImage.objects.filter(event=OuterRef('pk'))
+        .order_by('-is_main', 'order', 'id')
+        .values('image__image')[:1]
+    )
+
+
+class EventQuerySet(models.QuerySet):
+    """
+    QuerySet for Event with the query plans used by the API.
+    Event accessors (main_image, next_date, is_past...) read from
+    the prefetched relations set up here instead of querying per row.
+    """
+
+    def with_images(self):
+        """Prefetch event images with their gallery image, ordered for display"""
+        return self.prefetch_related(
+            Prefetch(
+                'event_images',
+                queryset=EventImage.objects.select_related('image').order_by('order', 'id'),
+            )
+        )
+
+    def with_dates(self):
+        """Prefetch event dates with their location, ordered by start_date"""
+        return self.prefetch_related(
+            Prefetch(
+                'event_dates',
+                queryset=EventDate.objects.select_related('location').order_by('start_date', 'id'),
+            )
+        )
+
+    def for_list(self):
+        """Everything EventListSerializer touches (and not the descriptions)"""
+        return (
+            self.select_related('location').with_images()
+            .defer(*SEARCH_VECTOR_FIELDS, 'description_pl', 'description_en', 'description_uk')
+        )
+
+    def for_detail(self):
+        """Everything EventSerializer touches"""
+        return (
+            self.select_related('location', 'organizer').with_dates().with_images()
+            .defer(*SEARCH_VECTOR_FIELDS)
+        )
+
+    def for_fields(self, needs):
+        """
+        Plan for a sparse fieldset (see apps/common/sparse_fields.py):
+        only the needed columns, joins and prefetches. next_start_date and
+        id are always loaded for cursor pagination.
+        """
+        queryset = self
+        select = [name for name in ('location', 'organizer') if name in needs]
+        if select:
+            queryset = queryset.select_related(*select)
+        if 'event_dates' in needs:
+            queryset = queryset.with_dates()
+        if 'event_images' in needs:
+            queryset = queryset.with_images()
+        return only_columns(queryset, needs, 'id', 'next_start_date')
+
+    def for_occurrences(self, lang=''):
+        """Event summaries embedded in /api/occurrences/ (OccurrenceEventSerializer)"""
+        return (
+            self.select_related('location')
+            .only(
+                'id', 'title_pl', 'title_en', 'title_uk', 'slug', 'category', 'event_type',
+                'price_type', 'price_amount', 'currency', 'location',
+            )
+            .annotate(main_image_path=main_image_path())
+            .for_language(lang, ['title'])
+        )
+
+    def for_language(self, lang, fields=TRANSLATED_FIELDS):
+        """
+        Load translated fields in one language only: <field>_localized is the
+        lang column falling back to Polish when empty (resolved in SQL) and
+        the per-language columns are deferred. Only the translated fields
+        listed in fields are annotated. Unknown lang is a no-op.
+        """
+        if lang not in LANGUAGES:
+            return self
+        return self.defer(*(
+            f'{field}_{code}' for field in TRANSLATED_FIELDS for code in LANGUAGES
+        )).annotate(**{f'{field}_localized': localized(field, lang) for field in fields})
+
+    def upcoming(self, now=None):
+        """Events with an occurrence starting from now on"""
+        return self.filter(next_start_date__gte=now or timezone.now())
+
+    def past(self, now=None):
+        """Events whose last occurrence has already ended"""
+        return self.filter(last_end_date__lt=now or timezone.now())
+
+    def refresh_date_bounds(self, now=None):
+        """
+        Recompute first_start_date, next_start_date and last_end_date
+        from EventDate with a single UPDATE over this queryset.
+        Returns the number of updated events.
+        """
+        now = now or timezone.now()
+        dates = EventDate.objects.filter(event=OuterRef('pk')).order_by()
+        return self.update(
+            first_start_date=Subquery(
+                dates.order_by('start_date').values('start_date')[:1]
+            ),
+            next_start_date=Subquery(
+                dates.filter(start_date__gte=now).order_by('start_date').values('start_date')[:1]
+            ),
+            last_end_date=Subquery(
+                dates.annotate(end=Coalesce('end_date', 'start_date'))
+                .order_by('-end').values('end')[:1]
+            ),
+        )
+
+    def refresh_search_vectors(self):
+        """
+        Rebuild search_vector_pl/en/uk from titles and descriptions
+        with a single UPDATE over this queryset.
+        """
+        return self.update(**{
+            f'search_vector_{lang}': search_vector(lang) for lang in LANGUAGES
+        })
+
+    def allocate_slugs(self, bases):
+        """
+        Free slugs for new events, one per base slug and in the same order:
+        the base itself or base-N with the lowest free N, distinct from each
+        other too. All slugs starting with the bases are read in one query
+        (a prefix scan of the slug index); the suffixes are picked in memory.
+        A concurrent insert can still take a slug: save with a savepoint and
+        allocate again on IntegrityError (see Event.save).
+        """
+        bases = list(bases)
+        if not bases:
+            return []
+
+        prefixes = Q()
+        for base in set(bases):
+            prefixes |= Q(slug=base) | Q(slug__startswith=f'{base}-')
+        taken = set(self.filter(prefixes).values_list('slug', flat=True))
+
+        slugs = []
+        counters = {}
+        for base in bases:
+            slug = base
+            counter = counters.get(base, 1)
+            while slug in taken:
+                slug = f'{base}-{counter}'
+                counter += 1
+            counters[base] = counter
+            taken.add(slug)
+            slugs.append(slug)
+        return slugs
+
+    def search(self, term):
+        """
+        Full-text search over all three languages, annotated with `rank`
+        (best rank of the languages) and ordered by it.
+        """
+        queries = {lang: search_query(term, lang) for lang in LANGUAGES}
+        if queries['pl'] is None:
+            return self
+
+        match = Q()
+        for lang, query in queries.items():
+            match |= Q(**{f'search_vector_{lang}': query})
+        rank = Greatest(*(
+            SearchRank(f'search_vector_{lang}', query) for lang, query in queries.items()
+        ))
+        return self.filter(match).annotate(rank=rank).order_by('-rank', 'id')
+
+
+class OrganizerQuerySet(models.QuerySet):
+    """QuerySet for Organizer with event counts computed in SQL"""
+
+    def with_event_counts(self, now=None):
+        """
+        Annotate events_count and upcoming_events_count (events with an
+        occurrence from now on, as EventQuerySet.upcoming) in the same query
+        """
+        return self.annotate(
+            events_count=Count('events'),
+            upcoming_events_count=Count(
+                'events', filter=Q(events__next_start_date__gte=now or timezone.now())
+            ),
+        )
+
+    def with_events(self):
+        """Organizers with at least one event, as EXISTS (no join or DISTINCT)"""
+        from .event import Event
+        return self.filter(Exists(Event.objects.filter(organizer=OuterRef('pk'))))
@@ -0,0 +1,172 @@
+import json
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from datetime import datetime
+
+from django.db.models import F, Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import Cursor, CursorPagination
+from rest_framework.utils.urls import replace_query_param
+
+
+class EventCursorPagination(CursorPagination):
+    """
+    Keyset pagination for the events feed, ordered by (next_start_date, id).
+
+    The cursor stores the (next_start_date, id) of the row at the edge of
+    the page, so each page is a range scan on the (next_start_date, id)
+    index: no COUNT(*), no OFFSET, and deep pages cost the same as page 1.
+    Rows inserted while a client pages through the feed never shift the
+    following pages. Events without an upcoming date come last.
+
+    Opt-in: ?pagination=cursor for the first page, then follow next/previous.
+    """
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+    ordering = ('next_start_date', 'id')
+    mode_query_param = 'pagination'
+    # Date column of the keyset; rows (instances or dicts) must include it
+    date_field = 'next_start_date'
+
+    @classmethod
+    def is_requested(cls, request):
+        """Whether the client asked for cursor pagination"""
+        params = request.query_params
+        return params.get(cls.mode_query_param) == 'cursor' or cls.cursor_query_param in params
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        self.base_url = request.build_absolute_uri()
+        self.cursor = self.decode_cursor(request)
+
+        reverse = bool(self.cursor and self.cursor.reverse)
+        position = self.cursor.position if self.cursor else None
+
+        queryset = self.order_queryset(queryset, reverse)
+        if position is not None:
+            queryset = queryset.filter(self.get_keyset_filter(position, reverse))
+
+        # One extra row tells us whether there is another page
+        results = list(queryset[:self.page_size + 1])
+        has_more = len(results) > self.page_size
+        self.page = results[:self.page_size]
+        if reverse:
+            self.page.reverse()
+
+        if reverse:
+            self.has_next, self.has_previous = position is not None, has_more
+        else:
+            self.has_next, self.has_previous = has_more, position is not None
+
+        if self.page:
+            self.next_position = self.get_position(self.page[-1])
+            self.previous_position = self.get_position(self.page[0])
+        else:
+            self.next_position = self.previous_position = position
+        return self.page
+
+    def order_queryset(self, queryset, reverse):
+        if reverse:
+            return queryset.order_by(F('next_start_date').desc(nulls_first=True), '-id')
+        return queryset.order_by(F('next_start_date').asc(nulls_last=True), 'id')
+
+    def get_keyset_filter(self, position, reverse):
+        """Rows strictly after (or before, when reversing) the cursor position"""
+        start_date, pk = position
+        if not reverse:
+            if start_date is None:
+                return Q(next_start_date__isnull=True, id__gt=pk)
+            return (
+                Q(next_start_date__gt=start_date)
+                | Q(next_start_date=start_date, id__gt=pk)
+                | Q(next_start_date__isnull=True)
+            )
+        if start_date is None:
+            return Q(next_start_date__isnull=False) | Q(next_start_date__isnull=True, id__lt=pk)
+        return Q(next_start_date__lt=start_date) | Q(next_start_date=start_date, id__lt=pk)
+
+    def get_position(self, instance):
+        if isinstance(instance, dict):
+            return (instance[self.date_field], instance['id'])
+        return (getattr(instance, self.date_field), instance.pk)
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        return self.encode_cursor(Cursor(offset=0, reverse=False, position=self.next_position))
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        return self.encode_cursor(Cursor(offset=0, reverse=True, position=self.previous_position))
+
+    def encode_cursor(self, cursor):
+        start_date, pk = cursor.position
+        token = json.dumps(
+            [start_date.isoformat() if start_date else None, pk, int(cursor.reverse)],
+            separators=(',', ':'),
+        )
+        encoded = urlsafe_b64encode(token.encode('ascii')).decode('ascii').rstrip('=')
+        return replace_query_param(self.base_url, self.cursor_query_param, encoded)
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+
+        try:
+            padded = encoded + '=' * (-len(encoded) % 4)
+            start_date, pk, reverse = json.loads(urlsafe_b64decode(padded.encode('ascii')))
+            if start_date is not None:
+                start_date = datetime.fromisoformat(start_date)
+            position = (start_date, int(pk))
+        except (TypeError, ValueError):
+            raise NotFound(self.invalid_cursor_message)
+
+        return Cursor(offset=0, reverse=bool(reverse), position=position)
+
+
+class DateKeysetPagination(EventCursorPagination):
+    """
+    Keyset pagination on (date_field, id) for a date column without NULLs,
+    soonest first, or latest first with descending = True
+    """
+    descending = False
+
+    def order_queryset(self, queryset, reverse):
+        if reverse != self.descending:
+            return queryset.order_by(f'-{self.date_field}', '-id')
+        return queryset.order_by(self.date_field, 'id')
+
+    def get_keyset_filter(self, position, reverse):
+        value, pk = position
+        if value is None:
+            raise NotFound(self.invalid_cursor_message)
+        lookup = 'lt' if reverse != self.descending else 'gt'
+        return (
+            Q(**{f'{self.date_field}__{lookup}': value})
+            | Q(**{self.date_field: value, f'id__{lookup}': pk})
+        )
+
+
+class PastEventCursorPagination(DateKeysetPagination):
+    """
+    Keyset pagination for past events, latest first: (last_end_date, id)
+    descending. Used with past=true, so every row has a last_end_date.
+    """
+    ordering = ('-last_end_date', '-id')
+    date_field = 'last_end_date'
+    descending = True
+
+
+class OccurrenceCursorPagination(DateKeysetPagination):
+    """Keyset pagination for /api/occurrences/ (EventDate rows) on (start_date, id)"""
+    ordering = ('start_date', 'id')
+    date_field = 'start_date'
+
+
+def event_cursor_pagination(request):
+    """Cursor pagination for an events feed: by next occurrence, or latest first with past=true"""
+    if request.query_params.get('past') == 'true':
+        return PastEventCursorPagination()
+    return EventCursorPagination()
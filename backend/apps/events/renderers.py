@@ -0,0 +1,16 @@
+from rest_framework.renderers import BaseRenderer
+
+
+class MVTRenderer(BaseRenderer):
+    """Passes pre-encoded Mapbox Vector Tile bytes through"""
+    media_type = 'application/vnd.mapbox-vector-tile'
+    format = 'mvt'
+    charset = None
+    render_style = 'binary'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        response = (renderer_context or {}).get('response')
+        if data is None or (response is not None and response.status_code >= 400):
+            # Error details (e.g. the 404 of an invalid tile) have no tile encoding
+            return b''
+        return data
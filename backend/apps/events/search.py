@@ -0,0 +1,63 @@
+"""
+Full-text search helpers for events (?search= on /api/events/).
+
+Each language has a stored tsvector column on Event (search_vector_pl/en/uk)
+built from the title (weight A) and the description with HTML stripped
+(weight B). The text search configurations are created in migration 0013:
+PostgreSQL ships no Polish or Ukrainian stemmer, so those use the simple
+dictionary; all three run unaccent first, so "zrodlo" matches "źródło".
+"""
+
+import re
+
+from django.contrib.postgres.search import SearchQuery, SearchVector
+from django.db.models import Func, TextField
+
+LANGUAGES = ('pl', 'en', 'uk')
+
+SEARCH_CONFIGS = {
+    'pl': 'polish_unaccent',
+    'en': 'english_unaccent',
+    'uk': 'ukrainian_unaccent',
+}
+
+# Fields the search vectors are built from
+SEARCH_FIELDS = frozenset(
+    f'{field}_{lang}' for field in ('title', 'description') for lang in LANGUAGES
+)
+
+MAX_TERMS = 8
+
+
+class StripTags(Func):
+    """Plain text of a rich-text column: HTML tags and entities replaced by spaces"""
+    template = (
+        "regexp_replace(regexp_replace(%(expressions)s, '<[^>]*>', ' ', 'g'), "
+        "'&[#a-zA-Z0-9]+;', ' ', 'g')"
+    )
+    output_field = TextField()
+
+
+def search_vector(lang):
+    """tsvector expression for one language"""
+    config = SEARCH_CONFIGS[lang]
+    return (
+        SearchVector(f'title_{lang}', config=config, weight='A')
+        + SearchVector(StripTags(f'description_{lang}'), config=config, weight='B')
+    )
+
+
+def search_query(term, lang):
+    """
+    Prefix tsquery for the words of term ("konc bies" matches "Koncert w Bieszczadach"),
+    or None if term has no words. Prefix matching also covers Polish and Ukrainian
+    inflected forms that the simple dictionary doesn't stem.
+    """
+    words = re.findall(r'\w+', term or '')[:MAX_TERMS]
+    if not words:
+        return None
+    return SearchQuery(
+        ' & '.join(f'{word}:*' for word in words),
+        search_type='raw',
+        config=SEARCH_CONFIGS[lang],
+    )
@@ -1,4 +1,7 @@
 from rest_framework import serializers
+
+from apps.common.sparse_fields import SparseFieldsetMixin
+from apps.gallery.models import Image
 from .models import Event, Organizer, EventDate, Location
 
 
@@ -27,32 +30,46 @@ class LocationSerializer(serializers.ModelSerializer):
 
 
 class TranslatedField(serializers.DictField):
-    """Base field for translated content with language filtering"""
+    """
+    Base field for translated content with language filtering.
+    With ?lang= only that language is returned, falling back to Polish.
+    Querysets built with EventQuerySet.for_language() provide it as
+    <field>_localized, so the per-language columns are never loaded.
+    """
 
     def __init__(self, *args, **kwargs):
         self.fields = kwargs.pop('fields', [])
         super().__init__(*args, **kwargs)
 
+    def requested_language(self):
+        request = self.context.get('request')
+        if request:
+            lang = request.query_params.get('lang', '').lower()
+            if lang in ('pl', 'en', 'uk'):
+                return lang
+        return None
+
     def to_representation(self, value):
         if not value:
             return {}
 
-        # value is a dict with pl, en, uk keys from the model's @property
-        data = {
+        lang = self.requested_language()
+        if lang:
+            return {lang: value.get(lang) or value.get('pl', '')}
+
+        # value is a dict with pl, en, uk keys from get_attribute
+        return {
             'pl': value.get('pl', ''),
             'en': value.get('en', ''),
             'uk': value.get('uk', ''),
         }
 
-        # Filter by language if specified in query params
-        request = self.context.get('request')
-        if request:
-            lang = request.query_params.get('lang', '').lower()
-            if lang in ('pl', 'en', 'uk'):
-                return {lang: data.get(lang, '')}
-        return data
-
     def get_attribute(self, obj):
+        lang = self.requested_language()
+        localized = f'{self.field_name}_localized'
+        if lang and hasattr(obj, localized):
+            return {lang: getattr(obj, localized)}
+
         # Get all language versions from model
         return {
             'pl': getattr(obj, f'{self.field_name}_pl', ''),
@@ -67,7 +84,7 @@ class EventImageField(serializers.Field):
     def to_representation(self, obj):
         # obj is the Event instance
         images = []
-        for event_image in obj.event_images.select_related('image').order_by('order'):
+        for event_image in obj.ordered_event_images:
             image = event_image.image
             images.append({
                 'id': image.id,
@@ -107,16 +124,18 @@ class EventDateSerializer(serializers.ModelSerializer):
         read_only_fields = ['id', 'created_at', 'updated_at', 'is_past']
 
 
-class EventSerializer(serializers.ModelSerializer):
+class EventSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     """
     Standard serializer for Event model
     Includes all fields with proper handling of translated fields and location
 
     Language filtering: Add ?lang=pl|en|uk to query params to get only that language
+    Sparse fieldsets: ?fields=id,title,slug or ?omit=event_dates,images
     """
     # Add computed fields
     is_past = serializers.ReadOnlyField()
     is_free = serializers.ReadOnlyField()
+    next_date = serializers.DateTimeField(source='next_start_date', read_only=True)
 
     # Group language fields into nested structure for frontend
     title = TranslatedField(read_only=True)
@@ -164,8 +183,21 @@ class EventSerializer(serializers.ModelSerializer):
             'updated_at',
             'is_past',
             'is_free',
+            'next_date',
         ]
         read_only_fields = ['id', 'slug', 'created_at', 'updated_at', 'is_past', 'is_free']
+        # Queryset needs of fields that aren't plain columns (see sparse_fields.py)
+        field_requirements = {
+            'title': ('title_pl', 'title_en', 'title_uk'),
+            'description': ('description_pl', 'description_en', 'description_uk'),
+            'latitude': ('location',),
+            'longitude': ('location',),
+            'images': ('event_images',),
+            'event_dates': ('event_dates',),
+            'is_past': ('event_dates', 'start_date', 'end_date'),
+            'is_free': ('price_type',),
+            'next_date': ('next_start_date',),
+        }
 
     def get_latitude(self, obj):
         """Extract latitude from location"""
@@ -180,14 +212,16 @@ class EventSerializer(serializers.ModelSerializer):
         return None
 
 
-class EventListSerializer(serializers.ModelSerializer):
+class EventListSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     """
     Lightweight serializer for event listings
     Only includes essential fields for better performance
 
     Language filtering: Add ?lang=pl|en|uk to query params to get only that language
+    Sparse fieldsets: ?fields=id,title,slug,next_date or ?omit=image
     """
     is_free = serializers.ReadOnlyField()
+    next_date = serializers.DateTimeField(source='next_start_date', read_only=True)
     latitude = serializers.SerializerMethodField()
     longitude = serializers.SerializerMethodField()
 
@@ -220,7 +254,18 @@ class EventListSerializer(serializers.ModelSerializer):
             'currency',
             'image',
             'is_free',
+            'next_date',
         ]
+        field_requirements = {
+            'title': ('title_pl', 'title_en', 'title_uk'),
+            'location_name': ('location',),
+            'location_city': ('location',),
+            'latitude': ('location',),
+            'longitude': ('location',),
+            'image': ('event_images',),
+            'is_free': ('price_type',),
+            'next_date': ('next_start_date',),
+        }
 
     def get_latitude(self, obj):
         if obj.location and obj.location.latitude:
@@ -248,7 +293,70 @@ class EventListSerializer(serializers.ModelSerializer):
         return None
 
 
-class OrganizerSerializer(serializers.ModelSerializer):
+class OccurrenceLocationSerializer(serializers.ModelSerializer):
+    """Compact location embedded in occurrences"""
+    latitude = serializers.FloatField(read_only=True)
+    longitude = serializers.FloatField(read_only=True)
+
+    class Meta:
+        model = Location
+        fields = ['id', 'name', 'city', 'latitude', 'longitude']
+
+
+class OccurrenceEventSerializer(serializers.ModelSerializer):
+    """
+    Compact event summary embedded in occurrences.
+    Expects events from EventQuerySet.for_occurrences().
+    """
+    title = TranslatedField(read_only=True)
+    is_free = serializers.ReadOnlyField()
+    image = serializers.SerializerMethodField()
+
+    class Meta:
+        model = Event
+        fields = [
+            'id',
+            'title',
+            'slug',
+            'category',
+            'event_type',
+            'price_type',
+            'price_amount',
+            'currency',
+            'is_free',
+            'image',
+        ]
+
+    def get_image(self, obj):
+        """Main image URL (annotated main_image_path)"""
+        path = obj.main_image_path
+        return Image._meta.get_field('image').storage.url(path) if path else None
+
+
+class OccurrenceSerializer(serializers.ModelSerializer):
+    """
+    One EventDate for agenda and calendar views (/api/occurrences/),
+    with the event summary and the location it takes place at
+    """
+    is_past = serializers.ReadOnlyField()
+    event = OccurrenceEventSerializer(read_only=True)
+    location = OccurrenceLocationSerializer(source='venue', read_only=True)
+
+    class Meta:
+        model = EventDate
+        fields = [
+            'id',
+            'start_date',
+            'end_date',
+            'duration_minutes',
+            'notes',
+            'is_past',
+            'event',
+            'location',
+        ]
+
+
+class OrganizerSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     """
     Serializer for Organizer model
     Includes event count and upcoming events info
@@ -275,18 +383,25 @@ class OrganizerSerializer(serializers.ModelSerializer):
             'updated_at',
         ]
         read_only_fields = ['id', 'created_at', 'updated_at', 'events_count', 'upcoming_events_count']
+        field_requirements = {
+            'events_count': ('event_counts',),
+            'upcoming_events_count': ('event_counts',),
+        }
 
     def get_events_count(self, obj):
         """Get total number of events for this organizer"""
+        if hasattr(obj, 'events_count'):
+            return obj.events_count  # OrganizerQuerySet.with_event_counts()
         return obj.events.count()
 
     def get_upcoming_events_count(self, obj):
         """Get count of upcoming events"""
-        from django.utils import timezone
-        return obj.events.filter(start_date__gte=timezone.now()).count()
+        if hasattr(obj, 'upcoming_events_count'):
+            return obj.upcoming_events_count
+        return obj.events.upcoming().count()
 
 
-class OrganizerListSerializer(serializers.ModelSerializer):
+class OrganizerListSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     """
     Lightweight serializer for organizer listings
     Only includes essential fields for better performance
@@ -303,7 +418,12 @@ class OrganizerListSerializer(serializers.ModelSerializer):
             'is_active',
             'events_count',
         ]
+        field_requirements = {
+            'events_count': ('event_counts',),
+        }
 
     def get_events_count(self, obj):
         """Get total number of events for this organizer"""
+        if hasattr(obj, 'events_count'):
+            return obj.events_count  # OrganizerQuerySet.with_event_counts()
         return obj.events.count()
@@ -0,0 +1,47 @@
+"""
+Occurrence Bounds
+
+Refreshes the denormalized first/next/last dates on Event after EventDate
+changes, either immediately or batched once per block of bulk writes.
+"""
+
+import threading
+from contextlib import contextmanager
+
+from ..models import Event
+
+_state = threading.local()
+
+
+def refresh_date_bounds(event_ids):
+    """Refresh occurrence bounds for the given events, or defer it if batching"""
+    event_ids = {pk for pk in event_ids if pk is not None}
+    if not event_ids:
+        return
+    pending = getattr(_state, 'pending_event_ids', None)
+    if pending is not None:
+        pending.update(event_ids)
+        return
+    Event.objects.filter(pk__in=event_ids).refresh_date_bounds()
+
+
+@contextmanager
+def deferred_date_bounds():
+    """
+    Collect EventDate changes and refresh the affected events once on exit.
+    Use around bulk writes (e.g. EventImporter) to avoid one UPDATE per date.
+    Code using bulk_create/update should add its event ids with
+    refresh_date_bounds() inside the block.
+    """
+    if getattr(_state, 'pending_event_ids', None) is not None:
+        # Nested block - the outermost one does the refresh
+        yield
+        return
+
+    _state.pending_event_ids = set()
+    try:
+        yield
+    finally:
+        pending = _state.pending_event_ids
+        _state.pending_event_ids = None
+        refresh_date_bounds(pending)
@@ -3,38 +3,113 @@ Event Import Service
 
 Imports events from JSON file, creating locations and organizers as needed.
 Skips existing events that have the same title + date + location combination.
+
+Each record's content fingerprint is stored on Event (import_fingerprint):
+re-importing an unchanged record writes nothing, and a changed one updates
+only the fields whose value changed.
+
+Bulk mode (EventImporter(bulk=True)) gives the same result for large files
+with a fixed number of queries per chunk of records: the chunk's organizers,
+locations, events (by slug) and existing dates are loaded into dicts, records
+are resolved in memory and written with bulk_create/bulk_update in one
+transaction per chunk. Bulk writes send no signals, so the chunk refreshes
+search vectors, occurrence bounds, cached responses and vector tiles itself.
+If a chunk's writes fail, its records are imported one by one, each in its
+own savepoint, so a bad record doesn't cost the rest of the chunk.
+
+Files and uploads are streamed (JSON arrays and NDJSON, see json_stream) and
+imported in batches of chunk_size records, so memory doesn't grow with the
+file; errors carry the byte offset of their record.
 """
 
+import hashlib
+import io
 import json
 import logging
 from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Any, Optional
+from itertools import islice
+from typing import Any, Callable, Iterable, Iterator, NamedTuple, Optional
 
+from django.core.exceptions import ValidationError
+from django.db import IntegrityError, transaction
+from django.db.models import Q
 from django.utils import timezone
 from django.utils.text import slugify
 
+from apps.common import response_cache
+from apps.common.response_cache import deferred_invalidation
 from ..models import Event, EventDate, Location, Organizer
+from ..search import SEARCH_FIELDS
+from . import vector_tiles
+from .date_bounds import deferred_date_bounds, refresh_date_bounds
+from .json_stream import Record, iter_records
 
 logger = logging.getLogger(__name__)
 
 
+class ParsedRecord(NamedTuple):
+    """Bulk mode: a valid record with its dates as (date_data, start, end, location key)"""
+    index: int
+    data: dict[str, Any]
+    slug: str
+    fingerprint: str
+    dates: list[tuple]
+
+
+def record_fingerprint(event_data: Any) -> str:
+    """SHA-256 of a record's canonical JSON (key order and whitespace don't matter)"""
+    canonical = json.dumps(event_data, sort_keys=True, separators=(',', ':'), ensure_ascii=False, default=str)
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+
+def same_value(field_name: str, old_value: Any, new_value: Any) -> bool:
+    """Whether an Event field keeps its value (50 and Decimal('50.00') are the same price)"""
+    field = Event._meta.get_field(field_name)
+    try:
+        return field.to_python(old_value) == field.to_python(new_value)
+    except ValidationError:
+        return old_value == new_value
+
+
+def batches(items: Iterable, size: int) -> Iterator[list]:
+    items = iter(items)
+    while batch := list(islice(items, size)):
+        yield batch
+
+
 @dataclass
 class ImportResult:
     """Result of event import operation"""
     imported: int = 0
     skipped: int = 0
-    errors: list[dict[str, Any]] = field(default_factory=list)
+    processed: int = 0  # records read, valid or not
+    position: int = 0  # byte offset of the last record read from a stream
+    error_count: int = 0
+    errors: list[dict[str, Any]] = field(default_factory=list)  # the first MAX_ERRORS
+
+    # Error details kept, so memory stays flat for a broken file (all are logged and counted)
+    MAX_ERRORS = 100
 
     def add_error(self, index: int, title: str, message: str):
         """Add an error to the result"""
-        self.errors.append({
-            'index': index,
-            'title': title,
-            'error': message
-        })
+        self.error_count += 1
+        if len(self.errors) < self.MAX_ERRORS:
+            self.errors.append({
+                'index': index,
+                'title': title,
+                'error': message
+            })
         logger.error(f"Import error at index {index} ({title}): {message}")
 
+    def checkpoint(self) -> tuple[int, int, int]:
+        return self.skipped, self.error_count, len(self.errors)
+
+    def restore(self, checkpoint: tuple[int, int, int]):
+        """Drop the skips and errors counted since checkpoint()"""
+        self.skipped, self.error_count, stored = checkpoint
+        del self.errors[stored:]
+
 
 class EventImporter:
     """
@@ -97,8 +172,20 @@ class EventImporter:
     # Location type mapping
     LOCATION_TYPES = {'VENUE', 'OUTDOOR', 'PRIVATE', 'VIRTUAL'}
 
-    def __init__(self):
+    # Fields an import overwrites on an existing event
+    UPDATE_FIELDS = [
+        'title_pl', 'title_en', 'title_uk',
+        'description_pl', 'description_en', 'description_uk',
+        'price_amount', 'currency', 'external_url', 'ticket_url', 'age_restriction',
+    ]
+
+    def __init__(self, bulk: bool = False, chunk_size: int = 500,
+                 on_progress: Optional[Callable[[ImportResult], None]] = None):
         self.result = ImportResult()
+        self.bulk = bulk
+        self.chunk_size = chunk_size
+        # Called with the running result after every batch (see ImportJob)
+        self.on_progress = on_progress
 
     def parse_date(self, date_str: str) -> Optional[datetime]:
         """Parse date string to datetime, assuming Poland timezone"""
@@ -154,10 +241,17 @@ class EventImporter:
             return existing
 
         # Create new location
-        location = Location(
-            name=name,
+        location = self.build_location(location_data)
+        location.save()
+        logger.info(f"Created new location: {name} ({city})")
+        return location
+
+    def build_location(self, location_data: dict[str, Any]) -> Location:
+        """Unsaved Location from import data"""
+        return Location(
+            name=location_data['name'],
             shortname=location_data.get('shortname', ''),
-            city=city,
+            city=location_data.get('city', ''),
             address=location_data.get('address', ''),
             latitude=location_data.get('latitude'),
             longitude=location_data.get('longitude'),
@@ -170,9 +264,6 @@ class EventImporter:
             amenities=location_data.get('amenities', []),
             description=location_data.get('description', ''),
         )
-        location.save()
-        logger.info(f"Created new location: {name} ({city})")
-        return location
 
     def get_or_create_organizer(self, organizer_data: dict[str, Any]) -> Optional[Organizer]:
         """
@@ -238,22 +329,9 @@ class EventImporter:
 
         return True  # All dates already exist
 
-    def import_event(self, event_data: dict[str, Any], index: int) -> bool:
-        """
-        Import a single event from JSON data.
-        Returns True if imported, False if skipped.
-        """
-        title_pl = event_data.get('title_pl', '')
-
-        if not title_pl:
-            self.result.add_error(index, 'N/A', 'Missing title_pl')
-            return False
-
-        dates_data = event_data.get('dates', [])
-        if not dates_data:
-            self.result.add_error(index, title_pl, 'Missing dates array')
-            return False
-
+    def build_event(self, event_data: dict[str, Any], slug: str,
+                    organizer: Optional[Organizer]) -> Event:
+        """Unsaved new Event with validated choice fields (other fields: update_event)"""
         # Validate category
         category = event_data.get('category', 'CULTURAL')
         if category not in self.CATEGORIES:
@@ -269,39 +347,21 @@ class EventImporter:
         if price_type not in self.PRICE_TYPES:
             price_type = 'FREE'
 
-        # Get or create organizer
-        organizer_info = {
-            'organizer_id': event_data.get('organizer_id'),
-            'organizer_name': event_data.get('organizer_name'),
-        }
-        organizer = self.get_or_create_organizer(organizer_info)
-
-        # Check if event exists by slug
-        slug = slugify(title_pl)
-        existing_event = Event.objects.filter(slug=slug).first()
+        return Event(
+            slug=slug,
+            category=category,
+            event_type=event_type,
+            price_type=price_type,
+            organizer=organizer,
+        )
 
-        if existing_event:
-            # Check if dates/locations are different
-            if self.event_exists(existing_event, dates_data):
-                logger.info(f"Skipping existing event: {title_pl}")
-                self.result.skipped += 1
-                return False
-            else:
-                # Update existing event and add new dates
-                event = existing_event
-                logger.info(f"Updating existing event with new dates: {title_pl}")
-        else:
-            # Create new event
-            event = Event(
-                slug=slug,
-                category=category,
-                event_type=event_type,
-                price_type=price_type,
-                organizer=organizer,
-            )
-            logger.info(f"Creating new event: {title_pl}")
+    def update_event(self, event: Event, event_data: dict[str, Any]) -> list[str]:
+        """
+        Set UPDATE_FIELDS of a new or existing event from import data.
+        Returns the fields whose value changed.
+        """
+        old_values = {name: getattr(event, name) for name in self.UPDATE_FIELDS}
 
-        # Update event fields
         event.title_pl = event_data.get('title_pl') or event.title_pl
         event.title_en = event_data.get('title_en') or event.title_en
         event.title_uk = event_data.get('title_uk') or event.title_uk
@@ -320,7 +380,79 @@ class EventImporter:
         event.ticket_url = event_data.get('ticket_url', '')
         event.age_restriction = event_data.get('age_restriction')
 
-        event.save()
+        return [
+            name for name, old_value in old_values.items()
+            if not same_value(name, old_value, getattr(event, name))
+        ]
+
+    def build_event_date(self, event: Event, location: Optional[Location], date_data: dict[str, Any],
+                         start_date: datetime, end_date: Optional[datetime]) -> EventDate:
+        return EventDate(
+            event=event,
+            location=location,
+            start_date=start_date,
+            end_date=end_date,
+            duration_minutes=date_data.get('duration_minutes'),
+            notes=date_data.get('notes', ''),
+        )
+
+    def import_event(self, event_data: dict[str, Any], index: int) -> bool:
+        """
+        Import a single event from JSON data.
+        Returns True if imported, False if skipped.
+        """
+        title_pl = event_data.get('title_pl', '')
+
+        if not title_pl:
+            self.result.add_error(index, 'N/A', 'Missing title_pl')
+            return False
+
+        dates_data = event_data.get('dates', [])
+        if not dates_data:
+            self.result.add_error(index, title_pl, 'Missing dates array')
+            return False
+
+        # Check if event exists by slug
+        slug = slugify(title_pl)
+        fingerprint = record_fingerprint(event_data)
+        existing_event = Event.objects.filter(slug=slug).first()
+
+        if existing_event:
+            if existing_event.import_fingerprint == fingerprint:
+                logger.info(f"Skipping unchanged event: {title_pl}")
+                self.result.skipped += 1
+                return False
+
+            event = existing_event
+            dirty = self.update_event(event, event_data)
+            if not dirty and self.event_exists(event, dates_data):
+                # Only the fingerprint to store: no signals, cached responses stay valid
+                Event.objects.filter(pk=event.pk).update(import_fingerprint=fingerprint)
+                logger.info(f"Skipping existing event: {title_pl}")
+                self.result.skipped += 1
+                return False
+
+            # Update changed fields and add new dates
+            logger.info(f"Updating existing event: {title_pl} ({', '.join(dirty) or 'new dates'})")
+            event.import_fingerprint = fingerprint
+            if dirty:
+                event.save(update_fields=[*dirty, 'import_fingerprint', 'updated_at'])
+            else:
+                Event.objects.filter(pk=event.pk).update(import_fingerprint=fingerprint)
+        else:
+            # Get or create organizer
+            organizer_info = {
+                'organizer_id': event_data.get('organizer_id'),
+                'organizer_name': event_data.get('organizer_name'),
+            }
+            organizer = self.get_or_create_organizer(organizer_info)
+
+            # Create new event
+            event = self.build_event(event_data, slug, organizer)
+            self.update_event(event, event_data)
+            event.import_fingerprint = fingerprint
+            event.save()
+            logger.info(f"Creating new event: {title_pl}")
 
         # Process dates
         for date_data in dates_data:
@@ -344,20 +476,293 @@ class EventImporter:
                 continue
 
             # Create new EventDate
-            event_date = EventDate(
-                event=event,
-                location=location,
-                start_date=start_date,
-                end_date=end_date,
-                duration_minutes=date_data.get('duration_minutes'),
-                notes=date_data.get('notes', ''),
-            )
+            event_date = self.build_event_date(event, location, date_data, start_date, end_date)
             event_date.save()
             logger.info(f"Added new date: {start_date} at {location}")
 
         self.result.imported += 1
         return True
 
+    def import_each(self, records: Iterable[tuple[int, Any]]):
+        """Import (index, event_data) records one by one, each in its own savepoint"""
+        for index, event_data in records:
+            try:
+                with transaction.atomic():
+                    self.import_event(event_data, index)
+            except Exception as e:
+                title = event_data.get('title_pl', 'N/A') if isinstance(event_data, dict) else 'N/A'
+                self.result.add_error(index, title, str(e))
+
+    def parse_record(self, event_data: Any, index: int) -> Optional[ParsedRecord]:
+        """
+        Bulk mode: validate a record and parse its dates (those with a valid
+        start), without queries. None (with an error added) if invalid.
+        """
+        if not isinstance(event_data, dict):
+            self.result.add_error(index, 'N/A', 'Event must be an object')
+            return None
+
+        title_pl = event_data.get('title_pl', '')
+        if not title_pl:
+            self.result.add_error(index, 'N/A', 'Missing title_pl')
+            return None
+
+        dates_data = event_data.get('dates', [])
+        if not dates_data:
+            self.result.add_error(index, title_pl, 'Missing dates array')
+            return None
+
+        slug = slugify(title_pl)
+        if len(slug) > Event._meta.get_field('slug').max_length:
+            self.result.add_error(index, title_pl, 'Title too long for a slug')
+            return None
+
+        dates = []
+        for date_data in dates_data:
+            start_date = self.parse_date(date_data.get('start_date', ''))
+            end_date = self.parse_date(date_data.get('end_date', ''))
+            if not start_date:
+                continue
+            location_data = date_data.get('location', {})
+            location_key = None
+            if location_data and location_data.get('name'):
+                location_key = (location_data['name'], location_data.get('city', ''))
+            dates.append((date_data, start_date, end_date, location_key))
+
+        return ParsedRecord(index, event_data, slug, record_fingerprint(event_data), dates)
+
+    def resolve_organizer(self, event_data: dict[str, Any], by_id: dict[str, Organizer],
+                          by_name: dict[str, Organizer]) -> Optional[Organizer]:
+        """Bulk mode: get_or_create_organizer() over preloaded organizers (new ones unsaved)"""
+        if organizer_id := event_data.get('organizer_id'):
+            if organizer := by_id.get(str(organizer_id)):
+                return organizer
+            logger.warning(f"Organizer ID {organizer_id} not found")
+
+        if name := event_data.get('organizer_name'):
+            if name not in by_name:
+                by_name[name] = Organizer(name=name)
+            return by_name[name]
+
+        return None
+
+    def import_chunk(self, records: list[tuple[int, Any]], attempts: int = 3):
+        """
+        Bulk mode: import (index, event_data) records with a fixed number of
+        queries. Organizers, locations, events (by slug) and dates of existing
+        events are loaded into dicts, records are resolved in memory and the
+        new rows are written with bulk_create/bulk_update in one transaction.
+        New events keep their base slug, the importer's event identity: if a
+        concurrent import inserts one of them first (IntegrityError), the
+        chunk is resolved again and matches that event; if the writes fail
+        otherwise, its records are imported one by one (import_each), so
+        only the offending ones get an error.
+        """
+        checkpoint = self.result.checkpoint()
+        parsed = []
+        for index, event_data in records:
+            try:
+                if record := self.parse_record(event_data, index):
+                    parsed.append(record)
+            except Exception as e:
+                self.result.add_error(index, event_data.get('title_pl', 'N/A'), str(e))
+        if not parsed:
+            return
+
+        # Preload lookup indexes
+        events = {
+            event.slug: event
+            for event in Event.objects.filter(
+                slug__in={record.slug for record in parsed}
+            ).only('pk', 'slug', 'import_fingerprint', *self.UPDATE_FIELDS)
+        }
+
+        # Records of unchanged events (same fingerprint) need nothing more
+        pending = []
+        for record in parsed:
+            event = events.get(record.slug)
+            if event is not None and event.import_fingerprint == record.fingerprint:
+                logger.info(f"Skipping unchanged event: {record.data['title_pl']}")
+                self.result.skipped += 1
+            else:
+                pending.append(record)
+        if not pending:
+            return
+
+        date_keys = set(
+            EventDate.objects.filter(
+                event__slug__in=[record.slug for record in pending if record.slug in events]
+            ).values_list('event__slug', 'start_date', 'location__name', 'location__city')
+        )
+
+        location_keys = {key for record in pending for *_, key in record.dates if key}
+        locations = {}
+        for location in Location.objects.filter(
+            name__in={name for name, _ in location_keys},
+            city__in={city for _, city in location_keys},
+        ):
+            key = (location.name, location.city)
+            if key in location_keys:
+                locations.setdefault(key, location)
+
+        organizer_ids = {
+            str(record.data['organizer_id']) for record in pending
+            if str(record.data.get('organizer_id') or '').isdigit()
+        }
+        organizers_by_id = {
+            str(pk): organizer for pk, organizer in Organizer.objects.in_bulk(organizer_ids).items()
+        }
+        organizers_by_name = {}
+        for organizer in Organizer.objects.filter(
+            name__in={record.data['organizer_name'] for record in pending if record.data.get('organizer_name')}
+        ):
+            organizers_by_name.setdefault(organizer.name, organizer)
+        known_organizers = set(organizers_by_name)
+
+        # Resolve records in memory
+        new_events, new_dates, new_locations = [], [], []
+        updated_events = {}  # existing events with a new fingerprint
+        dirty_fields = {}  # their changed UPDATE_FIELDS
+        touched_ids = set()  # existing events with changed fields or new dates
+        imported = []
+        for index, event_data, slug, fingerprint, dates in pending:
+            event = events.get(slug)
+            if event is not None and event.import_fingerprint == fingerprint:
+                # Repeated record within the chunk
+                self.result.skipped += 1
+                continue
+
+            if event is None:
+                organizer = self.resolve_organizer(event_data, organizers_by_id, organizers_by_name)
+                event = events[slug] = self.build_event(event_data, slug, organizer)
+                new_events.append(event)
+                self.update_event(event, event_data)
+                changed = True
+            else:
+                dirty = self.update_event(event, event_data)
+                if event.pk:
+                    updated_events[event.pk] = event
+                    dirty_fields.setdefault(event.pk, set()).update(dirty)
+                changed = bool(dirty)
+            event.import_fingerprint = fingerprint
+
+            for date_data, start_date, end_date, location_key in dates:
+                key = (slug, start_date, *(location_key or (None, None)))
+                if key in date_keys:
+                    continue
+                date_keys.add(key)
+                location = None
+                if location_key:
+                    location = locations.get(location_key)
+                    if location is None:
+                        location = locations[location_key] = self.build_location(date_data['location'])
+                        new_locations.append(location)
+                new_dates.append(self.build_event_date(event, location, date_data, start_date, end_date))
+                changed = True
+
+            if changed:
+                if event.pk:
+                    touched_ids.add(event.pk)
+                imported.append((index, event_data['title_pl']))
+            else:
+                logger.info(f"Skipping existing event: {event_data['title_pl']}")
+                self.result.skipped += 1
+
+        if not (new_events or updated_events):
+            return
+
+        new_organizers = [
+            organizer for name, organizer in organizers_by_name.items() if name not in known_organizers
+        ]
+        changed_fields = [
+            name for name in self.UPDATE_FIELDS if any(name in fields for fields in dirty_fields.values())
+        ]
+        dirty_events = [updated_events[pk] for pk, fields in dirty_fields.items() if fields]
+        fingerprint_only = [updated_events[pk] for pk, fields in dirty_fields.items() if not fields]
+        now = timezone.now()
+        for event in dirty_events:
+            event.updated_at = now  # bulk_update skips auto_now
+        for location in new_locations:
+            location.sync_point()
+
+        try:
+            with transaction.atomic():
+                Organizer.objects.bulk_create(new_organizers)
+                Location.objects.bulk_create(new_locations)
+                Event.objects.bulk_create(new_events)
+                Event.objects.bulk_update(dirty_events, [*changed_fields, 'import_fingerprint', 'updated_at'])
+                Event.objects.bulk_update(fingerprint_only, ['import_fingerprint'])
+                EventDate.objects.bulk_create(new_dates)
+                searched_ids = [event.pk for event in new_events] + [
+                    pk for pk, fields in dirty_fields.items() if fields & SEARCH_FIELDS
+                ]
+                if searched_ids:
+                    Event.objects.filter(pk__in=searched_ids).refresh_search_vectors()
+        except Exception as e:
+            self.result.restore(checkpoint)
+            if isinstance(e, IntegrityError) and attempts > 1:
+                logger.warning(f"Resolving import chunk again after a concurrent write: {e}")
+                return self.import_chunk(records, attempts - 1)
+            logger.warning(f"Bulk import of a chunk failed, importing its records one by one: {e}")
+            return self.import_each(records)
+
+        if not imported:
+            # Only fingerprints were stored: nothing visible changed
+            return
+
+        # Bulk writes send no signals
+        event_ids = [event.pk for event in new_events] + list(touched_ids)
+        refresh_date_bounds(event_ids)
+        response_cache.invalidate(Event, EventDate, Location, Organizer)
+        vector_tiles.bump_location_versions(
+            Location.objects.filter(
+                Q(events__in=event_ids) | Q(event_dates__event__in=event_ids)
+            ).values_list('pk', flat=True).distinct()
+        )
+
+        self.result.imported += len(imported)
+        logger.info(
+            f"Imported {len(imported)} events ({len(new_events)} new, {len(dirty_events)} updated), "
+            f"{len(new_dates)} dates, {len(new_locations)} locations, {len(new_organizers)} organizers"
+        )
+
+    def import_records(self, records: Iterable[Record]) -> ImportResult:
+        """
+        Import records (index, byte offset, event data, parse error) in
+        batches of chunk_size, keeping only the current batch in memory.
+        Errors of records with a known offset get an 'offset' key.
+        """
+        self.result = ImportResult()
+
+        # Refresh Event occurrence bounds once per event, not once per date,
+        # then invalidate cached API responses and map tiles once at the end
+        with vector_tiles.deferred_bumps(), deferred_invalidation(), deferred_date_bounds():
+            for batch in batches(records, self.chunk_size):
+                first_error = len(self.result.errors)
+                valid = []
+                for record in batch:
+                    if record.error:
+                        self.result.add_error(record.index, 'N/A', record.error)
+                    else:
+                        valid.append((record.index, record.data))
+
+                if self.bulk:
+                    self.import_chunk(valid)
+                else:
+                    self.import_each(valid)
+
+                offsets = {record.index: record.offset for record in batch}
+                for error in self.result.errors[first_error:]:
+                    if offsets.get(error['index']) is not None:
+                        error['offset'] = offsets[error['index']]
+
+                self.result.processed += len(batch)
+                self.result.position = batch[-1].offset or 0
+                if self.on_progress:
+                    self.on_progress(self.result)
+
+        return self.result
+
     def import_from_json(self, json_data: list[dict[str, Any]]) -> ImportResult:
         """
         Import events from JSON data list.
@@ -368,56 +773,51 @@ class EventImporter:
         Returns:
             ImportResult with counts and errors
         """
-        self.result = ImportResult()
-
         if not isinstance(json_data, list):
+            self.result = ImportResult()
             self.result.add_error(0, 'N/A', 'JSON data must be an array')
             return self.result
 
-        for index, event_data in enumerate(json_data):
-            try:
-                self.import_event(event_data, index)
-            except Exception as e:
-                title = event_data.get('title_pl', 'N/A')
-                self.result.add_error(index, title, str(e))
+        return self.import_records(
+            Record(index, None, event_data) for index, event_data in enumerate(json_data)
+        )
 
-        return self.result
+    def import_from_stream(self, stream) -> ImportResult:
+        """
+        Import events from a binary stream (uploaded or open file) holding a
+        JSON array or NDJSON, read in blocks (see json_stream).
+
+        Returns:
+            ImportResult with counts and errors (with byte offsets)
+        """
+        return self.import_records(iter_records(stream))
 
     def import_from_string(self, json_string: str) -> ImportResult:
         """
         Import events from JSON string.
 
         Args:
-            json_string: JSON string containing events array
+            json_string: JSON string containing events array (or NDJSON)
 
         Returns:
             ImportResult with counts and errors
         """
-        try:
-            data = json.loads(json_string)
-        except json.JSONDecodeError as e:
-            self.result = ImportResult()
-            self.result.add_error(0, 'N/A', f'Invalid JSON: {e}')
-            return self.result
-
-        return self.import_from_json(data)
+        return self.import_from_stream(io.BytesIO(json_string.encode('utf-8')))
 
     def import_from_file(self, file_path: str) -> ImportResult:
         """
-        Import events from JSON file.
+        Import events from JSON file, streamed (see import_from_stream).
 
         Args:
-            file_path: Path to JSON file
+            file_path: Path to JSON or NDJSON file
 
         Returns:
             ImportResult with counts and errors
         """
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-        except (IOError, json.JSONDecodeError) as e:
+            with open(file_path, 'rb') as f:
+                return self.import_from_stream(f)
+        except IOError as e:
             self.result = ImportResult()
             self.result.add_error(0, 'N/A', f'Error reading file: {e}')
             return self.result
-
-        return self.import_from_json(data)
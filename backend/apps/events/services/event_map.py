@@ -0,0 +1,168 @@
+"""
+Event Map Service
+
+Clusters event pins (event x location) in SQL for the map view.
+Low zooms get grid clusters with counts and a representative event,
+high zooms get individual pins with a compact event summary.
+"""
+
+import hashlib
+import math
+from typing import Any, Optional
+from urllib.parse import urlencode
+
+from django.db import connection
+
+from apps.common import response_cache
+from ..models import Event
+
+# Zoom range served; below MIN_ZOOM the whole region fits one screen anyway
+MIN_ZOOM = 5
+MAX_ZOOM = 20
+
+# From this zoom on, individual pins are returned instead of clusters
+POINTS_MIN_ZOOM = 14
+
+# Cluster grid resolution: cells per tile width (256 px tiles -> 32 px cells)
+CELLS_PER_TILE = 8
+
+MAX_POINTS = 2000
+
+CACHE_TIMEOUT = 60
+
+# Pins: one row per (event, location) for events in the filtered queryset,
+# through Event.location and EventDate.location
+PINS_SQL = """
+    SELECT e.id AS event_id, l.id AS location_id, e.next_start_date,
+           l.point::geometry AS geom
+    FROM events_event e
+    JOIN events_location l ON l.id = e.location_id
+    WHERE e.id IN ({events})
+      AND l.point && ST_MakeEnvelope(%s, %s, %s, %s, 4326)::geography
+    UNION
+    SELECT e.id, l.id, e.next_start_date, l.point::geometry
+    FROM events_eventdate d
+    JOIN events_event e ON e.id = d.event_id
+    JOIN events_location l ON l.id = d.location_id
+    WHERE e.id IN ({events})
+      AND l.point && ST_MakeEnvelope(%s, %s, %s, %s, 4326)::geography
+"""
+
+CLUSTERS_SQL = """
+    SELECT ST_Y(ST_Centroid(ST_Collect(geom))) AS lat,
+           ST_X(ST_Centroid(ST_Collect(geom))) AS lng,
+           COUNT(DISTINCT event_id) AS count,
+           (ARRAY_AGG(event_id ORDER BY next_start_date NULLS LAST, event_id))[1] AS event_id
+    FROM ({pins}) AS pins
+    GROUP BY ST_SnapToGrid(geom, %s)
+"""
+
+POINTS_SQL = """
+    SELECT event_id, location_id, ST_Y(geom) AS lat, ST_X(geom) AS lng
+    FROM ({pins}) AS pins
+    ORDER BY next_start_date NULLS LAST, event_id
+    LIMIT %s
+"""
+
+
+def parse_bbox(value: Optional[str]) -> Optional[tuple[float, float, float, float]]:
+    """Parse ?bbox=west,south,east,north"""
+    try:
+        west, south, east, north = (float(v) for v in value.split(','))
+    except (AttributeError, ValueError):
+        return None
+    if west >= east or south >= north:
+        return None
+    return west, south, east, north
+
+
+def parse_zoom(value: Optional[str]) -> int:
+    try:
+        zoom = int(value)
+    except (TypeError, ValueError):
+        zoom = MIN_ZOOM
+    return min(max(zoom, MIN_ZOOM), MAX_ZOOM)
+
+
+def tile_size(zoom: int) -> float:
+    """Tile width in degrees at zoom"""
+    return 360 / 2 ** zoom
+
+
+def align_bbox(bbox: tuple[float, float, float, float], zoom: int) -> tuple[float, float, float, float]:
+    """Expand bbox to the tile grid so nearby viewports share cache entries"""
+    step = tile_size(zoom)
+    west, south, east, north = bbox
+    return (
+        max(math.floor(west / step) * step, -180.0),
+        max(math.floor(south / step) * step, -85.0),
+        min(math.ceil(east / step) * step, 180.0),
+        min(math.ceil(north / step) * step, 85.0),
+    )
+
+
+def cache_key(params, bbox: tuple[float, float, float, float], zoom: int, versions: list[int]) -> str:
+    """
+    Cache key for a tile-aligned bbox, zoom, the remaining (filter) params
+    and the data versions of the models in the payload (see response_cache)
+    """
+    filters = sorted(
+        (key, value)
+        for key, values in params.lists() if key not in ('bbox', 'zoom')
+        for value in values
+    )
+    digest = hashlib.md5(urlencode(filters).encode('utf-8')).hexdigest()
+    version = '.'.join(map(str, versions))
+    return '{}:events-map:{}:{:.6f}:{:.6f}:{:.6f}:{:.6f}:{}:{}'.format(
+        response_cache.namespace(), zoom, *bbox, digest, version
+    )
+
+
+def build_map(events, bbox: tuple[float, float, float, float], zoom: int, lang: str = 'pl') -> dict[str, Any]:
+    """
+    Clusters (or pins at high zoom) for the events queryset inside bbox.
+    bbox should already be tile-aligned (see align_bbox).
+    """
+    events_sql, events_params = events.order_by().values('pk').query.sql_with_params()
+    pins_sql = PINS_SQL.format(events=events_sql)
+    pins_params = [*events_params, *bbox, *events_params, *bbox]
+
+    with connection.cursor() as cursor:
+        if zoom >= POINTS_MIN_ZOOM:
+            cursor.execute(POINTS_SQL.format(pins=pins_sql), [*pins_params, MAX_POINTS])
+            rows = cursor.fetchall()
+            summaries = event_summaries({row[0] for row in rows}, lang)
+            points = [
+                {'lat': lat, 'lng': lng, 'location_id': location_id, **summaries[event_id]}
+                for event_id, location_id, lat, lng in rows
+            ]
+            return {'zoom': zoom, 'bbox': bbox, 'clusters': [], 'points': points}
+
+        cell = tile_size(zoom) / CELLS_PER_TILE
+        cursor.execute(CLUSTERS_SQL.format(pins=pins_sql), [*pins_params, cell])
+        rows = cursor.fetchall()
+
+    summaries = event_summaries({row[3] for row in rows}, lang)
+    clusters = [
+        {'lat': lat, 'lng': lng, 'count': count, 'event': summaries[event_id]}
+        for lat, lng, count, event_id in rows
+    ]
+    return {'zoom': zoom, 'bbox': bbox, 'clusters': clusters, 'points': []}
+
+
+def event_summaries(event_ids, lang: str) -> dict[int, dict[str, Any]]:
+    """Compact per-event payload for map markers"""
+    title_field = f'title_{lang}' if lang in ('pl', 'en', 'uk') else 'title_pl'
+    rows = Event.objects.filter(pk__in=event_ids).values(
+        'id', 'slug', 'category', 'next_start_date', *{'title_pl', title_field}
+    )
+    return {
+        row['id']: {
+            'id': row['id'],
+            'title': row[title_field] or row['title_pl'] or '',
+            'slug': row['slug'],
+            'category': row['category'],
+            'next_date': row['next_start_date'],
+        }
+        for row in rows
+    }
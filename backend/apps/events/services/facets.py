@@ -0,0 +1,163 @@
+"""
+Event Facets Service
+
+Counts for the filter panel (/api/events/facets/): events per category,
+price type, city and day (today, tomorrow, this week...) over upcoming
+occurrences (EventDate rows) of the events matching the list filters.
+
+Each facet's counts apply every active filter except its own, so the
+panel shows how many events choosing another value would give. All
+facets come from one GROUPING SETS query: the match of each facet's
+filter is a column of the occurrence rows, and every grouping set counts
+the rows matching the other facets.
+"""
+
+from datetime import timedelta
+from typing import Any
+
+from django.db import connection
+from django.utils import timezone
+
+from ..filters import EventFilterBackend
+from ..models import Event
+
+FACETS = ('category', 'price_type', 'city', 'day')
+
+# Query params of the facets; the remaining list filters narrow the events
+FACET_PARAMS = ('category', 'price_type', 'city', 'dateFrom', 'dateTo')
+
+# Buckets of the day facet, by start of the occurrence (ongoing ones are "today")
+DAY_BUCKETS = ('today', 'tomorrow', 'week', 'month', 'later')
+
+OCCURRENCES_SQL = """
+    SELECT d.event_id,
+           e.category,
+           e.price_type,
+           COALESCE(dl.city, el.city) AS city,
+           CASE WHEN d.start_date < %s THEN 'today'
+                WHEN d.start_date < %s THEN 'tomorrow'
+                WHEN d.start_date < %s THEN 'week'
+                WHEN d.start_date < %s THEN 'month'
+                ELSE 'later' END AS day,
+           {matches}
+    FROM events_eventdate d
+    JOIN events_event e ON e.id = d.event_id
+    LEFT JOIN events_location dl ON dl.id = d.location_id
+    LEFT JOIN events_location el ON el.id = e.location_id
+    WHERE d.event_id IN ({events})
+      AND (d.end_date >= %s OR (d.end_date IS NULL AND d.start_date >= %s))
+"""
+
+FACETS_SQL = """
+    SELECT {groupings}, {facets},
+           CASE {counts} ELSE COUNT(DISTINCT event_id) FILTER (WHERE {all_match}) END
+    FROM ({occurrences}) AS occurrences
+    GROUP BY GROUPING SETS ({grouping_sets}, ())
+"""
+
+
+def facet_matches(params) -> tuple[list[str], list[Any]]:
+    """
+    SQL columns match_<facet>: whether an occurrence passes that facet's
+    filter (TRUE when the filter isn't active), with their params
+    """
+    columns, values = [], []
+
+    for facet, choices in (
+        ('category', Event.CATEGORY_CHOICES),
+        ('price_type', Event.PRICE_TYPE_CHOICES),
+    ):
+        selected = EventFilterBackend.parse_choices(params.get(facet), choices)
+        if selected:
+            columns.append(f'e.{facet} = ANY(%s) AS match_{facet}')
+            values.append(selected)
+        else:
+            columns.append(f'TRUE AS match_{facet}')
+
+    if city := params.get('city'):
+        columns.append('(dl.city = %s OR (d.location_id IS NULL AND el.city = %s)) AS match_city')
+        values += [city, city]
+    else:
+        columns.append('TRUE AS match_city')
+
+    # Same overlap as EventFilterBackend.overlapping()
+    date_from = EventFilterBackend.parse_day(params.get('dateFrom'))
+    date_to = EventFilterBackend.parse_day(params.get('dateTo'))
+    conditions = []
+    if date_to:
+        conditions.append('d.start_date < %s')
+        values.append(EventFilterBackend.start_of_day(date_to + timedelta(days=1)))
+    if date_from:
+        conditions.append('(d.end_date >= %s OR (d.end_date IS NULL AND d.start_date >= %s))')
+        start = EventFilterBackend.start_of_day(date_from)
+        values += [start, start]
+    columns.append(f"({' AND '.join(conditions) or 'TRUE'}) AS match_day")
+
+    return columns, values
+
+
+def filtered_events(params):
+    """Events matching the list filters other than the facets (approved ones by default)"""
+    other = params.copy()
+    for param in FACET_PARAMS:
+        other.pop(param, None)
+    events = EventFilterBackend().filter_params(Event.objects.all(), other)
+    if not other.get('moderation_status'):
+        events = events.filter(moderation_status=Event.APPROVED)
+    if term := other.get('search', '').strip():
+        events = events.search(term)
+    return events.order_by().values('pk')
+
+
+def build_facets(params, now=None) -> dict[str, Any]:
+    """
+    Facet counts for the list filters in params (a QueryDict):
+    {'total': n, 'category': [{'value': ..., 'count': ...}, ...], ...}
+    with values by count (days in DAY_BUCKETS order)
+    """
+    now = now or timezone.now()
+    today = timezone.localdate(now)
+    bounds = [
+        EventFilterBackend.start_of_day(today + timedelta(days=days)) for days in (1, 2, 8, 31)
+    ]
+
+    events_sql, events_params = filtered_events(params).query.sql_with_params()
+    match_columns, match_params = facet_matches(params)
+    occurrences = OCCURRENCES_SQL.format(matches=',\n           '.join(match_columns), events=events_sql)
+
+    def others(facet):
+        return ' AND '.join(f'match_{other}' for other in FACETS if other != facet)
+
+    sql = FACETS_SQL.format(
+        groupings=', '.join(f'GROUPING({facet})' for facet in FACETS),
+        facets=', '.join(FACETS),
+        counts=' '.join(
+            f'WHEN GROUPING({facet}) = 0 THEN COUNT(DISTINCT event_id) FILTER (WHERE {others(facet)})'
+            for facet in FACETS
+        ),
+        all_match=' AND '.join(f'match_{facet}' for facet in FACETS),
+        occurrences=occurrences,
+        grouping_sets=', '.join(f'({facet})' for facet in FACETS),
+    )
+
+    with connection.cursor() as cursor:
+        cursor.execute(sql, [*bounds, *match_params, *events_params, now, now])
+        rows = cursor.fetchall()
+
+    result = {'total': 0, **{facet: [] for facet in FACETS}}
+    size = len(FACETS)
+    for row in rows:
+        groupings, values, count = row[:size], row[size:2 * size], row[-1]
+        if all(groupings):
+            result['total'] = count
+            continue
+        index = groupings.index(0)
+        if values[index] is not None and count:
+            result[FACETS[index]].append({'value': values[index], 'count': count})
+
+    for facet in FACETS:
+        if facet == 'day':
+            result[facet].sort(key=lambda item: DAY_BUCKETS.index(item['value']))
+        else:
+            result[facet].sort(key=lambda item: (-item['count'], item['value']))
+    return result
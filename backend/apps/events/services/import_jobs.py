@@ -0,0 +1,147 @@
+"""
+Import Jobs
+
+Runs ImportJob rows outside the request: a worker (`manage.py
+run_import_jobs`) claims the oldest pending job with SELECT ... FOR UPDATE
+SKIP LOCKED, so several workers never run the same job, and streams its
+file through EventImporter in bulk mode, saving the counts after every
+batch for the admin progress page.
+
+Saving progress is also the job's heartbeat (updated_at): a RUNNING job
+without progress for STALE_AFTER lost its worker (OOM, deploy, SIGKILL) and
+is claimed again from the start, which the record fingerprints keep cheap.
+A job that stopped its worker MAX_ATTEMPTS times fails instead.
+
+A file whose checksum matches a job that already finished without errors
+is not read again; after errors, uploading it again retries the import.
+"""
+
+import hashlib
+import logging
+from datetime import timedelta
+from typing import Optional
+
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from ..models import ImportJob
+from .event_importer import EventImporter, ImportResult
+
+logger = logging.getLogger(__name__)
+
+PROGRESS_FIELDS = ['processed', 'position', 'imported', 'skipped', 'error_count', 'errors', 'updated_at']
+
+# A running job without progress for this long lost its worker (batches take seconds)
+STALE_AFTER = timedelta(minutes=10)
+
+
+def file_checksum(uploaded_file) -> str:
+    digest = hashlib.sha256()
+    for chunk in uploaded_file.chunks():
+        digest.update(chunk)
+    uploaded_file.seek(0)
+    return digest.hexdigest()
+
+
+def submit(uploaded_file, user=None) -> ImportJob:
+    """Store an uploaded file as a pending job"""
+    return ImportJob.objects.create(
+        file=uploaded_file,
+        file_name=uploaded_file.name,
+        file_size=uploaded_file.size or 0,
+        checksum=file_checksum(uploaded_file),
+        created_by=user if user is not None and user.is_authenticated else None,
+    )
+
+
+def claim_next() -> Optional[ImportJob]:
+    """
+    Mark the oldest pending job, or a running job that lost its worker, as
+    running and return it (None if there is none)
+    """
+    while True:
+        with transaction.atomic():
+            now = timezone.now()
+            stale = Q(status=ImportJob.RUNNING, updated_at__lt=now - STALE_AFTER)
+            job = (
+                ImportJob.objects.select_for_update(skip_locked=True)
+                .filter(Q(status=ImportJob.PENDING) | stale)
+                .order_by('created_at', 'id')
+                .first()
+            )
+            if job is None:
+                return None
+
+            if job.status == ImportJob.RUNNING:
+                logger.warning(f"Import job {job.pk} stopped without finishing (attempt {job.attempts})")
+                if job.attempts >= ImportJob.MAX_ATTEMPTS:
+                    job.status = ImportJob.FAILED
+                    job.message = f'Import przerwany: proces importu zatrzymał się {job.attempts} razy.'
+                    job.finished_at = now
+                    job.save(update_fields=['status', 'message', 'finished_at', 'updated_at'])
+                    continue
+                # Start again: the fingerprints skip what the last attempt imported
+                job.processed = job.position = job.imported = job.skipped = job.error_count = 0
+                job.errors = []
+
+            job.status = ImportJob.RUNNING
+            job.attempts += 1
+            job.started_at = now
+            job.save(update_fields=['status', 'attempts', 'started_at', *PROGRESS_FIELDS])
+            return job
+
+
+def save_progress(job: ImportJob, result: ImportResult):
+    job.processed = result.processed
+    job.position = result.position
+    job.imported = result.imported
+    job.skipped = result.skipped
+    job.error_count = result.error_count
+    job.errors = result.errors[:ImportJob.MAX_ERRORS]
+    job.save(update_fields=PROGRESS_FIELDS)
+
+
+def run(job: ImportJob) -> ImportJob:
+    """Import the job's file; the job ends DONE (even with record errors) or FAILED"""
+    previous = (
+        ImportJob.objects.filter(checksum=job.checksum, status=ImportJob.DONE, error_count=0)
+        .exclude(pk=job.pk)
+        .order_by('-finished_at')
+        .first()
+    ) if job.checksum else None
+    if previous is not None:
+        logger.info(f"Import job {job.pk}: {job.file_name} already imported by job {previous.pk}")
+        job.status = ImportJob.DONE
+        job.message = f'Ten plik został już zaimportowany (import #{previous.pk}).'
+        job.finished_at = timezone.now()
+        job.save(update_fields=['status', 'message', 'finished_at', 'updated_at'])
+        return job
+
+    logger.info(f"Running import job {job.pk}: {job.file_name}")
+    importer = EventImporter(bulk=True, on_progress=lambda result: save_progress(job, result))
+    try:
+        with job.file.open('rb') as f:
+            result = importer.import_from_stream(f)
+        save_progress(job, result)
+        job.status = ImportJob.DONE
+    except Exception as e:
+        logger.exception(f"Import job {job.pk} failed")
+        job.status = ImportJob.FAILED
+        job.message = str(e)
+
+    job.finished_at = timezone.now()
+    job.save(update_fields=['status', 'message', 'finished_at', 'updated_at'])
+    return job
+
+
+def run_pending(limit: Optional[int] = None) -> int:
+    """Run pending jobs one after another; returns how many ran"""
+    count = 0
+    while limit is None or count < limit:
+        job = claim_next()
+        if job is None:
+            break
+        run(job)
+        count += 1
+    return count
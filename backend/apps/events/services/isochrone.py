@@ -0,0 +1,146 @@
+"""
+Isochrone Service
+
+Answers "which locations are reachable within N minutes from (lat, lng)"
+over the offline road graph (see road_graph.py), for the minutes/mode
+filters of /api/events/. Results are cached per snapped origin cell,
+minutes and mode.
+"""
+
+import logging
+import os
+import threading
+from typing import Optional
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, Max
+
+from ..models import Location
+from .road_graph import MODES, RoadGraph
+
+logger = logging.getLogger(__name__)
+
+# Aliases used by the frontend (stores/filters TransportMode)
+MODE_ALIASES = {'car': 'auto', 'walk': 'pedestrian', 'bike': 'bicycle'}
+
+# Straight-line speeds (km/h) used when no road graph is installed,
+# same as TRANSPORT_SPEEDS in frontend/composables/useTransport.ts
+FALLBACK_SPEEDS = {'auto': 50, 'pedestrian': 4, 'bicycle': 15}
+
+# Walking speed (m/s) between a point and its nearest road node
+ACCESS_SPEED = 4.5 / 3.6
+
+# Points farther than this from any road are considered unreachable
+MAX_SNAP_DISTANCE_M = 2000
+
+# Origins are snapped to a grid (degrees, ~500 m) so nearby requests share a cache entry
+ORIGIN_CELL = 0.005
+
+MAX_MINUTES = 120
+
+CACHE_TIMEOUT = 60 * 60
+
+_lock = threading.Lock()
+_graph: Optional[RoadGraph] = None
+_graph_mtime: Optional[float] = None
+_location_nodes: dict[int, tuple[float, float, Optional[int], float]] = {}
+
+
+def parse_mode(value: Optional[str]) -> str:
+    mode = MODE_ALIASES.get(value, value)
+    return mode if mode in MODES else 'auto'
+
+
+def parse_minutes(value: Optional[str]) -> Optional[int]:
+    try:
+        minutes = int(value)
+    except (TypeError, ValueError):
+        return None
+    return minutes if 1 <= minutes <= MAX_MINUTES else None
+
+
+def fallback_radius_km(minutes: int, mode: str) -> float:
+    """Straight-line radius equivalent of a travel time"""
+    return FALLBACK_SPEEDS[mode] * minutes / 60
+
+
+def get_graph() -> Optional[RoadGraph]:
+    """Road graph from settings.ROAD_GRAPH_PATH, loaded once per process (None if missing)"""
+    global _graph, _graph_mtime
+
+    path = getattr(settings, 'ROAD_GRAPH_PATH', None)
+    try:
+        mtime = os.path.getmtime(path) if path else None
+    except OSError:
+        mtime = None
+    if mtime is None:
+        return None
+
+    with _lock:
+        if _graph is None or _graph_mtime != mtime:
+            with open(path, 'rb') as f:
+                _graph = RoadGraph.load(f)
+            _graph_mtime = mtime
+            _location_nodes.clear()
+            logger.info(f"Loaded road graph {path}: {_graph.node_count} nodes, {_graph.edge_count} edges")
+    return _graph
+
+
+def snap_origin(lat: float, lng: float) -> tuple[float, float]:
+    return (round(lat / ORIGIN_CELL) * ORIGIN_CELL, round(lng / ORIGIN_CELL) * ORIGIN_CELL)
+
+
+def reachable_location_ids(lat: float, lng: float, minutes: int, mode: str) -> Optional[list[int]]:
+    """
+    Ids of locations reachable within minutes from (lat, lng) using mode.
+    Returns None when no road graph is installed.
+    """
+    graph = get_graph()
+    if graph is None:
+        return None
+
+    origin = snap_origin(lat, lng)
+    locations = Location.objects.filter(point__isnull=False).aggregate(
+        count=Count('id'), updated=Max('updated_at')
+    )
+    cache_key = 'isochrone:{}:{}:{}:{:.3f}:{:.3f}:{}:{}'.format(
+        graph.version, mode, minutes, *origin,
+        locations['count'], locations['updated'].timestamp() if locations['updated'] else 0,
+    )
+    location_ids = cache.get(cache_key)
+    if location_ids is None:
+        location_ids = compute_reachable_location_ids(graph, origin, minutes, mode)
+        cache.set(cache_key, location_ids, CACHE_TIMEOUT)
+    return location_ids
+
+
+def compute_reachable_location_ids(graph: RoadGraph, origin: tuple[float, float],
+                                   minutes: int, mode: str) -> list[int]:
+    limit = minutes * 60
+    source, snap_distance = graph.nearest_node(*origin, MAX_SNAP_DISTANCE_M)
+    if source is None:
+        return []
+
+    times = graph.travel_times(source, mode, limit, initial_seconds=snap_distance / ACCESS_SPEED)
+    reachable = []
+    for location_id, (node, distance) in location_nodes(graph).items():
+        time = times.get(node)
+        if time is not None and time + distance / ACCESS_SPEED <= limit:
+            reachable.append(location_id)
+    return reachable
+
+
+def location_nodes(graph: RoadGraph) -> dict[int, tuple[int, float]]:
+    """Nearest road node of every location with coordinates, cached per process"""
+    result = {}
+    rows = Location.objects.filter(point__isnull=False).values_list('id', 'latitude', 'longitude')
+    for location_id, lat, lng in rows:
+        lat, lng = float(lat), float(lng)
+        cached = _location_nodes.get(location_id)
+        if cached is None or cached[:2] != (lat, lng):
+            node, distance = graph.nearest_node(lat, lng, MAX_SNAP_DISTANCE_M)
+            cached = _location_nodes[location_id] = (lat, lng, node, distance)
+        if cached[2] is not None:
+            result[location_id] = cached[2:]
+    return result
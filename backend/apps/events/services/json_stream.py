@@ -0,0 +1,279 @@
+"""
+Streaming JSON Records
+
+Reads event records from a binary stream (uploaded file, open file) in
+fixed-size blocks, so memory stays flat whatever the input size:
+
+- a top-level JSON array: the end of each element is found by scanning
+  each block once (brackets and strings only), then the element is decoded
+  with json.JSONDecoder.raw_decode
+- NDJSON (one JSON object per line), detected by a leading '{'
+
+Each record carries its index and the byte offset where it starts, for
+error reporting. Invalid NDJSON lines are reported and skipped; an array
+stops at its first syntax error. A record over MAX_RECORD_SIZE is an error
+(the rest of an oversized NDJSON line is skipped).
+"""
+
+import codecs
+import json
+import re
+from itertools import chain
+from typing import Any, Iterable, Iterator, NamedTuple, Optional
+
+READ_SIZE = 64 * 1024
+
+# An array element (characters) or NDJSON line (bytes) over this size is an
+# error, instead of buffering the rest of a broken file
+MAX_RECORD_SIZE = 16 * 1024 * 1024
+
+WHITESPACE = ' \t\n\r\ufeff'  # with the UTF-8 BOM
+BLANK_BYTES = WHITESPACE.encode('utf-8')
+
+_decoder = json.JSONDecoder()
+
+STRUCTURE = re.compile(r'[\[\]{}"]')
+STRING_END = re.compile(r'["\\]')
+SCALAR_END = re.compile(r'[\s,\]}]')
+
+
+class Record(NamedTuple):
+    index: int
+    offset: Optional[int]  # bytes from the start of the stream (None for in-memory data)
+    data: Any
+    error: Optional[str] = None
+
+
+def read_blocks(stream, size: int = READ_SIZE) -> Iterator[bytes]:
+    while block := stream.read(size):
+        yield block
+
+
+def iter_records(stream, read_size: int = READ_SIZE) -> Iterator[Record]:
+    """Records of a JSON array or NDJSON stream (by the first non-blank character)"""
+    blocks = read_blocks(stream, read_size)
+    head = b''
+    for block in blocks:
+        head += block
+        if head.lstrip(BLANK_BYTES):
+            break
+
+    first = head.lstrip(BLANK_BYTES)[:1]
+    if first == b'[':
+        return iter_array(head, blocks)
+    if first == b'{':
+        return iter_ndjson(head, blocks)
+    return iter([Record(0, 0, None, 'JSON data must be an array or NDJSON')])
+
+
+class TextBuffer:
+    """Text decoded from blocks of UTF-8, with the byte offset of its start"""
+
+    def __init__(self, head: bytes, blocks: Iterator[bytes]):
+        self.decoder = codecs.getincrementaldecoder('utf-8')()
+        self.blocks = blocks
+        self.text = self.decoder.decode(head)
+        self.offset = 0
+        self.eof = False
+
+    def next_text(self) -> Optional[str]:
+        """Text of the next block, without appending it; None at the end"""
+        block = next(self.blocks, None)
+        if block is None:
+            self.eof = True
+            return self.decoder.decode(b'', final=True) or None
+        return self.decoder.decode(block)
+
+    def read(self) -> bool:
+        """Append the next block; False at the end of the stream"""
+        text = self.next_text()
+        if text is None:
+            return False
+        self.text += text
+        return True
+
+    def consume(self, length: int):
+        self.offset += len(self.text[:length].encode('utf-8'))
+        self.text = self.text[length:]
+
+    def peek(self) -> str:
+        """Next non-blank character (skipping the blanks), '' at the end"""
+        while True:
+            stripped = self.text.lstrip(WHITESPACE)
+            if stripped:
+                self.consume(len(self.text) - len(stripped))
+                return stripped[0]
+            self.consume(len(self.text))
+            if not self.read():
+                return ''
+
+
+class ValueScanner:
+    """
+    Finds where a JSON value ends, fed one piece of text at a time
+
+    Only brackets, strings and escapes are tracked, so each character is
+    looked at once; the value itself is checked when it is decoded.
+    """
+
+    def __init__(self):
+        self.started = False
+        self.scalar = False
+        self.depth = 0
+        self.in_string = False
+        self.escape = False  # a backslash ended the previous piece
+
+    def feed(self, text: str) -> Optional[int]:
+        """End of the value in this piece (exclusive), None if it goes on"""
+        if not text:
+            return None
+        i = 0
+        if not self.started:
+            self.started = True
+            first = text[:1]
+            if first in ('{', '['):
+                self.depth, i = 1, 1
+            elif first == '"':
+                self.in_string, i = True, 1
+            else:
+                self.scalar = True
+        if self.scalar:
+            match = SCALAR_END.search(text)
+            return match.start() if match else None
+        if self.escape:
+            self.escape, i = False, i + 1
+
+        while True:
+            if self.in_string:
+                match = STRING_END.search(text, i)
+                if not match:
+                    return None
+                i = match.end()
+                if match.group() == '\\':
+                    if i == len(text):
+                        self.escape = True
+                        return None
+                    i += 1
+                    continue
+                self.in_string = False
+                if not self.depth:
+                    return i
+                continue
+            match = STRUCTURE.search(text, i)
+            if not match:
+                return None
+            i = match.end()
+            char = match.group()
+            if char == '"':
+                self.in_string = True
+            elif char in '[{':
+                self.depth += 1
+            else:
+                self.depth -= 1
+                if not self.depth:
+                    return i
+
+
+def iter_array(head: bytes, blocks: Iterator[bytes]) -> Iterator[Record]:
+    try:
+        buffer = TextBuffer(head, blocks)
+        yield from array_records(buffer)
+    except UnicodeDecodeError as e:
+        yield Record(0, 0, None, f'Invalid UTF-8: {e}')
+
+
+def array_records(buffer: TextBuffer) -> Iterator[Record]:
+    buffer.peek()
+    buffer.consume(1)  # '['
+    if buffer.peek() == ']':
+        return
+
+    index = 0
+    while True:
+        if not buffer.peek():
+            yield Record(index, buffer.offset, None, 'Invalid JSON: unexpected end of data')
+            return
+        if not read_value(buffer):
+            yield Record(index, buffer.offset, None, f'Record larger than {MAX_RECORD_SIZE} characters')
+            return
+        try:
+            data, end = _decoder.raw_decode(buffer.text)
+        except json.JSONDecodeError as e:
+            yield Record(index, buffer.offset, None, f'Invalid JSON: {e}')
+            return
+
+        yield Record(index, buffer.offset, data)
+        buffer.consume(end)
+        index += 1
+
+        separator = buffer.peek()
+        if separator == ']':
+            return
+        if separator != ',':
+            yield Record(index, buffer.offset, None, "Invalid JSON: expecting ',' or ']'")
+            return
+        buffer.consume(1)
+
+
+def read_value(buffer: TextBuffer) -> bool:
+    """
+    Read until the value at the start of the buffer is complete (or the
+    stream ends); False if it grows over MAX_RECORD_SIZE
+    """
+    scanner = ValueScanner()
+    if scanner.feed(buffer.text) is not None:
+        return True
+    # Join the blocks once, rather than growing the buffer text per block
+    parts = [buffer.text]
+    size = len(buffer.text)
+    while (text := buffer.next_text()) is not None:
+        parts.append(text)
+        size += len(text)
+        if size > MAX_RECORD_SIZE:
+            return False
+        if scanner.feed(text) is not None:
+            break
+    buffer.text = ''.join(parts)
+    return True
+
+
+def iter_ndjson(head: bytes, blocks: Iterable[bytes]) -> Iterator[Record]:
+    index = 0
+    offset = 0
+    parts = []
+    size = 0  # of the current line, including any skipped bytes
+    for block in chain([head], blocks):
+        start = 0
+        while True:
+            newline = block.find(b'\n', start)
+            piece = block[start:] if newline == -1 else block[start:newline]
+            size += len(piece)
+            if size > MAX_RECORD_SIZE:
+                parts = None
+            elif parts is not None:
+                parts.append(piece)
+            if newline == -1:
+                break
+            if record := line_record(index, offset, parts):
+                yield record
+                index += 1
+            offset += size + 1
+            parts, size = [], 0
+            start = newline + 1
+    if record := line_record(index, offset, parts):
+        yield record
+
+
+def line_record(index: int, offset: int, parts: Optional[list]) -> Optional[Record]:
+    """Record of an NDJSON line (None for a blank one, parts=None when oversized)"""
+    if parts is None:
+        return Record(index, offset, None, f'Record larger than {MAX_RECORD_SIZE} bytes')
+    line = b''.join(parts)
+    return ndjson_record(index, offset, line) if line.strip() else None
+
+
+def ndjson_record(index: int, offset: int, line: bytes) -> Record:
+    try:
+        return Record(index, offset, json.loads(line))
+    except ValueError as e:  # JSONDecodeError, UnicodeDecodeError
+        return Record(index, offset, None, f'Invalid JSON: {e}')
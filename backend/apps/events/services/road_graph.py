@@ -0,0 +1,294 @@
+"""
+Road Graph
+
+Compact, array-based road graph for travel-time (isochrone) queries.
+Built offline from an OSM XML extract of the region (build_road_graph
+command) and loaded once per process.
+
+Layout (CSR adjacency):
+    offsets[n] .. offsets[n + 1]  edge slice of node n
+    targets[e]                    target node of edge e
+    costs[mode][e]                travel time in seconds, NO_EDGE if mode can't use it
+"""
+
+import array
+import heapq
+import json
+import math
+import sys
+from typing import BinaryIO, Optional
+from xml.etree.ElementTree import iterparse
+
+MODES = ('auto', 'pedestrian', 'bicycle')
+
+NO_EDGE = -1.0
+
+# Default speeds in km/h per highway type: (auto, pedestrian, bicycle).
+# None means the mode can't use the road.
+HIGHWAY_SPEEDS = {
+    'motorway': (100, None, None),
+    'trunk': (80, None, None),
+    'primary': (70, 4.5, 16),
+    'secondary': (60, 4.5, 16),
+    'tertiary': (50, 4.5, 16),
+    'unclassified': (40, 4.5, 15),
+    'residential': (30, 4.5, 15),
+    'living_street': (10, 4.5, 12),
+    'service': (20, 4.5, 12),
+    'road': (30, 4.5, 14),
+    'track': (15, 4, 10),
+    'cycleway': (None, 4.5, 18),
+    'path': (None, 4, 8),
+    'footway': (None, 4.5, None),
+    'pedestrian': (None, 4.5, None),
+    'bridleway': (None, 4, None),
+    'steps': (None, 2, None),
+}
+
+# OSM tags that can forbid a mode: (auto, pedestrian, bicycle)
+MODE_ACCESS_TAGS = (('motor_vehicle', 'motorcar'), ('foot',), ('bicycle',))
+
+DENIED = {'no', 'private'}
+
+EARTH_RADIUS_M = 6371000
+
+MAGIC = b'BPRG1\n'
+
+# Grid cell size (degrees) of the nearest-node index
+GRID_CELL = 0.01
+
+
+def haversine_m(lat1: float, lng1: float, lat2: float, lng2: float) -> float:
+    """Great-circle distance in meters"""
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    d_phi = phi2 - phi1
+    d_lambda = math.radians(lng2 - lng1)
+    a = math.sin(d_phi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(d_lambda / 2) ** 2
+    return 2 * EARTH_RADIUS_M * math.asin(math.sqrt(a))
+
+
+def way_speeds(tags: dict[str, str]) -> Optional[list[Optional[float]]]:
+    """Speeds per mode for an OSM way, or None if it isn't a usable road"""
+    highway = tags.get('highway', '')
+    speeds = HIGHWAY_SPEEDS.get(highway.removesuffix('_link'))
+    if speeds is None or tags.get('access') in DENIED or tags.get('area') == 'yes':
+        return None
+
+    speeds = list(speeds)
+    for mode_index, access_tags in enumerate(MODE_ACCESS_TAGS):
+        if any(tags.get(tag) in DENIED for tag in access_tags):
+            speeds[mode_index] = None
+
+    # Respect lower speed limits for cars
+    maxspeed = tags.get('maxspeed', '')
+    if speeds[0] and maxspeed.isdigit():
+        speeds[0] = min(speeds[0], int(maxspeed))
+
+    return speeds if any(speeds) else None
+
+
+def way_directions(tags: dict[str, str]) -> tuple[bool, bool]:
+    """(forward, backward) allowed for vehicles; pedestrians ignore oneway"""
+    oneway = tags.get('oneway', '')
+    if oneway in ('yes', 'true', '1') or tags.get('junction') == 'roundabout':
+        return True, False
+    if oneway == '-1':
+        return False, True
+    return True, True
+
+
+class RoadGraph:
+    """Road graph in CSR layout with per-mode edge costs"""
+
+    def __init__(self, lat, lng, offsets, targets, costs: dict[str, array.array]):
+        self.lat = lat
+        self.lng = lng
+        self.offsets = offsets
+        self.targets = targets
+        self.costs = costs
+        self.version = f'{len(lat)}-{len(targets)}'
+        self._grid = self._build_grid()
+
+    @property
+    def node_count(self) -> int:
+        return len(self.lat)
+
+    @property
+    def edge_count(self) -> int:
+        return len(self.targets)
+
+    # Building
+
+    @classmethod
+    def from_osm(cls, source) -> 'RoadGraph':
+        """
+        Build the graph from an OSM XML extract (path or binary file object).
+        Elements are streamed and cleared; the compiled graph keeps road nodes only.
+        """
+        coords: dict[int, tuple[float, float]] = {}
+        ways: list[tuple[list[int], list[Optional[float]], tuple[bool, bool]]] = []
+
+        refs: list[int] = []
+        tags: dict[str, str] = {}
+        for _, elem in iterparse(source, events=('end',)):
+            if elem.tag == 'node':
+                coords[int(elem.get('id'))] = (float(elem.get('lat')), float(elem.get('lon')))
+                refs, tags = [], {}
+            elif elem.tag == 'nd':
+                refs.append(int(elem.get('ref')))
+            elif elem.tag == 'tag':
+                tags[elem.get('k')] = elem.get('v')
+            elif elem.tag == 'way':
+                speeds = way_speeds(tags)
+                if speeds and len(refs) > 1:
+                    ways.append((refs, speeds, way_directions(tags)))
+                refs, tags = [], {}
+            elif elem.tag == 'relation':
+                refs, tags = [], {}
+            else:
+                continue
+            elem.clear()
+
+        return cls.from_ways(coords, ways)
+
+    @classmethod
+    def from_ways(cls, coords, ways) -> 'RoadGraph':
+        """Compile (node refs, speeds, directions) ways into CSR arrays"""
+        index: dict[int, int] = {}
+        lat = array.array('d')
+        lng = array.array('d')
+
+        def node_index(osm_id):
+            if osm_id not in index:
+                index[osm_id] = len(lat)
+                lat.append(coords[osm_id][0])
+                lng.append(coords[osm_id][1])
+            return index[osm_id]
+
+        # (source, target, cost per mode)
+        edges: list[tuple[int, int, tuple[float, ...]]] = []
+        for refs, speeds, (forward, backward) in ways:
+            refs = [ref for ref in refs if ref in coords]
+            for a, b in zip(refs, refs[1:]):
+                u, v = node_index(a), node_index(b)
+                length = haversine_m(lat[u], lng[u], lat[v], lng[v])
+                for src, dst, allowed in ((u, v, forward), (v, u, backward)):
+                    costs = tuple(
+                        length / (speed / 3.6)
+                        if speed and (allowed or mode == 'pedestrian')
+                        else NO_EDGE
+                        for mode, speed in zip(MODES, speeds)
+                    )
+                    if any(cost != NO_EDGE for cost in costs):
+                        edges.append((src, dst, costs))
+
+        edges.sort(key=lambda edge: edge[0])
+        offsets = array.array('i', [0] * (len(lat) + 1))
+        for src, _, _ in edges:
+            offsets[src + 1] += 1
+        for n in range(len(lat)):
+            offsets[n + 1] += offsets[n]
+
+        targets = array.array('i', (edge[1] for edge in edges))
+        costs = {
+            mode: array.array('f', (edge[2][i] for edge in edges))
+            for i, mode in enumerate(MODES)
+        }
+        return cls(lat, lng, offsets, targets, costs)
+
+    # Serialization
+
+    def save(self, fileobj: BinaryIO):
+        header = json.dumps({
+            'nodes': self.node_count,
+            'edges': self.edge_count,
+            'modes': list(MODES),
+            'byteorder': sys.byteorder,
+        }).encode('ascii')
+        fileobj.write(MAGIC)
+        fileobj.write(len(header).to_bytes(4, 'little'))
+        fileobj.write(header)
+        for arr in (self.lat, self.lng, self.offsets, self.targets, *self.costs.values()):
+            fileobj.write(arr.tobytes())
+
+    @classmethod
+    def load(cls, fileobj: BinaryIO) -> 'RoadGraph':
+        if fileobj.read(len(MAGIC)) != MAGIC:
+            raise ValueError('Not a road graph file')
+        header_length = int.from_bytes(fileobj.read(4), 'little')
+        header = json.loads(fileobj.read(header_length))
+        nodes, edges = header['nodes'], header['edges']
+
+        def read(typecode, count):
+            arr = array.array(typecode)
+            arr.frombytes(fileobj.read(arr.itemsize * count))
+            if header['byteorder'] != sys.byteorder:
+                arr.byteswap()
+            return arr
+
+        lat = read('d', nodes)
+        lng = read('d', nodes)
+        offsets = read('i', nodes + 1)
+        targets = read('i', edges)
+        costs = {mode: read('f', edges) for mode in header['modes']}
+        return cls(lat, lng, offsets, targets, costs)
+
+    # Queries
+
+    def _build_grid(self) -> dict[tuple[int, int], list[int]]:
+        grid: dict[tuple[int, int], list[int]] = {}
+        for n in range(self.node_count):
+            grid.setdefault(self._cell(self.lat[n], self.lng[n]), []).append(n)
+        return grid
+
+    @staticmethod
+    def _cell(lat: float, lng: float) -> tuple[int, int]:
+        return (math.floor(lat / GRID_CELL), math.floor(lng / GRID_CELL))
+
+    def nearest_node(self, lat: float, lng: float, max_distance_m: float) -> tuple[Optional[int], float]:
+        """Closest graph node within max_distance_m, as (node, distance in meters)"""
+        cell_lat, cell_lng = self._cell(lat, lng)
+        # Cells are narrower east-west, so search enough columns to cover the radius
+        cell_m = GRID_CELL * math.pi / 180 * EARTH_RADIUS_M
+        rows = math.ceil(max_distance_m / cell_m)
+        cols = math.ceil(max_distance_m / (cell_m * max(math.cos(math.radians(lat)), 0.01)))
+
+        best, best_distance = None, max_distance_m
+        for i in range(cell_lat - rows, cell_lat + rows + 1):
+            for j in range(cell_lng - cols, cell_lng + cols + 1):
+                for n in self._grid.get((i, j), ()):
+                    distance = haversine_m(lat, lng, self.lat[n], self.lng[n])
+                    if distance <= best_distance:
+                        best, best_distance = n, distance
+        return best, best_distance
+
+    def travel_times(self, source: int, mode: str, limit_seconds: float,
+                     initial_seconds: float = 0.0) -> dict[int, float]:
+        """
+        Bounded Dijkstra from source: seconds to every node reachable
+        within limit_seconds using mode.
+        """
+        costs = self.costs[mode]
+        offsets = self.offsets
+        targets = self.targets
+
+        if initial_seconds > limit_seconds:
+            return {}
+        times = {source: initial_seconds}
+        heap = [(initial_seconds, source)]
+        while heap:
+            time, node = heapq.heappop(heap)
+            if time > times[node]:
+                continue
+            for edge in range(offsets[node], offsets[node + 1]):
+                cost = costs[edge]
+                if cost < 0:
+                    continue
+                arrival = time + cost
+                if arrival > limit_seconds:
+                    continue
+                target = targets[edge]
+                if arrival < times.get(target, math.inf):
+                    times[target] = arrival
+                    heapq.heappush(heap, (arrival, target))
+        return times
@@ -0,0 +1,184 @@
+"""
+Vector Tile Service
+
+Mapbox Vector Tiles for the map, generated in PostGIS with ST_AsMVT.
+
+Layers:
+- locations: locations with upcoming dates (id, name, city, events, next_date)
+- events: one feature per upcoming (event, location) (id, title, slug, category, next_date)
+POI geometries can be added as another entry in LAYERS once the model exists.
+
+Tiles are cached and keyed by a data version. Versions are kept per
+tile at VERSION_ZOOM (and one for all lower zooms), and bumped only when
+a location or event inside that tile changes (see signals.py), once the
+change is committed.
+"""
+
+import hashlib
+import math
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Iterable, Optional
+from urllib.parse import urlencode
+
+from django.core.cache import cache
+from django.db import connection, transaction
+from django.utils import timezone
+
+from apps.common import response_cache
+from ..models import Location
+
+MAX_ZOOM = 22
+
+# Tiles at or above this zoom share the version of their ancestor tile at VERSION_ZOOM
+VERSION_ZOOM = 10
+
+CACHE_TIMEOUT = 60 * 60 * 24
+
+EXTENT = 4096
+
+_state = threading.local()
+
+# Upcoming (event, location) pins for the events in the filtered queryset;
+# a date without a location is held at its event's location
+PINS_SQL = """
+    SELECT e.id AS event_id, e.title_pl, e.slug, e.category,
+           l.id AS location_id, l.name, l.city, MIN(d.start_date) AS next_date,
+           ST_Transform(l.point::geometry, 3857) AS geom
+    FROM events_eventdate d
+    JOIN events_event e ON e.id = d.event_id
+    JOIN events_location l ON l.id = COALESCE(d.location_id, e.location_id)
+    WHERE d.start_date >= %s
+      AND e.id IN ({events})
+      AND l.point && ST_Transform(ST_TileEnvelope(%s, %s, %s), 4326)::geography
+    GROUP BY e.id, l.id
+"""
+
+LAYERS = {
+    'locations': """
+        SELECT location_id AS id, name, city, COUNT(*) AS events, MIN(next_date)::text AS next_date,
+               ST_AsMVTGeom(geom, ST_TileEnvelope(%s, %s, %s), {extent}) AS geom
+        FROM pins
+        GROUP BY location_id, name, city, geom
+    """,
+    'events': """
+        SELECT event_id AS id, title_pl AS title, slug, category, location_id,
+               next_date::text AS next_date,
+               ST_AsMVTGeom(geom, ST_TileEnvelope(%s, %s, %s), {extent}) AS geom
+        FROM pins
+    """,
+}
+
+
+def is_valid_tile(z: int, x: int, y: int) -> bool:
+    return 0 <= z <= MAX_ZOOM and 0 <= x < 2 ** z and 0 <= y < 2 ** z
+
+
+def tile_for(lat: float, lng: float, zoom: int) -> tuple[int, int]:
+    """Slippy map (x, y) of the tile containing lat/lng at zoom"""
+    n = 2 ** zoom
+    lat = max(min(lat, 85.0511), -85.0511)
+    x = int((lng + 180) / 360 * n)
+    y = int((1 - math.asinh(math.tan(math.radians(lat))) / math.pi) / 2 * n)
+    return min(max(x, 0), n - 1), min(max(y, 0), n - 1)
+
+
+def prefix() -> str:
+    # Namespaced like the response cache: sites and test databases sharing a Redis keep their own tiles
+    return f'{response_cache.namespace()}:tiles'
+
+
+def version_key(z: int, x: int, y: int) -> str:
+    """Cache key of the data version that covers tile z/x/y"""
+    if z < VERSION_ZOOM:
+        return f'{prefix()}:version:low'
+    shift = z - VERSION_ZOOM
+    return f'{prefix()}:version:{VERSION_ZOOM}:{x >> shift}:{y >> shift}'
+
+
+def get_version(key: str) -> int:
+    # Start from the clock so a version lost on cache eviction is never reused
+    return cache.get_or_set(key, time.time_ns(), None)
+
+
+def bump_versions(points: Iterable[tuple[float, float]]):
+    """Invalidate tiles containing any of the (lat, lng) points when the current transaction commits"""
+    keys = {version_key(0, 0, 0)}
+    for lat, lng in points:
+        x, y = tile_for(lat, lng, VERSION_ZOOM)
+        keys.add(version_key(VERSION_ZOOM, x, y))
+    pending = getattr(_state, 'pending_keys', None)
+    if pending is not None:
+        pending.update(keys)
+    else:
+        transaction.on_commit(lambda: bump_keys(keys))
+
+
+@contextmanager
+def deferred_bumps():
+    """
+    Collect tile invalidations and bump each version once on exit (on
+    commit). Use around bulk writes (e.g. EventImporter), inside which
+    occurrence bounds are refreshed only at the end as well.
+    """
+    if getattr(_state, 'pending_keys', None) is not None:
+        # Nested block - the outermost one bumps
+        yield
+        return
+
+    _state.pending_keys = set()
+    try:
+        yield
+    finally:
+        pending = _state.pending_keys
+        _state.pending_keys = None
+        if pending:
+            transaction.on_commit(lambda: bump_keys(pending))
+
+
+def bump_keys(keys: Iterable[str]):
+    for key in keys:
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.set(key, time.time_ns(), None)
+
+
+def bump_location_versions(location_ids: Iterable[int]):
+    points = Location.objects.filter(
+        pk__in=[pk for pk in location_ids if pk is not None],
+        latitude__isnull=False,
+        longitude__isnull=False,
+    ).values_list('latitude', 'longitude')
+    bump_versions((float(lat), float(lng)) for lat, lng in points)
+
+
+def cache_key(z: int, x: int, y: int, params) -> str:
+    filters = sorted((key, value) for key, values in params.lists() for value in values)
+    digest = hashlib.md5(urlencode(filters).encode('utf-8')).hexdigest()
+    version = get_version(version_key(z, x, y))
+    return f'{prefix()}:{z}:{x}:{y}:{version}:{timezone.localdate().isoformat()}:{digest}'
+
+
+def render_tile(events, z: int, x: int, y: int, now: Optional[datetime] = None) -> bytes:
+    """Encode the layers of tile z/x/y for the events queryset"""
+    # Whole-day cutoff keeps tiles stable for a day (the cache key carries the date)
+    now = now or timezone.localtime().replace(hour=0, minute=0, second=0, microsecond=0)
+    events_sql, events_params = events.order_by().values('pk').query.sql_with_params()
+
+    layers_sql = ' || '.join(
+        f"(SELECT COALESCE(ST_AsMVT(layer, '{name}', {EXTENT}, 'geom'), ''::bytea) "
+        f"FROM ({sql.format(extent=EXTENT)}) AS layer)"
+        for name, sql in LAYERS.items()
+    )
+    sql = f"WITH pins AS ({PINS_SQL.format(events=events_sql)}) SELECT {layers_sql}"
+    params = [now, *events_params, z, x, y]
+    for _ in LAYERS:
+        params.extend([z, x, y])
+
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        tile = cursor.fetchone()[0]
+    return bytes(tile) if tile else b''
@@ -0,0 +1,110 @@
+"""
+Signal handlers for the events app.
+
+- Keeps the denormalized occurrence bounds on Event (first_start_date,
+  next_start_date, last_end_date) in sync with EventDate rows.
+- Bumps vector tile versions for the tiles of changed locations/events.
+- Invalidates cached API responses (apps/common/response_cache.py).
+"""
+
+from django.db.models import Q
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from apps.common import response_cache
+from .models import Event, EventDate, EventImage, Location, Organizer
+from .services import vector_tiles
+from .services.date_bounds import refresh_date_bounds
+
+
+def event_location_ids(event_id):
+    """
+    Locations of an event: its own (where its dates without a location are
+    held) and those of its dates
+    """
+    return Location.objects.filter(
+        Q(events=event_id) | Q(event_dates__event=event_id)
+    ).values_list('pk', flat=True).distinct()
+
+
+def occurrence_location_ids(occurrences):
+    """Locations of (location_id, event_id) dates: their own, else their event's"""
+    ids = {location_id for location_id, _ in occurrences if location_id is not None}
+    fallback = {event_id for location_id, event_id in occurrences if location_id is None and event_id is not None}
+    if fallback:
+        ids.update(
+            Event.objects.filter(pk__in=fallback, location__isnull=False).values_list('location_id', flat=True)
+        )
+    return ids
+
+
+@receiver(post_save, sender=EventDate)
+def event_date_saved(sender, instance, raw=False, **kwargs):
+    """Refresh the event (and the previous one, if the date was moved)"""
+    if raw:
+        return
+    response_cache.invalidate(EventDate)
+    refresh_date_bounds({instance.event_id, getattr(instance, '_loaded_event_id', None)})
+    vector_tiles.bump_location_versions(occurrence_location_ids({
+        (instance.location_id, instance.event_id),
+        (getattr(instance, '_loaded_location_id', None), getattr(instance, '_loaded_event_id', None)),
+    }))
+    instance._loaded_event_id = instance.event_id
+    instance._loaded_location_id = instance.location_id
+
+
+@receiver(post_delete, sender=EventDate)
+def event_date_deleted(sender, instance, **kwargs):
+    response_cache.invalidate(EventDate)
+    refresh_date_bounds({instance.event_id})
+    vector_tiles.bump_location_versions(occurrence_location_ids({(instance.location_id, instance.event_id)}))
+
+
+@receiver(post_save, sender=Event)
+def event_saved(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    response_cache.invalidate(Event)
+    # The previous location too: dates without a location moved with the event
+    vector_tiles.bump_location_versions(
+        {*event_location_ids(instance.pk), getattr(instance, '_loaded_location_id', None)}
+    )
+    instance._loaded_location_id = instance.location_id
+
+
+@receiver(post_delete, sender=Event)
+def event_deleted(sender, instance, **kwargs):
+    response_cache.invalidate(Event)
+    # Dates are deleted by cascade and bump their own locations
+    vector_tiles.bump_location_versions({instance.location_id})
+
+
+@receiver(post_save, sender=Location)
+def location_saved(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    response_cache.invalidate(Location)
+    points = {
+        (instance.latitude, instance.longitude),
+        getattr(instance, '_loaded_coordinates', (None, None)),
+    }
+    vector_tiles.bump_versions(
+        (float(lat), float(lng)) for lat, lng in points if lat is not None and lng is not None
+    )
+    instance._loaded_coordinates = (instance.latitude, instance.longitude)
+
+
+@receiver(post_delete, sender=Location)
+def location_deleted(sender, instance, **kwargs):
+    response_cache.invalidate(Location)
+    if instance.latitude is not None and instance.longitude is not None:
+        vector_tiles.bump_versions([(float(instance.latitude), float(instance.longitude))])
+
+
+@receiver(post_save, sender=EventImage)
+@receiver(post_delete, sender=EventImage)
+@receiver(post_save, sender=Organizer)
+@receiver(post_delete, sender=Organizer)
+def invalidate_responses(sender, raw=False, **kwargs):
+    if not raw:
+        response_cache.invalidate(sender)
@@ -1,3 +1,1555 @@
-from django.test import TestCase
+import tempfile
+import time
+from datetime import timedelta
+from decimal import Decimal
+from io import BytesIO, StringIO
+from unittest import mock
 
-# Create your tests here.
+import msgpack
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.db import connection, transaction
+from django.db.models import Exists
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory, APITestCase
+from rest_framework import status
+
+from apps.common import response_cache, sparse_fields
+from apps.common.renderers import FastJSONRenderer
+from apps.gallery.models import Image
+from .filters import EventFilterBackend
+from .list_rows import EventListRows
+from .models import Event, EventDate, EventImage, ImportJob, Location, Organizer
+from .services import EventImporter, ImportResult, import_jobs, vector_tiles
+from .services.json_stream import iter_records
+from .services.road_graph import RoadGraph
+from .serializers import EventListSerializer
+from .views import EVENT_CACHE_MODELS, plan_events
+
+
+def create_event(title, days=(1,), images=2, location=None, **kwargs):
+    """Create an event with one EventDate per entry in days and some gallery images"""
+    event = Event.objects.create(title_pl=title, location=location, **kwargs)
+    now = timezone.now()
+    for offset in days:
+        EventDate.objects.create(
+            event=event,
+            location=location,
+            start_date=now + timedelta(days=offset),
+        )
+    for order in range(images):
+        image = Image.objects.create(title=f'{title} {order}')
+        EventImage.objects.create(event=event, image=image, order=order, is_main=(order == 1))
+    return event
+
+
+class EventAccessorTest(TestCase):
+    """Test Event accessors with and without prefetched relations"""
+
+    def setUp(self):
+        self.event = create_event('Koncert', days=(-3, 2, 5), images=3)
+
+    def test_prefetched_accessors_match_queries(self):
+        """Prefetched accessors return the same values as the query-based ones"""
+        plain = Event.objects.get(pk=self.event.pk)
+        prefetched = Event.objects.for_detail().get(pk=self.event.pk)
+
+        with self.assertNumQueries(0):
+            main_image = prefetched.main_image
+            next_date = prefetched.next_date
+            is_past = prefetched.is_past
+            all_images = prefetched.all_images
+
+        self.assertEqual(main_image, plain.main_image)
+        self.assertEqual(next_date, plain.next_date)
+        self.assertEqual(is_past, plain.is_past)
+        self.assertEqual(all_images, plain.all_images)
+
+
+class EventQueryCountTest(APITestCase):
+    """Test that event endpoints run a fixed number of queries"""
+
+    def setUp(self):
+        cache.clear()
+        self.location = Location.objects.create(name='Dom Kultury', city='Lesko')
+
+    def test_list_query_count_is_constant(self):
+        """Test GET /api/events/ does not query per row"""
+        for i in range(5):
+            create_event(f'Wydarzenie {i}', days=(1, 2, 3), images=i, location=self.location)
+
+        # COUNT, events (+location join, main image subquery)
+        with self.assertNumQueries(2):
+            response = self.client.get('/api/events/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data['results']), 5)
+
+    def test_detail_query_count_is_constant(self):
+        """Test GET /api/events/:id/ does not query per date or image"""
+        event = create_event('Festiwal', days=range(10), images=5, location=self.location)
+
+        # event (+location, organizer joins), event dates (+location), event images (+image)
+        with self.assertNumQueries(3):
+            response = self.client.get(f'/api/events/{event.pk}/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data['event_dates']), 10)
+        self.assertEqual(len(response.data['images']), 5)
+
+
+class EventDateBoundsTest(TestCase):
+    """Test denormalized first/next/last dates on Event"""
+
+    def setUp(self):
+        self.now = timezone.now()
+        self.event = Event.objects.create(title_pl='Warsztaty')
+
+    def add_date(self, days, **kwargs):
+        return EventDate.objects.create(
+            event=self.event,
+            start_date=self.now + timedelta(days=days),
+            **kwargs
+        )
+
+    def test_bounds_follow_event_dates(self):
+        """Creating, changing and deleting dates keeps the bounds in sync"""
+        past = self.add_date(-5, end_date=self.now - timedelta(days=4))
+        upcoming = self.add_date(3)
+        self.event.refresh_from_db()
+        self.assertEqual(self.event.first_start_date, past.start_date)
+        self.assertEqual(self.event.next_start_date, upcoming.start_date)
+        self.assertEqual(self.event.last_end_date, upcoming.start_date)
+
+        upcoming.start_date = self.now + timedelta(days=7)
+        upcoming.save()
+        self.event.refresh_from_db()
+        self.assertEqual(self.event.next_start_date, upcoming.start_date)
+
+        upcoming.delete()
+        self.event.refresh_from_db()
+        self.assertIsNone(self.event.next_start_date)
+        self.assertEqual(self.event.last_end_date, past.end_date)
+        self.assertTrue(Event.objects.past().filter(pk=self.event.pk).exists())
+
+    def test_roll_forward_command(self):
+        """roll_event_dates moves next_start_date past started occurrences"""
+        first = self.add_date(1)
+        second = self.add_date(2)
+        # Simulate time passing: the stored "next" date is now in the past
+        Event.objects.filter(pk=self.event.pk).update(
+            next_start_date=self.now - timedelta(hours=1)
+        )
+        call_command('roll_event_dates', stdout=StringIO())
+        self.event.refresh_from_db()
+        self.assertEqual(self.event.next_start_date, first.start_date)
+        self.assertNotEqual(self.event.next_start_date, second.start_date)
+
+    def test_importer_refreshes_bounds(self):
+        """EventImporter keeps bounds correct for imported events"""
+        start = (self.now + timedelta(days=10)).replace(microsecond=0)
+        result = EventImporter().import_from_json([{
+            'title_pl': 'Koncert importowany',
+            'dates': [{'start_date': start.isoformat()}],
+        }])
+        self.assertEqual(result.imported, 1)
+        event = Event.objects.get(slug='koncert-importowany')
+        self.assertEqual(event.next_start_date, start)
+        self.assertEqual(event.first_start_date, start)
+
+
+class EventCursorPaginationTest(APITestCase):
+    """Test keyset pagination of /api/events/ with ?pagination=cursor"""
+
+    def setUp(self):
+        cache.clear()
+        for i in range(5):
+            create_event(f'Nadchodzące {i}', days=(i + 1,), images=0)
+        create_event('Bez terminów', days=(), images=0)
+        create_event('Minione', days=(-2,), images=0)
+        self.expected = list(Event.objects.order_by('next_start_date', 'id').values_list('id', flat=True))
+
+    def collect(self, url):
+        ids = []
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertNotIn('count', response.data)
+            ids.extend(item['id'] for item in response.data['results'])
+            url = response.data['next']
+        return ids
+
+    def test_walks_feed_in_order(self):
+        """Following next links returns every event once, ordered by next date"""
+        ids = self.collect('/api/events/?pagination=cursor&page_size=2')
+        self.assertEqual(ids, self.expected)
+
+    def test_stable_under_inserts(self):
+        """Events inserted before the cursor don't shift the following pages"""
+        response = self.client.get('/api/events/?pagination=cursor&page_size=3')
+        first_page = [item['id'] for item in response.data['results']]
+        create_event('Wstawione', days=(0.5,), images=0)
+
+        rest = self.collect(response.data['next'])
+        self.assertEqual(first_page + rest, self.expected)
+
+    def test_previous_link(self):
+        """previous link returns the page before the cursor"""
+        first = self.client.get('/api/events/?pagination=cursor&page_size=3')
+        second = self.client.get(first.data['next'])
+        back = self.client.get(second.data['previous'])
+        self.assertEqual(back.data['results'], first.data['results'])
+        self.assertIsNone(back.data['previous'])
+
+    def test_invalid_cursor(self):
+        response = self.client.get('/api/events/?cursor=not-a-cursor')
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+
+class EventFilterTest(APITestCase):
+    """Test server-side filters of /api/events/"""
+
+    def setUp(self):
+        cache.clear()
+        lesko = Location.objects.create(name='Dom Kultury', city='Lesko')
+        cisna = Location.objects.create(name='Plener', city='Cisna')
+        self.concert = create_event(
+            'Koncert', days=(2,), images=0, location=lesko, category=Event.CONCERT
+        )
+        self.festival = create_event(
+            'Festiwal', days=(10, 11), images=0, location=cisna,
+            category=Event.FESTIVAL, price_type=Event.PAID,
+        )
+        self.pending = create_event(
+            'Warsztaty', days=(20,), images=0, location=lesko,
+            category=Event.WORKSHOP, moderation_status=Event.PENDING,
+        )
+
+    def ids(self, query):
+        response = self.client.get(f'/api/events/?{query}')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [item['id'] for item in response.data['results']]
+
+    def test_date_range(self):
+        day = (timezone.localdate() + timedelta(days=10)).isoformat()
+        self.assertEqual(self.ids(f'dateFrom={day}&dateTo={day}'), [self.festival.pk])
+
+    def test_choice_filters(self):
+        self.assertEqual(self.ids('category=CONCERT,WORKSHOP&moderation_status=APPROVED'), [self.concert.pk])
+        self.assertEqual(self.ids('price_type=PAID'), [self.festival.pk])
+
+    def test_city(self):
+        self.assertEqual(self.ids('city=Lesko'), [self.concert.pk, self.pending.pk])
+
+    def test_sort(self):
+        self.assertEqual(
+            self.ids('sort=date&order=desc'),
+            [self.pending.pk, self.festival.pk, self.concert.pk],
+        )
+
+
+class EventFilterIndexTest(TestCase):
+    """Test that the common filter combinations are served by indexes"""
+
+    def explain(self, queryset):
+        # Tables are tiny in tests, so make the planner show its index choice
+        with connection.cursor() as cursor:
+            cursor.execute('SET enable_seqscan = off')
+        try:
+            return queryset.explain()
+        finally:
+            with connection.cursor() as cursor:
+                cursor.execute('RESET enable_seqscan')
+
+    def test_approved_upcoming_uses_partial_index(self):
+        queryset = Event.objects.upcoming().filter(
+            moderation_status=Event.APPROVED
+        ).order_by('next_start_date', 'id')
+        self.assertIn('events_event_approved_next_idx', self.explain(queryset))
+
+    def test_category_upcoming_uses_composite_index(self):
+        queryset = Event.objects.upcoming().filter(category=Event.CONCERT)
+        self.assertIn('events_even_categor_43a0be_idx', self.explain(queryset))
+
+    def test_date_range_uses_event_date_index(self):
+        backend = EventFilterBackend()
+        today = timezone.localdate()
+        queryset = Event.objects.filter(
+            Exists(backend.dates_in_range(today, today + timedelta(days=7)))
+        )
+        self.assertRegex(
+            self.explain(queryset),
+            r'events_even_(event_i_a5ff22|start_d_ad36ec)_idx',
+        )
+
+
+class EventGeoFilterTest(APITestCase):
+    """Test radius filtering and nearest-first ordering"""
+
+    def setUp(self):
+        cache.clear()
+        def place(city, lat, lng):
+            return Location.objects.create(name=f'Centrum {city}', city=city, latitude=lat, longitude=lng)
+
+        self.lesko = place('Lesko', '49.4700000', '22.3300000')
+        self.sanok = place('Sanok', '49.5600000', '22.2000000')
+        self.ustrzyki = place('Ustrzyki Dolne', '49.4300000', '22.5900000')
+        self.cisna = place('Cisna', '49.2100000', '22.3300000')
+
+        self.in_lesko = create_event('Lesko', images=0, location=self.lesko)
+        self.in_cisna = create_event('Cisna', images=0, location=self.cisna)
+        # Event without its own location, held in Sanok and Ustrzyki via its dates
+        self.tour = create_event('Trasa', days=(), images=0)
+        for location in (self.ustrzyki, self.sanok):
+            EventDate.objects.create(
+                event=self.tour, location=location,
+                start_date=timezone.now() + timedelta(days=3),
+            )
+
+    def test_point_follows_coordinates(self):
+        self.assertAlmostEqual(self.lesko.point.y, 49.47)
+        self.lesko.latitude = None
+        self.lesko.save()
+        self.lesko.refresh_from_db()
+        self.assertIsNone(self.lesko.point)
+
+    def test_radius_and_distance_sort(self):
+        response = self.client.get('/api/events/?lat=49.47&lng=22.33&radius=25&sort=distance')
+        ids = [item['id'] for item in response.data['results']]
+        self.assertEqual(ids, [self.in_lesko.pk, self.tour.pk])
+
+
+# Four road nodes south of Lesko: a secondary road 1-2-3, a footway 3-4
+# and a one-way residential street 4 -> 1
+ROAD_OSM = b"""<?xml version="1.0"?>
+<osm>
+  <node id="1" lat="49.40" lon="22.30"/>
+  <node id="2" lat="49.41" lon="22.30"/>
+  <node id="3" lat="49.42" lon="22.30"><tag k="highway" v="crossing"/></node>
+  <node id="4" lat="49.42" lon="22.31"/>
+  <way id="10"><nd ref="1"/><nd ref="2"/><nd ref="3"/><tag k="highway" v="secondary"/></way>
+  <way id="11"><nd ref="3"/><nd ref="4"/><tag k="highway" v="footway"/></way>
+  <way id="12"><nd ref="4"/><nd ref="1"/><tag k="highway" v="residential"/><tag k="oneway" v="yes"/></way>
+  <way id="13"><nd ref="2"/><nd ref="4"/><tag k="building" v="yes"/></way>
+</osm>"""
+
+
+class RoadGraphTest(SimpleTestCase):
+    """Test building and querying the road graph"""
+
+    def setUp(self):
+        self.graph = RoadGraph.from_osm(BytesIO(ROAD_OSM))
+        self.start, _ = self.graph.nearest_node(49.40, 22.30, 500)
+
+    def test_modes_and_oneway(self):
+        """Cars follow oneway and can't use footways; pedestrians can"""
+        by_car = self.graph.travel_times(self.start, 'auto', 3600)
+        on_foot = self.graph.travel_times(self.start, 'pedestrian', 3600)
+        self.assertEqual(len(by_car), 3)
+        self.assertEqual(len(on_foot), 4)
+
+    def test_time_limit(self):
+        """Nodes beyond the limit are not reached"""
+        # 1.1 km at 60 km/h is ~67 s
+        self.assertEqual(len(self.graph.travel_times(self.start, 'auto', 60)), 1)
+        self.assertEqual(len(self.graph.travel_times(self.start, 'auto', 70)), 2)
+
+    def test_save_load_roundtrip(self):
+        buffer = BytesIO()
+        self.graph.save(buffer)
+        buffer.seek(0)
+        loaded = RoadGraph.load(buffer)
+        self.assertEqual(
+            loaded.travel_times(self.start, 'bicycle', 3600),
+            self.graph.travel_times(self.start, 'bicycle', 3600),
+        )
+
+
+class EventIsochroneFilterTest(APITestCase):
+    """Test ?minutes=&mode= filtering of /api/events/"""
+
+    def setUp(self):
+        cache.clear()
+        graph_file = tempfile.NamedTemporaryFile(suffix='.graph', delete=False)
+        RoadGraph.from_osm(BytesIO(ROAD_OSM)).save(graph_file)
+        graph_file.close()
+        self.settings = override_settings(ROAD_GRAPH_PATH=graph_file.name)
+        self.settings.enable()
+        self.addCleanup(self.settings.disable)
+
+        near = Location.objects.create(name='Przy drodze', latitude='49.4100000', longitude='22.3000000')
+        footway = Location.objects.create(name='Przy ścieżce', latitude='49.4200000', longitude='22.3100000')
+        self.near = create_event('Blisko', images=0, location=near)
+        self.footway = create_event('Ścieżka', images=0, location=footway)
+
+    def ids(self, query):
+        response = self.client.get(f'/api/events/?lat=49.40&lng=22.30&{query}')
+        return {item['id'] for item in response.data['results']}
+
+    def test_reachable_by_mode(self):
+        self.assertEqual(self.ids('minutes=5&mode=auto'), {self.near.pk})
+        self.assertEqual(self.ids('minutes=60&mode=pedestrian'), {self.near.pk, self.footway.pk})
+
+
+class EventMapTest(APITestCase):
+    """Test /api/events/map/ clustering"""
+
+    def setUp(self):
+        cache.clear()
+        lesko = Location.objects.create(name='Rynek', city='Lesko', latitude='49.4700000', longitude='22.3300000')
+        castle = Location.objects.create(name='Zamek', city='Lesko', latitude='49.4710000', longitude='22.3310000')
+        cisna = Location.objects.create(name='Plener', city='Cisna', latitude='49.2100000', longitude='22.3300000')
+        self.concert = create_event('Koncert', images=0, location=lesko, category=Event.CONCERT)
+        create_event('Teatr', images=0, location=castle, category=Event.THEATRE)
+        create_event('Festiwal', images=0, location=cisna, category=Event.FESTIVAL)
+
+    def test_clusters_at_low_zoom(self):
+        response = self.client.get('/api/events/map/?bbox=22.0,49.0,23.0,50.0&zoom=9')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        counts = sorted(cluster['count'] for cluster in response.data['clusters'])
+        self.assertEqual(counts, [1, 2])
+        self.assertEqual(response.data['points'], [])
+
+    def test_points_at_high_zoom_with_filters(self):
+        response = self.client.get('/api/events/map/?bbox=22.32,49.46,22.34,49.48&zoom=15&category=CONCERT')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([point['id'] for point in response.data['points']], [self.concert.pk])
+        self.assertEqual(response.data['points'][0]['title'], 'Koncert')
+
+    def test_changes_invalidate_and_etag(self):
+        url = '/api/events/map/?bbox=22.32,49.46,22.34,49.48&zoom=15'
+        response = self.client.get(url)
+        self.assertEqual(len(response.data['points']), 2)
+        self.assertEqual(
+            self.client.get(url, HTTP_IF_NONE_MATCH=response['ETag']).status_code, status.HTTP_304_NOT_MODIFIED
+        )
+
+        # A nearby viewport in the same aligned bbox sees the change too
+        with self.captureOnCommitCallbacks(execute=True):
+            self.concert.delete()
+        response = self.client.get('/api/events/map/?bbox=22.321,49.461,22.339,49.479&zoom=15')
+        self.assertEqual(len(response.data['points']), 1)
+        self.assertEqual(len(self.client.get(url).data['points']), 1)
+
+    def test_bbox_required(self):
+        response = self.client.get('/api/events/map/')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class EventTileTest(APITestCase):
+    """Test /api/tiles/{z}/{x}/{y}.mvt"""
+
+    def setUp(self):
+        cache.clear()
+        self.location = Location.objects.create(
+            name='Rynek', city='Lesko', latitude='49.4700000', longitude='22.3300000'
+        )
+        create_event('Koncert', days=(2,), images=0, location=self.location)
+        self.x, self.y = vector_tiles.tile_for(49.47, 22.33, 12)
+        self.url = f'/api/tiles/12/{self.x}/{self.y}.mvt'
+
+    def test_tile_is_rendered_and_cached(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response['Content-Type'], 'application/vnd.mapbox-vector-tile')
+        self.assertIn(b'locations', response.content)
+        self.assertIn(b'Koncert', response.content)
+
+        with self.assertNumQueries(0):
+            cached = self.client.get(self.url)
+        self.assertEqual(cached.content, response.content)
+
+    def test_change_inside_tile_invalidates(self):
+        key = vector_tiles.version_key(12, self.x, self.y)
+        far_key = vector_tiles.version_key(12, self.x + 8, self.y)
+        version, far_version = vector_tiles.get_version(key), vector_tiles.get_version(far_key)
+
+        self.location.name = 'Rynek główny'
+        with self.captureOnCommitCallbacks(execute=True):
+            self.location.save()
+        self.assertNotEqual(vector_tiles.get_version(key), version)
+        self.assertEqual(vector_tiles.get_version(far_key), far_version)
+
+    def test_date_without_location_is_pinned_at_event_location(self):
+        event = Event.objects.create(title_pl='Jarmark', location=self.location)
+        key = vector_tiles.version_key(12, self.x, self.y)
+        version = vector_tiles.get_version(key)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            EventDate.objects.create(event=event, start_date=timezone.now() + timedelta(days=3))
+        self.assertNotEqual(vector_tiles.get_version(key), version)
+        response = self.client.get(self.url)
+        self.assertIn(b'Jarmark', response.content)
+
+        # Moving the event moves its location-less date out of the tile
+        far = Location.objects.create(name='Schronisko', city='Wetlina', latitude='49.1500000', longitude='22.5000000')
+        version = vector_tiles.get_version(key)
+        event.location = far
+        with self.captureOnCommitCallbacks(execute=True):
+            event.save()
+        self.assertNotEqual(vector_tiles.get_version(key), version)
+        self.assertNotIn(b'Jarmark', self.client.get(self.url).content)
+
+    def test_import_bumps_after_date_bounds(self):
+        key = vector_tiles.version_key(12, self.x, self.y)
+        version = vector_tiles.get_version(key)
+        record = {
+            'title_pl': 'Jarmark',
+            'dates': [{
+                'start_date': (timezone.now() + timedelta(days=3)).isoformat(),
+                'location': {'name': 'Rynek', 'city': 'Lesko'},
+            }],
+        }
+        with self.captureOnCommitCallbacks() as callbacks:
+            EventImporter(bulk=True).import_from_json([record])
+            self.assertEqual(vector_tiles.get_version(key), version)
+        self.assertIsNotNone(Event.objects.get(title_pl='Jarmark').next_start_date)
+        for callback in callbacks:
+            callback()
+        self.assertNotEqual(vector_tiles.get_version(key), version)
+        self.assertIn(b'Jarmark', self.client.get(self.url).content)
+
+    def test_invalid_tile(self):
+        response = self.client.get('/api/tiles/2/9/0.mvt')
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertEqual(response.content, b'')
+
+
+class EventSearchTest(APITestCase):
+    """Test full-text ?search= on /api/events/"""
+
+    def setUp(self):
+        cache.clear()
+        self.concert = create_event('Koncert jazzowy w Lesku', images=0)
+        self.workshop = create_event(
+            'Warsztaty ceramiki', images=0,
+            description_pl='<p>Na koniec <strong>koncert</strong> przy ognisku</p>',
+        )
+        self.english = create_event('Festiwal', images=0, title_en='Mountain music festival')
+        self.ukrainian = create_event('Wystawa', images=0, title_uk='Виставка їжі')
+
+    def ids(self, term):
+        response = self.client.get('/api/events/', {'search': term})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [item['id'] for item in response.data['results']]
+
+    def test_title_ranks_above_description(self):
+        self.assertEqual(self.ids('koncert'), [self.concert.pk, self.workshop.pk])
+
+    def test_prefix_and_diacritics(self):
+        self.assertEqual(self.ids('lesk'), [self.concert.pk])
+        self.assertEqual(self.ids('ceramika ognisko'), [])
+        self.assertEqual(self.ids('warsztaty OGNISKU'), [self.workshop.pk])
+
+    def test_other_languages(self):
+        self.assertEqual(self.ids('festivals'), [self.english.pk])
+        self.assertEqual(self.ids('виставка'), [self.ukrainian.pk])
+
+    def test_vectors_follow_updates(self):
+        self.concert.title_pl = 'Koncert rockowy'
+        self.concert.save(update_fields=['title_pl'])
+        self.assertEqual(self.ids('jazz'), [])
+        self.assertEqual(self.ids('rock'), [self.concert.pk])
+
+    def test_saves_without_text_changes_keep_vectors(self):
+        for concert in (self.concert, Event.objects.get(pk=self.concert.pk)):
+            concert.moderation_status = Event.APPROVED
+            with CaptureQueriesContext(connection) as queries:
+                concert.save()
+            self.assertFalse([q for q in queries if 'search_vector_pl' in q['sql']])
+            self.assertEqual(self.ids('jazz'), [concert.pk])
+
+        concert.description_en = '<p>Jazz by the castle</p>'
+        with CaptureQueriesContext(connection) as queries:
+            concert.save()
+        self.assertEqual(len([q for q in queries if 'search_vector_pl' in q['sql']]), 1)
+        self.assertEqual(self.ids('castle'), [concert.pk])
+
+    def test_cache_bump_waits_for_outer_commit(self):
+        versions = response_cache.get_versions(['events.event'])
+        with self.captureOnCommitCallbacks() as callbacks, transaction.atomic():
+            self.concert.title_pl = 'Koncert rockowy'
+            self.concert.save()
+        self.assertEqual(response_cache.get_versions(['events.event']), versions)
+        for callback in callbacks:
+            callback()
+        self.assertNotEqual(response_cache.get_versions(['events.event']), versions)
+        self.assertEqual(self.ids('rock'), [self.concert.pk])
+
+    def test_importer_builds_vectors(self):
+        EventImporter().import_from_json([{
+            'title_pl': 'Rajd rowerowy',
+            'description_pl': '<p>Trasa przez Połoniny</p>',
+            'dates': [{'start_date': (timezone.now() + timedelta(days=3)).isoformat()}],
+        }])
+        event = Event.objects.get(title_pl='Rajd rowerowy')
+        self.assertEqual(self.ids('poloniny'), [event.pk])
+
+    def test_search_uses_gin_index(self):
+        with connection.cursor() as cursor:
+            cursor.execute('SET enable_seqscan = off')
+        try:
+            plan = Event.objects.search('koncert').explain()
+        finally:
+            with connection.cursor() as cursor:
+                cursor.execute('RESET enable_seqscan')
+        self.assertIn('events_event_search_pl_idx', plan)
+
+
+class ResponseCacheTest(APITestCase):
+    """Test caching of anonymous GET responses and their invalidation"""
+
+    def setUp(self):
+        cache.clear()
+        response_cache.reset_stats()
+        self.event = create_event('Koncert', images=1)
+
+    def get(self, url='/api/events/', **kwargs):
+        response = self.client.get(url, **kwargs)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response
+
+    def test_hit_after_miss(self):
+        self.assertEqual(self.get()['X-Cache'], 'MISS')
+        with self.assertNumQueries(0):
+            response = self.get()
+        self.assertEqual(response['X-Cache'], 'HIT')
+        self.assertEqual(response.json()['results'][0]['id'], self.event.pk)
+        # Parameter order and empty params don't split the cache
+        self.get('/api/events/?lang=pl&category=')
+        self.assertEqual(self.get('/api/events/?category=&lang=PL')['X-Cache'], 'HIT')
+        self.assertEqual(
+            response_cache.stats(), {'hit': 2, 'miss': 2, 'bypass': 0, 'not_modified': 0}
+        )
+
+    def test_counters_are_written_in_batches(self):
+        key = f'{response_cache.namespace()}:stats:miss'
+        with override_settings(RESPONSE_CACHE_STATS_INTERVAL=60):
+            self.get()
+            self.get()
+        self.assertIsNone(cache.get(key))
+        self.assertEqual(response_cache.stats()['hit'], 1)
+        self.assertEqual(cache.get(key), 1)
+
+        with override_settings(RESPONSE_CACHE_STATS_INTERVAL=0):
+            self.get('/api/events/?lang=en')
+        self.assertEqual(cache.get(key), 2)
+
+    def test_changes_invalidate(self):
+        self.get()
+        self.event.title_pl = 'Koncert zmieniony'
+        with self.captureOnCommitCallbacks(execute=True):
+            self.event.save()
+        response = self.get()
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertEqual(response.data['results'][0]['title']['pl'], 'Koncert zmieniony')
+
+        self.get()
+        Image.objects.update(title='Okładka')
+        self.assertEqual(self.get()['X-Cache'], 'HIT')  # bulk update sends no signal
+        with self.captureOnCommitCallbacks(execute=True):
+            self.event.event_images.get().image.save()
+        self.assertEqual(self.get()['X-Cache'], 'MISS')
+
+    def test_versions_bump_on_commit(self):
+        versions = response_cache.get_versions(['events.event'])
+        with self.captureOnCommitCallbacks() as callbacks:
+            self.event.save()
+            self.assertEqual(response_cache.get_versions(['events.event']), versions)
+        for callback in callbacks:
+            callback()
+        self.assertEqual(response_cache.get_versions(['events.event']), [versions[0] + 1])
+
+    def test_importer_invalidates_once(self):
+        self.get()
+        versions = response_cache.get_versions(['events.event'])
+        with self.captureOnCommitCallbacks(execute=True):
+            EventImporter().import_from_json([
+                {'title_pl': f'Import {i}', 'dates': [{'start_date': '2030-01-01T19:00:00'}]}
+                for i in range(3)
+            ])
+        self.assertEqual(response_cache.get_versions(['events.event']), [versions[0] + 1])
+        self.assertEqual(self.get().data['count'], 4)
+
+    def test_authenticated_requests_bypass(self):
+        user = get_user_model().objects.create_user('redaktor', password='haslo')
+        self.client.force_authenticate(user)
+        self.assertEqual(self.get()['X-Cache'], 'BYPASS')
+        self.assertEqual(self.get()['X-Cache'], 'BYPASS')
+        self.assertEqual(response_cache.stats()['bypass'], 2)
+
+    def test_conditional_get(self):
+        etag = self.get()['ETag']
+        with self.assertNumQueries(0):
+            response = self.client.get('/api/events/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response['ETag'], etag)
+        self.assertEqual(response_cache.stats()['not_modified'], 1)
+
+        # Other queries and other data get other validators
+        self.assertNotEqual(self.get('/api/events/?category=CONCERT')['ETag'], etag)
+        self.assertEqual(self.get(f'/api/events/{self.event.pk}/')['X-Cache'], 'MISS')
+
+    def test_related_changes_change_validator(self):
+        """EventDate, Location and EventImage changes never get a 304 for stale content"""
+        location = Location.objects.create(name='Rynek', city='Lesko')
+        for change in (
+            lambda: EventDate.objects.create(event=self.event, location=location, start_date=timezone.now()),
+            lambda: location.save(),
+            lambda: self.event.event_images.get().delete(),
+        ):
+            etag = self.get()['ETag']
+            with self.captureOnCommitCallbacks(execute=True):
+                change()
+            response = self.client.get('/api/events/', HTTP_IF_NONE_MATCH=etag)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertNotEqual(response['ETag'], etag)
+
+    def test_if_modified_since(self):
+        # Pretend the last change was a minute ago so Last-Modified is advertised
+        for key in response_cache.modified_keys(EVENT_CACHE_MODELS):
+            cache.set(key, time.time() - 60, None)
+        last_modified = self.get()['Last-Modified']
+        response = self.client.get('/api/events/', HTTP_IF_MODIFIED_SINCE=last_modified)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.event.save()
+        self.assertNotIn('Last-Modified', self.get())  # changed within this second
+        response = self.client.get('/api/events/', HTTP_IF_MODIFIED_SINCE=last_modified)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_stats_endpoint_is_staff_only(self):
+        self.assertEqual(self.client.get('/api/cache/stats/').status_code, status.HTTP_403_FORBIDDEN)
+        admin = get_user_model().objects.create_superuser('admin', password='haslo')
+        self.client.force_authenticate(admin)
+        self.get()
+        self.assertEqual(self.get('/api/cache/stats/').data['bypass'], 1)
+
+
+class EventLanguageProjectionTest(APITestCase):
+    """Test that ?lang= loads only the requested language"""
+
+    def setUp(self):
+        cache.clear()
+        self.event = create_event(
+            'Koncert', images=0, title_uk='Концерт',
+            description_pl='<p>Opis</p>', description_en='<p>Description</p>',
+        )
+
+    def get(self, url):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response, ' '.join(query['sql'] for query in queries)
+
+    def test_detail_loads_one_language(self):
+        response, sql = self.get(f'/api/events/{self.event.pk}/?lang=uk')
+        self.assertEqual(response.data['title'], {'uk': 'Концерт'})
+        # No Ukrainian description: Polish fallback resolved in SQL
+        self.assertEqual(response.data['description'], {'uk': '<p>Opis</p>'})
+        for column in ('title_en', 'description_en', 'search_vector_pl'):
+            self.assertNotIn(f'"events_event"."{column}"', sql)
+
+    def test_list_skips_descriptions(self):
+        response, sql = self.get('/api/events/?lang=en')
+        self.assertEqual(response.data['results'][0]['title'], {'en': 'Koncert'})
+        self.assertNotIn('description_', sql)
+        self.assertNotIn('"events_event"."title_uk"', sql)
+
+    def test_without_lang_all_languages(self):
+        response, _ = self.get(f'/api/events/{self.event.pk}/')
+        self.assertEqual(response.data['title'], {'pl': 'Koncert', 'en': None, 'uk': 'Концерт'})
+
+
+class SparseFieldsetTest(APITestCase):
+    """Test ?fields= / ?omit= on responses and queries"""
+
+    def setUp(self):
+        cache.clear()
+        self.location = Location.objects.create(name='Dom Kultury', city='Lesko')
+        self.organizer = Organizer.objects.create(name='GOK Lesko')
+        self.event = create_event(
+            'Koncert', days=(1, 2), images=2, location=self.location, organizer=self.organizer
+        )
+
+    def test_list_fields(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get('/api/events/?fields=id,title,slug,next_date,unknown')
+        self.assertEqual(list(response.data['results'][0]), ['id', 'title', 'slug', 'next_date'])
+        # COUNT and events only: no location join, no image prefetch, no unused columns
+        self.assertEqual(len(queries), 2)
+        sql = queries[1]['sql']
+        self.assertNotIn('events_location', sql)
+        self.assertNotIn('"events_event"."price_type"', sql)
+
+    def test_detail_omit(self):
+        url = f'/api/events/{self.event.pk}/?omit=event_dates,images,is_past'
+        with self.assertNumQueries(1):
+            response = self.client.get(url)
+        self.assertNotIn('images', response.data)
+        self.assertNotIn('event_dates', response.data)
+        self.assertEqual(response.data['location']['city'], 'Lesko')
+
+        # is_past still needs the dates
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(f'/api/events/{self.event.pk}/?omit=event_dates,images')
+        self.assertFalse(response.data['is_past'])
+        self.assertNotIn('events_eventimage', ' '.join(q['sql'] for q in queries))
+
+    def test_organizers(self):
+        with self.assertNumQueries(2):
+            response = self.client.get('/api/organizers/?fields=id,name')
+        self.assertEqual(response.data['results'], [{'id': self.organizer.pk, 'name': 'GOK Lesko'}])
+
+        response = self.client.get(f'/api/organizers/{self.organizer.pk}/events/?fields=id,title')
+        self.assertEqual(
+            response.data['results'],
+            [{'id': self.event.pk, 'title': {'pl': 'Koncert', 'en': None, 'uk': None}}],
+        )
+
+    def test_writes_use_all_fields(self):
+        response = self.client.patch(
+            f'/api/events/{self.event.pk}/?fields=id', {'category': Event.CONCERT}, format='json'
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['category'], Event.CONCERT)
+
+
+class EventListRowsTest(TestCase):
+    """Test that the .values() fast path renders exactly like EventListSerializer"""
+
+    def setUp(self):
+        location = Location.objects.create(
+            name='Rynek', city='Lesko', latitude='49.4700000', longitude='22.3300000'
+        )
+        create_event(
+            'Koncert', days=(1, 3), images=3, location=location,
+            title_uk='Концерт', price_type=Event.PAID, price_amount='45.5',
+        )
+        create_event('Wystawa', days=(), images=0, title_en='Exhibition')
+        create_event('Warsztaty', days=(2,), images=1, location=Location.objects.create(name='Plener'))
+        # No Polish title: null for ?lang=pl, the English one or '' for other languages
+        create_event(None, days=(4,), images=0, title_en='Untitled')
+        Image.objects.update(image='gallery/cover.jpg')
+
+    def render_both(self, params):
+        request = Request(APIRequestFactory().get('/api/events/', params))
+        events = plan_events(Event.objects.all(), request, EventListSerializer)
+        expected = EventListSerializer(events, many=True, context={'request': request}).data
+
+        rows = EventListRows(
+            sparse_fields.selected_fields(request, EventListSerializer.Meta.fields),
+            params.get('lang', ''),
+        )
+        actual = rows.to_representation(rows.values(Event.objects.all()))
+        return JSONRenderer().render(expected), JSONRenderer().render(actual)
+
+    def test_parity(self):
+        for params in (
+            {}, {'lang': 'pl'}, {'lang': 'uk'}, {'lang': 'en'}, {'fields': 'id,image,next_date'}, {'omit': 'title'},
+        ):
+            with self.subTest(params=params):
+                expected, actual = self.render_both(params)
+                self.assertEqual(actual, expected)
+
+    def test_benchmark_command(self):
+        out = StringIO()
+        call_command('benchmark_event_list', sizes=[20], repeat=1, stdout=out)
+        self.assertIn('20', out.getvalue())
+
+
+class RendererTest(APITestCase):
+    """Test the orjson renderer and MessagePack negotiation"""
+
+    def setUp(self):
+        cache.clear()
+        location = Location.objects.create(name='Rynek', city='Lesko', latitude='49.4700000', longitude='22.3300000')
+        self.event = create_event('Koncert – źródło', location=location, price_amount='45.5')
+
+    def test_fast_json_matches_json_renderer(self):
+        response = self.client.get(f'/api/events/{self.event.pk}/')
+        self.assertEqual(response['Content-Type'], 'application/json')
+        data = dict(response.data, ratio=Decimal('0.5'), at=timezone.now(), note='\u2028')
+        for accept in (None, 'application/json; indent=2', 'application/json; indent=4'):
+            with self.subTest(accept=accept):
+                self.assertEqual(
+                    FastJSONRenderer().render(data, accept, {}), JSONRenderer().render(data, accept, {})
+                )
+
+    def test_msgpack_negotiation_and_cache(self):
+        expected = self.client.get('/api/events/').json()
+        for cache_status in ('MISS', 'HIT'):
+            response = self.client.get('/api/events/', HTTP_ACCEPT='application/msgpack')
+            self.assertEqual(response['X-Cache'], cache_status)
+            self.assertEqual(response['Content-Type'], 'application/msgpack')
+            self.assertIn('Accept', response['Vary'])
+            self.assertEqual(msgpack.unpackb(response.content), expected)
+        # Each format has its own cache entry and validator
+        json_response = self.client.get('/api/events/')
+        self.assertEqual(json_response['X-Cache'], 'HIT')
+        self.assertNotEqual(json_response['ETag'], response['ETag'])
+
+
+class OrganizerEventCountTest(APITestCase):
+    """Test that organizer event counts come from the organizer query"""
+
+    def setUp(self):
+        cache.clear()
+        for i in range(5):
+            organizer = Organizer.objects.create(name=f'Organizator {i}')
+            create_event(f'Koncert {i}', days=(1,), images=0, organizer=organizer)
+            create_event(f'Wystawa {i}', days=(-3,), images=0, organizer=organizer)
+        self.idle = Organizer.objects.create(name='Bez wydarzeń')
+
+    def test_list_counts_in_constant_queries(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get('/api/organizers/')
+        # COUNT and organizers with their counts
+        self.assertEqual(len(queries), 2)
+        counts = {row['id']: row['events_count'] for row in response.data['results']}
+        self.assertEqual(counts[self.idle.pk], 0)
+        self.assertEqual(sorted(set(counts.values())), [0, 2])
+
+    def test_detail_upcoming_count(self):
+        organizer = Organizer.objects.exclude(pk=self.idle.pk).first()
+        with self.assertNumQueries(1):
+            response = self.client.get(f'/api/organizers/{organizer.pk}/')
+        self.assertEqual(response.data['events_count'], 2)
+        self.assertEqual(response.data['upcoming_events_count'], 1)
+
+    def test_has_events_uses_exists(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get('/api/organizers/?has_events=true')
+        self.assertEqual(response.data['count'], 5)
+        sql = queries[-1]['sql']
+        self.assertIn('EXISTS', sql)
+        self.assertNotIn('DISTINCT', sql)
+
+
+class OrganizerEventsTest(APITestCase):
+    """Test the paginated, filtered /api/organizers/{id}/events/"""
+
+    def setUp(self):
+        cache.clear()
+        self.organizer = Organizer.objects.create(name='Bieszczadzki Dom Kultury')
+        self.upcoming = [
+            create_event(f'Koncert {day}', days=(day,), images=1, organizer=self.organizer)
+            for day in (3, 1, 2)
+        ]
+        self.past = [
+            create_event(f'Wystawa {day}', days=(day,), images=0, organizer=self.organizer)
+            for day in (-5, -1, -3)
+        ]
+        create_event('Inny', days=(1,), images=0, organizer=Organizer.objects.create(name='Inny'))
+        self.url = f'/api/organizers/{self.organizer.pk}/events/'
+
+    def titles(self, response):
+        return [row['title']['pl'] for row in response.data['results']]
+
+    def test_upcoming_by_next_occurrence(self):
+        with self.assertNumQueries(2):  # organizer, events with their main images
+            response = self.client.get(self.url, {'upcoming': 'true'})
+        self.assertEqual(self.titles(response), ['Koncert 1', 'Koncert 2', 'Koncert 3'])
+        self.assertIsNone(response.data['next'])
+
+    def test_past_latest_first_paginated(self):
+        response = self.client.get(self.url, {'past': 'true', 'page_size': 2})
+        self.assertEqual(self.titles(response), ['Wystawa -1', 'Wystawa -3'])
+        response = self.client.get(response.data['next'])
+        self.assertEqual(self.titles(response), ['Wystawa -5'])
+        self.assertIsNone(response.data['next'])
+        response = self.client.get(response.data['previous'])
+        self.assertEqual(self.titles(response), ['Wystawa -1', 'Wystawa -3'])
+
+    def test_all_events_and_filters(self):
+        response = self.client.get(self.url, {'page_size': 10})
+        self.assertEqual(len(response.data['results']), 6)
+        response = self.client.get(self.url, {'search': 'wystawa'})
+        self.assertEqual(len(response.data['results']), 3)
+
+    def test_first_page_is_cached(self):
+        self.assertEqual(self.client.get(self.url)['X-Cache'], 'MISS')
+        with self.assertNumQueries(0):
+            self.assertEqual(self.client.get(self.url)['X-Cache'], 'HIT')
+
+
+class EventBatchTest(APITestCase):
+    """Test /api/events/batch/ and slug lookups"""
+
+    def setUp(self):
+        cache.clear()
+        self.events = [create_event(f'Koncert {day}', days=(day,), images=1) for day in (2, 1, 3)]
+
+    def test_batch_by_ids_and_slugs(self):
+        first, second, third = self.events
+        with self.assertNumQueries(1):
+            response = self.client.get(
+                f'/api/events/batch/?ids={first.pk},999999,{second.pk}&slugs={third.slug},nie-ma'
+            )
+        self.assertEqual([row['id'] for row in response.data['results']], [second.pk, first.pk, third.pk])
+        self.assertEqual(response.data['missing_ids'], [999999])
+        self.assertEqual(response.data['missing_slugs'], ['nie-ma'])
+
+    def test_detail_shape_and_fields(self):
+        response = self.client.get(
+            f'/api/events/batch/?ids={self.events[0].pk}&slugs={self.events[1].slug}&shape=detail&fields=id,event_dates'
+        )
+        self.assertEqual([list(row) for row in response.data['results']], [['id', 'event_dates']] * 2)
+        self.assertEqual(response.data['missing_slugs'], [])
+
+    def test_id_order_shares_cache_entry(self):
+        first, second, _ = self.events
+        self.assertEqual(self.client.get(f'/api/events/batch/?ids={first.pk},{second.pk}')['X-Cache'], 'MISS')
+        self.assertEqual(self.client.get(f'/api/events/batch/?ids={second.pk},{first.pk}')['X-Cache'], 'HIT')
+
+    def test_invalid_batches(self):
+        for query in ('', 'ids=1,abc', 'ids=' + ','.join(map(str, range(1, 102)))):
+            with self.subTest(query=query):
+                response = self.client.get(f'/api/events/batch/?{query}')
+                self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_retrieve_by_slug(self):
+        event = self.events[0]
+        response = self.client.get(f'/api/events/{event.slug}/')
+        self.assertEqual(response.data['id'], event.pk)
+        self.assertEqual(self.client.get('/api/events/nie-ma/').status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_retrieve_numeric_slug(self):
+        event = create_event('2024', images=0)
+        slug = str(Event.objects.order_by('-pk').values_list('pk', flat=True).first() + 1000)
+        Event.objects.filter(pk=event.pk).update(slug=slug)
+        self.assertEqual(self.client.get(f'/api/events/{slug}/').data['id'], event.pk)
+        # Ids win over slugs
+        other = self.events[0]
+        Event.objects.filter(pk=event.pk).update(slug=str(other.pk))
+        cache.clear()
+        self.assertEqual(self.client.get(f'/api/events/{other.pk}/').data['id'], other.pk)
+
+
+class OccurrenceTest(APITestCase):
+    """Test the /api/occurrences/ agenda feed"""
+
+    def setUp(self):
+        cache.clear()
+        self.hall = Location.objects.create(
+            name='Hala', city='Ustrzyki Dolne', latitude='49.4300000', longitude='22.5900000'
+        )
+        self.square = Location.objects.create(
+            name='Rynek', city='Lesko', latitude='49.4700000', longitude='22.3300000'
+        )
+        self.festival = create_event('Festiwal', days=(1, 2, 3, 10), images=1, location=self.hall)
+        self.concert = create_event('Koncert', days=(2,), images=0, category=Event.CONCERT)
+        EventDate.objects.filter(event=self.concert).update(location=self.square)
+        Image.objects.update(image='gallery/festiwal.jpg')
+
+    def test_one_row_per_date_in_constant_queries(self):
+        with self.assertNumQueries(2):  # dates with locations, their events with main images
+            response = self.client.get('/api/occurrences/?lang=en')
+        results = response.data['results']
+        festival, concert = self.festival.pk, self.concert.pk
+        self.assertEqual(
+            [row['event']['id'] for row in results], [festival, festival, concert, festival, festival]
+        )
+        self.assertEqual(results[0]['event']['title'], {'en': 'Festiwal'})
+        self.assertTrue(results[0]['event']['image'].endswith('gallery/festiwal.jpg'))
+        self.assertEqual(results[0]['location']['name'], 'Hala')
+        self.assertEqual(results[2]['location']['city'], 'Lesko')
+
+    def test_range_geo_and_event_filters(self):
+        today = timezone.localdate()
+        url = f'/api/occurrences/?dateFrom={today + timedelta(days=2)}&dateTo={today + timedelta(days=3)}'
+        response = self.client.get(url)
+        self.assertEqual(len(response.data['results']), 3)
+
+        response = self.client.get('/api/occurrences/?city=Lesko')
+        self.assertEqual([row['event']['id'] for row in response.data['results']], [self.concert.pk])
+        response = self.client.get('/api/occurrences/?lat=49.43&lng=22.59&radius=5')
+        self.assertEqual({row['event']['id'] for row in response.data['results']}, {self.festival.pk})
+        response = self.client.get(f'/api/occurrences/?event={self.festival.pk}&category=CONCERT')
+        self.assertEqual(response.data['results'], [])
+
+    def test_keyset_pagination(self):
+        response = self.client.get('/api/occurrences/?page_size=2')
+        seen = [row['id'] for row in response.data['results']]
+        while response.data['next']:
+            response = self.client.get(response.data['next'])
+            seen += [row['id'] for row in response.data['results']]
+        expected = list(EventDate.objects.order_by('start_date', 'id').values_list('id', flat=True))
+        self.assertEqual(seen, expected)
+
+
+class EventFacetTest(APITestCase):
+    """Test /api/events/facets/ counts"""
+
+    def setUp(self):
+        cache.clear()
+        lesko = Location.objects.create(name='Rynek', city='Lesko')
+        sanok = Location.objects.create(name='Zamek', city='Sanok')
+        create_event('Koncert', days=(0.1, 3), images=0, location=lesko, category=Event.CONCERT)
+        create_event(
+            'Jazz', days=(1,), images=0, location=sanok, category=Event.CONCERT, price_type=Event.PAID
+        )
+        create_event('Wystawa', days=(40,), images=0, location=lesko, category=Event.CULTURAL)
+        create_event('Archiwum', days=(-10,), images=0, location=lesko, category=Event.CULTURAL)
+
+    def counts(self, data, facet):
+        return {item['value']: item['count'] for item in data[facet]}
+
+    def test_counts_in_one_query(self):
+        with self.assertNumQueries(1):
+            response = self.client.get('/api/events/facets/')
+        data = response.data
+        self.assertEqual(data['total'], 3)  # past events don't count
+        self.assertEqual(self.counts(data, 'category'), {Event.CONCERT: 2, Event.CULTURAL: 1})
+        self.assertEqual(self.counts(data, 'city'), {'Lesko': 2, 'Sanok': 1})
+        self.assertEqual(self.counts(data, 'price_type'), {Event.FREE: 2, Event.PAID: 1})
+        self.assertEqual(list(self.counts(data, 'day'))[-1], 'later')
+
+    def test_facets_ignore_their_own_filter(self):
+        data = self.client.get('/api/events/facets/?category=CONCERT&city=Lesko').data
+        self.assertEqual(data['total'], 1)
+        # Other categories in Lesko, other cities among concerts
+        self.assertEqual(self.counts(data, 'category'), {Event.CONCERT: 1, Event.CULTURAL: 1})
+        self.assertEqual(self.counts(data, 'city'), {'Lesko': 1, 'Sanok': 1})
+        self.assertEqual(self.counts(data, 'price_type'), {Event.FREE: 1})
+
+    def test_normalized_filters_share_cache_entry(self):
+        url = '/api/events/facets/?category='
+        self.assertEqual(self.client.get(url + 'CONCERT,CULTURAL')['X-Cache'], 'MISS')
+        self.assertEqual(self.client.get(url + 'CULTURAL,CONCERT')['X-Cache'], 'HIT')
+
+
+class EventBulkImportTest(TestCase):
+    """Test EventImporter(bulk=True) against the record-by-record import"""
+
+    def setUp(self):
+        cache.clear()
+        self.organizer = Organizer.objects.create(name='BDK')
+        self.rynek = Location.objects.create(name='Rynek', city='Lesko')
+        self.existing = Event.objects.create(title_pl='Jarmark', organizer=self.organizer)
+        EventDate.objects.create(
+            event=self.existing, location=self.rynek, start_date=self.start('2030-06-01T10:00:00')
+        )
+
+    def start(self, value):
+        return EventImporter().parse_date(value)
+
+    def payload(self):
+        return [
+            {
+                'title_pl': 'Jarmark',  # all dates exist
+                'dates': [{'start_date': '2030-06-01T10:00:00', 'location': {'name': 'Rynek', 'city': 'Lesko'}}],
+            },
+            {
+                'title_pl': 'Jarmark',  # new date at a new location
+                'description_pl': '<p>Rękodzieło</p>',
+                'dates': [
+                    {'start_date': '2030-06-01T10:00:00', 'location': {'name': 'Rynek', 'city': 'Lesko'}},
+                    {'start_date': '2030-06-02T10:00:00', 'location': {'name': 'Zamek', 'city': 'Sanok'}},
+                ],
+            },
+            {
+                'title_pl': 'Koncert w cerkwi',
+                'category': 'CONCERT',
+                'organizer_name': 'BDK',
+                'dates': [{'start_date': '2030-07-01T19:00:00', 'location': {'name': 'Zamek', 'city': 'Sanok'}}],
+            },
+            {
+                'title_pl': 'Rajd',
+                'category': 'UNKNOWN',
+                'organizer_name': 'PTTK Ustrzyki',
+                'dates': [{'start_date': '2030-08-01T08:00:00', 'end_date': 'jutro'}],
+            },
+            {'title_pl': 'Bez dat', 'dates': []},
+            {'description_pl': 'Bez tytułu', 'dates': [{'start_date': '2030-01-01T10:00:00'}]},
+        ]
+
+    def snapshot(self, result):
+        events = {
+            event.slug: (
+                event.title_pl, event.category, event.description_pl,
+                event.organizer.name if event.organizer else None,
+                event.first_start_date, event.last_end_date,
+                sorted(
+                    (date.start_date, date.end_date, date.location and date.location.name)
+                    for date in event.event_dates.all()
+                ),
+            )
+            for event in Event.objects.select_related('organizer').prefetch_related('event_dates__location')
+        }
+        return (
+            result.imported, result.skipped, [error['index'] for error in result.errors],
+            events, Organizer.objects.count(), Location.objects.count(),
+        )
+
+    def test_matches_record_import(self):
+        with transaction.atomic():
+            expected = self.snapshot(EventImporter().import_from_json(self.payload()))
+            transaction.set_rollback(True)
+
+        result = EventImporter(bulk=True, chunk_size=4).import_from_json(self.payload())
+        self.assertEqual(self.snapshot(result), expected)
+        self.assertEqual((result.imported, result.skipped), (3, 1))
+        self.assertEqual(
+            list(Event.objects.search('rękodzieło').values_list('slug', flat=True)), ['jarmark']
+        )
+
+    def test_queries_per_chunk_are_fixed(self):
+        def import_events(count, prefix):
+            records = [
+                {
+                    'title_pl': f'{prefix} {i}',
+                    'organizer_name': f'{prefix} organizator {i}',
+                    'dates': [
+                        {'start_date': f'2030-01-{day:02d}T19:00:00',
+                         'location': {'name': f'{prefix} {i}', 'city': 'Lesko'}}
+                        for day in (1, 2, 3)
+                    ],
+                }
+                for i in range(count)
+            ]
+            with CaptureQueriesContext(connection) as queries:
+                result = EventImporter(bulk=True, chunk_size=count).import_from_json(records)
+            self.assertEqual(result.imported, count)
+            return len(queries)
+
+        self.assertEqual(import_events(3, 'Mało'), import_events(30, 'Dużo'))
+        self.assertEqual(EventDate.objects.filter(location__city='Lesko').count(), 1 + 99)
+
+    def test_failed_chunk_reports_only_bad_records(self):
+        records = [
+            {'title_pl': 'Dobry', 'dates': [{'start_date': '2030-01-01T10:00:00'}]},
+            {'title_pl': 'Zły', 'dates': [{'start_date': '2030-01-01T10:00:00',
+                                           'location': {'name': 'x' * 300, 'city': 'Lesko'}}]},
+            {'title_pl': 'Następny', 'dates': [{'start_date': '2030-01-01T10:00:00'}]},
+        ]
+        result = EventImporter(bulk=True, chunk_size=2).import_from_json(records)
+        # The chunk falls back to one savepoint per record: only the bad one fails
+        self.assertEqual([error['index'] for error in result.errors], [1])
+        self.assertEqual(result.imported, 2)
+        self.assertTrue(Event.objects.filter(slug='dobry').exists())
+        self.assertFalse(Event.objects.filter(slug='zly').exists())
+        self.assertTrue(Event.objects.filter(slug='nastepny').exists())
+
+    def test_error_details_are_capped(self):
+        records = [{'title_pl': f'Bez dat {i}'} for i in range(ImportResult.MAX_ERRORS + 20)]
+        result = EventImporter(bulk=True, chunk_size=50).import_from_json(records)
+        self.assertEqual(result.error_count, ImportResult.MAX_ERRORS + 20)
+        self.assertEqual(len(result.errors), ImportResult.MAX_ERRORS)
+        self.assertEqual(result.errors[-1]['index'], ImportResult.MAX_ERRORS - 1)
+
+    def test_streamed_file_reports_offsets(self):
+        raw = (
+            '{"title_pl": "Rajd", "dates": [{"start_date": "2030-01-01T10:00:00"}]}\n'
+            '{"title_pl": "Bez dat"}\n'
+            '{"title_pl": "Źle\n'
+        ).encode('utf-8')
+        with tempfile.NamedTemporaryFile(suffix='.ndjson') as file:
+            file.write(raw)
+            file.flush()
+            result = EventImporter(bulk=True, chunk_size=2).import_from_file(file.name)
+        self.assertEqual(result.imported, 1)
+        self.assertEqual(
+            [(error['index'], error['offset']) for error in result.errors],
+            [(1, raw.index(b'{"title_pl": "Bez')), (2, raw.index(b'{"title_pl": "\xc5\xb9'))],
+        )
+
+
+class ImportFingerprintTest(TestCase):
+    """Test that re-imports write only what changed"""
+
+    record = {
+        'title_pl': 'Festiwal Połonin',
+        'title_en': 'Meadows Festival',
+        'description_pl': '<p>Muzyka w górach</p>',
+        'price_amount': 12.99,
+        'organizer_name': 'BDK',
+        'dates': [{'start_date': '2030-07-01T18:00:00', 'location': {'name': 'Rynek', 'city': 'Lesko'}}],
+    }
+
+    def writes(self, importer, records):
+        with CaptureQueriesContext(connection) as queries:
+            result = importer.import_from_json(records)
+        return result, [
+            query['sql'] for query in queries.captured_queries
+            if query['sql'].startswith(('INSERT', 'UPDATE', 'DELETE'))
+        ]
+
+    def test_unchanged_records_write_nothing(self):
+        for bulk in (False, True):
+            with self.subTest(bulk=bulk):
+                EventImporter(bulk=bulk).import_from_json([self.record])
+                updated_at = Event.objects.get().updated_at
+                # Same content, other key order
+                result, writes = self.writes(EventImporter(bulk=bulk), [dict(reversed(self.record.items()))])
+                self.assertEqual((result.imported, result.skipped), (0, 1))
+                self.assertEqual(writes, [])
+                self.assertEqual(Event.objects.get().updated_at, updated_at)
+                Event.objects.all().delete()
+
+    def test_changed_records_update_dirty_fields(self):
+        for bulk in (False, True):
+            with self.subTest(bulk=bulk):
+                EventImporter(bulk=bulk).import_from_json([self.record])
+                result, writes = self.writes(
+                    EventImporter(bulk=bulk), [{**self.record, 'title_en': 'Festival of Meadows'}]
+                )
+                self.assertEqual(result.imported, 1)
+                event_updates = [sql for sql in writes if sql.startswith('UPDATE "events_event" SET "title_en"')]
+                self.assertEqual(len(event_updates), 1)
+                self.assertNotIn('"description_pl"', event_updates[0])
+                self.assertNotIn('"price_amount"', event_updates[0])
+                self.assertEqual(Event.objects.get().title_en, 'Festival of Meadows')
+                Event.objects.all().delete()
+
+    def test_new_fingerprint_without_changes_is_stored(self):
+        EventImporter().import_from_json([self.record])
+        # Only a date's note differs: not an event field, the date already exists
+        record = {**self.record, 'dates': [{**self.record['dates'][0], 'notes': 'Wstęp wolny'}]}
+        result, writes = self.writes(EventImporter(bulk=True), [record])
+        self.assertEqual((result.imported, result.skipped), (0, 1))
+        self.assertEqual(len(writes), 1)
+        self.assertTrue(writes[0].startswith('UPDATE "events_event" SET "import_fingerprint"'))
+
+
+class SlugAllocationTest(TestCase):
+    """Test that new slugs are allocated with one query"""
+
+    def setUp(self):
+        Event.objects.create(title_pl='Koncert')
+        Event.objects.create(title_pl='Koncert')
+        Event.objects.create(title_pl='Koncert jazzowy')
+
+    def test_allocate_slugs(self):
+        with self.assertNumQueries(1):
+            slugs = Event.objects.allocate_slugs(['koncert', 'koncert', 'warsztaty', 'koncert-jazzowy'])
+        self.assertEqual(slugs, ['koncert-2', 'koncert-3', 'warsztaty', 'koncert-jazzowy-1'])
+        self.assertEqual(Event.objects.allocate_slugs([]), [])
+
+    def test_save_takes_next_free_slug(self):
+        for _ in range(5):
+            Event.objects.create(title_pl='Koncert')
+        event = Event(title_pl='Koncert')
+        # Slug allocation, savepoint, insert, search vectors
+        with CaptureQueriesContext(connection) as queries:
+            event.save()
+        self.assertEqual(event.slug, 'koncert-7')
+        self.assertEqual(len([q for q in queries if q['sql'].startswith('SELECT')]), 1)
+
+    def test_save_allocates_again_after_conflict(self):
+        event = Event(title_pl='Koncert')
+        original = Event.objects.allocate_slugs
+
+        def stale(bases):
+            # A concurrent save took the slug after this allocation
+            slugs = original(bases)
+            if not Event.objects.filter(slug='koncert-2').exists():
+                Event.objects.create(title_pl='Koncert', slug='koncert-2')
+            return slugs
+
+        Event.objects.allocate_slugs = stale
+        try:
+            event.save()
+        finally:
+            del Event.objects.allocate_slugs
+        self.assertEqual(event.slug, 'koncert-3')
+        self.assertEqual(Event.objects.filter(slug__startswith='koncert-').count(), 4)
+
+    def test_bulk_import_keeps_event_identity(self):
+        # Known titles update their event, new ones get their base slug
+        result = EventImporter(bulk=True).import_from_json([
+            {'title_pl': 'Koncert', 'title_en': 'Concert', 'dates': [{'start_date': '2030-07-01T18:00:00'}]},
+            {'title_pl': 'Warsztaty', 'dates': [{'start_date': '2030-07-02T10:00:00'}]},
+        ])
+        self.assertEqual(result.imported, 2)
+        self.assertEqual(Event.objects.get(slug='koncert').title_en, 'Concert')
+        self.assertTrue(Event.objects.filter(slug='warsztaty').exists())
+        self.assertEqual(Event.objects.count(), 4)
+
+    def test_bulk_import_matches_concurrently_created_event(self):
+        importer = EventImporter(bulk=True)
+        resolve_organizer = importer.resolve_organizer
+
+        def concurrent_insert(*args):
+            # Another import creates the event after this chunk's preload
+            if not Event.objects.filter(slug='warsztaty').exists():
+                Event.objects.create(title_pl='Warsztaty')
+            return resolve_organizer(*args)
+
+        importer.resolve_organizer = concurrent_insert
+        result = importer.import_from_json([
+            {'title_pl': 'Warsztaty', 'title_en': 'Workshop', 'dates': [{'start_date': '2030-07-02T10:00:00'}]},
+        ])
+        self.assertEqual((result.imported, result.errors), (1, []))
+        self.assertEqual(Event.objects.get(slug='warsztaty').title_en, 'Workshop')
+        self.assertFalse(Event.objects.filter(slug__startswith='warsztaty-').exists())
+
+
+@override_settings(MEDIA_ROOT=tempfile.mkdtemp())
+class ImportJobTest(TestCase):
+    """Test background import jobs submitted from the admin"""
+
+    def setUp(self):
+        cache.clear()
+        admin = get_user_model().objects.create_superuser('admin', password='haslo')
+        self.client.force_login(admin)
+        self.upload = SimpleUploadedFile('wydarzenia.ndjson', (
+            b'{"title_pl": "Rajd", "dates": [{"start_date": "2030-01-01T10:00:00"}]}\n'
+            b'{"title_pl": "Bez dat"}\n'
+        ))
+
+    def test_upload_returns_before_import(self):
+        response = self.client.post('/admin/events/event/import/json/', {'json_file': self.upload})
+        job = ImportJob.objects.get()
+        self.assertRedirects(response, f'/admin/events/event/import/jobs/{job.pk}/')
+        self.assertEqual((job.status, job.file_name), (ImportJob.PENDING, 'wydarzenia.ndjson'))
+        self.assertFalse(Event.objects.exists())
+
+        self.assertEqual(import_jobs.run_pending(), 1)
+        data = self.client.get(f'/admin/events/event/import/jobs/{job.pk}/status/').json()
+        self.assertEqual(data['status'], ImportJob.DONE)
+        self.assertEqual(
+            (data['processed'], data['imported'], data['error_count'], data['percent']), (2, 1, 1, 100)
+        )
+        self.assertEqual(data['errors'][0]['offset'], self.upload.size - len(b'{"title_pl": "Bez dat"}\n'))
+        self.assertTrue(Event.objects.filter(slug='rajd').exists())
+        self.assertContains(self.client.get(f'/admin/events/event/import/jobs/{job.pk}/'), 'wydarzenia.ndjson')
+
+    def test_progress_saved_per_batch(self):
+        job = import_jobs.submit(self.upload)
+        progress = []
+
+        def on_progress(result):
+            import_jobs.save_progress(job, result)
+            progress.append(ImportJob.objects.values_list('processed', flat=True).get(pk=job.pk))
+
+        importer = EventImporter(bulk=True, chunk_size=1, on_progress=on_progress)
+        with job.file.open('rb') as f:
+            importer.import_from_stream(f)
+        self.assertEqual(progress, [1, 2])
+
+    def test_same_file_is_imported_once(self):
+        upload = SimpleUploadedFile(
+            'rajd.ndjson', b'{"title_pl": "Rajd", "dates": [{"start_date": "2030-01-01T10:00:00"}]}\n'
+        )
+        first = import_jobs.submit(upload)
+        import_jobs.run_pending()
+        upload.seek(0)
+        second = import_jobs.submit(upload)
+        self.assertEqual(second.checksum, first.checksum)
+
+        with CaptureQueriesContext(connection) as queries:
+            import_jobs.run_pending()
+        self.assertFalse([q for q in queries.captured_queries if 'INSERT INTO "events_event' in q['sql']])
+        second.refresh_from_db()
+        self.assertEqual((second.status, second.processed), (ImportJob.DONE, 0))
+        self.assertIn(f'#{first.pk}', second.message)
+
+    def test_file_imported_with_errors_runs_again(self):
+        first = import_jobs.submit(self.upload)
+        import_jobs.run_pending()
+        first.refresh_from_db()
+        self.assertEqual((first.status, first.error_count), (ImportJob.DONE, 1))
+
+        self.upload.seek(0)
+        second = import_jobs.submit(self.upload)
+        import_jobs.run_pending()
+        second.refresh_from_db()
+        self.assertEqual((second.status, second.processed), (ImportJob.DONE, 2))
+        self.assertEqual((second.skipped, second.error_count), (1, 1))
+        self.assertEqual(second.message, '')
+
+    def test_workers_skip_claimed_jobs(self):
+        running = import_jobs.submit(self.upload)
+        ImportJob.objects.filter(pk=running.pk).update(status=ImportJob.RUNNING, updated_at=timezone.now())
+        self.assertIsNone(import_jobs.claim_next())
+
+    def test_job_of_stopped_worker_is_claimed_again(self):
+        job = import_jobs.submit(self.upload)
+        self.assertEqual(import_jobs.claim_next(), job)
+        # The worker stopped after one batch
+        stopped = timezone.now() - import_jobs.STALE_AFTER - timedelta(minutes=1)
+        ImportJob.objects.filter(pk=job.pk).update(processed=1, updated_at=stopped)
+
+        self.assertEqual(import_jobs.run_pending(), 1)
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.attempts, job.processed), (ImportJob.DONE, 2, 2))
+        self.assertTrue(Event.objects.filter(slug='rajd').exists())
+
+    def test_job_stopping_workers_fails(self):
+        job = import_jobs.submit(self.upload)
+        stopped = timezone.now() - import_jobs.STALE_AFTER - timedelta(minutes=1)
+        ImportJob.objects.filter(pk=job.pk).update(
+            status=ImportJob.RUNNING, attempts=ImportJob.MAX_ATTEMPTS, updated_at=stopped
+        )
+        self.assertIsNone(import_jobs.claim_next())
+        job.refresh_from_db()
+        self.assertEqual(job.status, ImportJob.FAILED)
+        self.assertTrue(job.message)
+        self.assertTrue(job.is_finished)
+
+    def test_unreadable_file_fails_job(self):
+        job = import_jobs.submit(self.upload)
+        job.file.storage.delete(job.file.name)
+        import_jobs.run_pending()
+        job.refresh_from_db()
+        self.assertEqual(job.status, ImportJob.FAILED)
+        self.assertTrue(job.message)
+        self.assertIsNotNone(job.finished_at)
+
+
+class JSONStreamTest(SimpleTestCase):
+    """Test streamed reading of JSON arrays and NDJSON"""
+
+    def records(self, raw, read_size=3):
+        return list(iter_records(BytesIO(raw), read_size))
+
+    def test_array_records_with_byte_offsets(self):
+        raw = '\ufeff[ {"title_pl": "Źródło"},\n  {"title_pl": "Połonina", "n": 1234567} ]'.encode('utf-8')
+        records = self.records(raw)
+        self.assertEqual([record.data['title_pl'] for record in records], ['Źródło', 'Połonina'])
+        self.assertEqual(records[1].data['n'], 1234567)  # not cut at a block boundary
+        for record in records:
+            self.assertTrue(raw[record.offset:].startswith(b'{"title_pl"'))
+
+    def test_array_stops_at_syntax_error(self):
+        records = self.records(b'[{"a": 1}, {"b": }, {"c": 3}]')
+        self.assertEqual([(record.index, record.offset) for record in records], [(0, 1), (1, 11)])
+        self.assertIsNone(records[1].data)
+        self.assertIn('Invalid JSON', records[1].error)
+
+    def test_ndjson_skips_invalid_lines(self):
+        records = self.records(b'{"a": "\xc5\xbb"}\n\n{oops}\n{"c": 3}')
+        self.assertEqual([(record.index, record.offset) for record in records], [(0, 0), (1, 13), (2, 20)])
+        self.assertEqual([record.data for record in records], [{'a': 'Ż'}, None, {'c': 3}])
+        self.assertIn('Invalid JSON', records[1].error)
+
+    def test_other_top_level_values(self):
+        self.assertEqual(self.records(b'[]'), [])
+        self.assertEqual(self.records(b'"text"')[0].error, 'JSON data must be an array or NDJSON')
+
+    def test_array_elements_across_blocks(self):
+        raw = b'[{"s": "a\\\\\\"]}", "l": [1, [2, {"x": "["}]]}, "z", 2.5e3, null]'
+        records = self.records(raw, read_size=1)
+        self.assertEqual(
+            [record.data for record in records],
+            [{'s': 'a\\"]}', 'l': [1, [2, {'x': '['}]]}, 'z', 2500.0, None],
+        )
+        self.assertIn('unexpected end', self.records(b'[1,')[-1].error)
+
+    @mock.patch('apps.events.services.json_stream.MAX_RECORD_SIZE', 20)
+    def test_oversized_records(self):
+        big = b'{"b": "' + b'x' * 40 + b'"}'
+        records = self.records(b'{"a": 1}\n' + big + b'\n{"c": 3}\n', read_size=4)
+        self.assertEqual([(record.index, record.offset) for record in records], [(0, 0), (1, 9), (2, 59)])
+        self.assertEqual([record.data for record in records], [{'a': 1}, None, {'c': 3}])
+        self.assertIn('larger than', records[1].error)
+
+        records = self.records(b'[{"a": 1}, ' + big + b', {"c": 3}]', read_size=4)
+        self.assertEqual([record.data for record in records], [{'a': 1}, None])
+        self.assertIn('larger than', records[1].error)
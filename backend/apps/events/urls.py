@@ -1,11 +1,13 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
-from .views import EventViewSet, OrganizerViewSet
+from .views import EventViewSet, OrganizerViewSet, OccurrenceViewSet, EventTileView
 
 router = DefaultRouter()
 router.register(r'events', EventViewSet, basename='event')
 router.register(r'organizers', OrganizerViewSet, basename='organizer')
+router.register(r'occurrences', OccurrenceViewSet, basename='occurrence')
 
 urlpatterns = [
     path('', include(router.urls)),
+    path('tiles/<int:z>/<int:x>/<int:y>.mvt', EventTileView.as_view(), name='event-tile'),
 ]
\ No newline at end of file
@@ -1,28 +1,102 @@
 from django.shortcuts import render
 from django.contrib.admin.views.decorators import staff_member_required
 from django.contrib import messages
-from django.http import HttpResponseRedirect
+from django.http import HttpResponseRedirect, JsonResponse
 from django.urls import reverse
+from django.core.cache import cache
+from django.db.models import F, Prefetch, Q
+from django.shortcuts import get_object_or_404
 from rest_framework import viewsets
 from rest_framework.decorators import action
+from rest_framework.filters import OrderingFilter
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.views import APIView
 from rest_framework.response import Response
-from .models import Event, Organizer, EventDate
-from .services import EventImporter
+from apps.common import response_cache, sparse_fields
+from apps.common.response_cache import CachedResponseMixin, cache_response
+from .filters import EventFilterBackend, EventSearchFilter, OccurrenceFilterBackend
+from .list_rows import EventListRows
+from .models import Event, Organizer, EventDate, ImportJob
+from .models.querysets import TRANSLATED_FIELDS
+from .pagination import EventCursorPagination, OccurrenceCursorPagination, event_cursor_pagination
+from .renderers import MVTRenderer
+from .services import event_map, import_jobs, vector_tiles
+from .services.facets import build_facets
 from .serializers import (
     EventSerializer,
     EventListSerializer,
     OrganizerSerializer,
     OrganizerListSerializer,
     EventDateSerializer,
+    OccurrenceSerializer,
 )
 
 
-class EventViewSet(viewsets.ModelViewSet):
+def plan_events(queryset, request, serializer_class):
+    """
+    Query plan for the events rendered by serializer_class: the full plan
+    of the serializer, or only what the ?fields= / ?omit= selection needs,
+    with translated fields projected to ?lang= for reads.
+    """
+    fields = sparse_fields.selected_fields(request, serializer_class.Meta.fields)
+    if fields is not None:
+        queryset = queryset.for_fields(sparse_fields.requirements(serializer_class, fields))
+    elif serializer_class is EventListSerializer:
+        queryset = queryset.for_list()
+    else:
+        queryset = queryset.for_detail()
+
+    if request.method in SAFE_METHODS:
+        # ?lang= loads only that language's title/description
+        rendered = serializer_class.Meta.fields if fields is None else fields
+        queryset = queryset.for_language(
+            request.query_params.get('lang', '').lower(),
+            [name for name in TRANSLATED_FIELDS if name in rendered],
+        )
+    return queryset
+
+
+def list_event_rows(view, queryset):
+    """
+    EventListSerializer output for an events queryset through EventListRows,
+    paginated by the view's paginator
+    """
+    request = view.request
+    rows = EventListRows(
+        sparse_fields.selected_fields(request, EventListSerializer.Meta.fields),
+        request.query_params.get('lang', '').lower(),
+    )
+    if isinstance(view.paginator, EventCursorPagination):
+        rows.select(view.paginator.date_field)
+    queryset = rows.values(queryset)
+
+    page = view.paginate_queryset(queryset)
+    if page is not None:
+        return view.get_paginated_response(rows.to_representation(page))
+    return Response(rows.to_representation(queryset))
+
+
+# Models whose rows appear in event and organizer payloads; a change to any
+# of them invalidates the cached responses
+EVENT_CACHE_MODELS = (
+    'events.event', 'events.eventdate', 'events.eventimage',
+    'events.location', 'events.organizer', 'gallery.image',
+)
+
+
+class EventViewSet(CachedResponseMixin, viewsets.ModelViewSet):
     """
     A viewset for viewing and editing Event instances.
+    Anonymous list/retrieve responses are cached (apps/common/response_cache.py).
     """
     queryset = Event.objects.all()
     serializer_class = EventSerializer
+    cache_models = EVENT_CACHE_MODELS
+    # /batch/?ids=3,1 and ?ids=1,3 (or category=A,B and B,A) share a cache entry
+    cache_set_params = ('ids', 'slugs', 'category', 'price_type', 'moderation_status')
+    filter_backends = [EventSearchFilter, OrderingFilter, EventFilterBackend]
+    batch_max_size = 100
 
     def get_serializer_class(self):
         """Use lighter serializer for list view"""
@@ -30,21 +104,141 @@ class EventViewSet(viewsets.ModelViewSet):
             return EventListSerializer
         return EventSerializer
 
+    @property
+    def paginator(self):
+        """
+        Page-number pagination by default; keyset pagination on
+        (next occurrence, id) with ?pagination=cursor or ?cursor=...
+        """
+        if not hasattr(self, '_paginator'):
+            if EventCursorPagination.is_requested(self.request):
+                self._paginator = event_cursor_pagination(self.request)
+            else:
+                self._paginator = self.pagination_class() if self.pagination_class else None
+        return self._paginator
+
     def get_queryset(self):
-        """Optimize queryset with prefetch_related"""
-        queryset = Event.objects.all()
-        if self.action == 'list':
-            queryset = queryset.select_related('organizer').prefetch_related('event_dates')
-        return queryset
+        """Optimize queryset with the prefetch plan of the serializer in use"""
+        return plan_events(Event.objects.all(), self.request, self.get_serializer_class())
+
+    def get_object(self):
+        """
+        Look events up by id, or by slug (/api/events/{slug}/): numeric keys
+        try the id first, so all-digit slugs ("2024") stay reachable
+        """
+        key = self.kwargs[self.lookup_url_kwarg or self.lookup_field]
+        queryset = self.filter_queryset(self.get_queryset())
+        event = queryset.filter(pk=key).first() if key.isdigit() else None
+        if event is None:
+            event = get_object_or_404(queryset, slug=key)
+        self.check_object_permissions(self.request, event)
+        return event
+
+    @cache_response
+    def list(self, request, *args, **kwargs):
+        """
+        List through EventListRows: same output as EventListSerializer,
+        built from one .values() query without per-field serializer work
+        """
+        return list_event_rows(self, self.filter_queryset(Event.objects.all()))
+
+    @action(detail=False, methods=['get'], url_path='map')
+    @cache_response
+    def map_clusters(self, request):
+        """
+        Clustered event pins for the map view.
+        URL: /api/events/map/?bbox=west,south,east,north&zoom=10 (+ list filters)
+
+        Returns grid clusters with counts and a representative event, or
+        individual pins from zoom 14 on. The bbox is aligned to the tile
+        grid and the data is cached per aligned bbox, zoom, filters and
+        data versions, so nearby viewports share it; responses get the
+        usual ETag and cache entry (cache_response).
+        """
+        bbox = event_map.parse_bbox(request.query_params.get('bbox'))
+        if bbox is None:
+            raise ValidationError({'bbox': 'Expected bbox=west,south,east,north'})
+        zoom = event_map.parse_zoom(request.query_params.get('zoom'))
+        bbox = event_map.align_bbox(bbox, zoom)
+
+        versions = response_cache.get_versions(self.cache_models)
+        cache_key = event_map.cache_key(request.query_params, bbox, zoom, versions)
+        data = cache.get(cache_key)
+        if data is None:
+            events = self.filter_queryset(Event.objects.all())
+            lang = request.query_params.get('lang', 'pl').lower()
+            data = event_map.build_map(events, bbox, zoom, lang)
+            cache.set(cache_key, data, event_map.CACHE_TIMEOUT)
+        return Response(data)
+
+    @action(detail=False, methods=['get'])
+    @cache_response
+    def facets(self, request):
+        """
+        Counts for the filter panel, in one query.
+        URL: /api/events/facets/ (+ list filters)
+
+        Events per category, price_type, city and day (today, tomorrow,
+        week, month, later) over upcoming occurrences. Each facet applies
+        all active filters but its own; total applies all of them.
+        """
+        return Response(build_facets(request.query_params))
 
+    @action(detail=False, methods=['get'])
+    @cache_response
+    def batch(self, request):
+        """
+        Several events in one request, e.g. favorites or a shared itinerary.
+        URL: /api/events/batch/?ids=12,7,31 and/or ?slugs=a,b (+ lang, fields)
+
+        Returns the events found in list shape (?shape=detail for the full
+        one) ordered by next occurrence, and the requested ids and slugs
+        that don't exist in missing_ids / missing_slugs. At most
+        batch_max_size ids and slugs together.
+        """
+        ids = set(sparse_fields.parse_names(request.query_params.get('ids')))
+        slugs = set(sparse_fields.parse_names(request.query_params.get('slugs')))
+        if not ids and not slugs:
+            raise ValidationError({'ids': 'Expected ids=1,2,3 and/or slugs=a,b'})
+        if not all(pk.isdigit() for pk in ids):
+            raise ValidationError({'ids': 'Expected comma-separated event ids'})
+        if len(ids) + len(slugs) > self.batch_max_size:
+            raise ValidationError({'ids': f'At most {self.batch_max_size} events per batch'})
+
+        ids = {int(pk) for pk in ids}
+        events = Event.objects.filter(Q(pk__in=ids) | Q(slug__in=slugs))
+        if request.query_params.get('shape') == 'detail':
+            # Annotated: slug may be left out of the query by ?fields=
+            events = list(plan_events(events, request, EventSerializer).annotate(key_slug=F('slug')))
+            results = EventSerializer(events, many=True, context={'request': request}).data
+            found = [(event.pk, event.key_slug) for event in events]
+        else:
+            rows = EventListRows(
+                sparse_fields.selected_fields(request, EventListSerializer.Meta.fields),
+                request.query_params.get('lang', '').lower(),
+            )
+            rows.select('slug')
+            events = list(rows.values(events))
+            results = rows.to_representation(events)
+            found = [(row['id'], row['slug']) for row in events]
+
+        found_ids = {pk for pk, _ in found}
+        found_slugs = {slug for _, slug in found}
+        return Response({
+            'results': results,
+            'missing_ids': sorted(ids - found_ids),
+            'missing_slugs': sorted(slugs - found_slugs),
+        })
 
-class OrganizerViewSet(viewsets.ReadOnlyModelViewSet):
+
+class OrganizerViewSet(CachedResponseMixin, viewsets.ReadOnlyModelViewSet):
     """
     A viewset for viewing Organizer instances.
     Read-only API for frontend to list and retrieve organizers.
     """
     queryset = Organizer.objects.filter(is_active=True)
     serializer_class = OrganizerSerializer
+    cache_models = EVENT_CACHE_MODELS
 
     def get_serializer_class(self):
         """Use lighter serializer for list view"""
@@ -52,79 +246,153 @@ class OrganizerViewSet(viewsets.ReadOnlyModelViewSet):
             return OrganizerListSerializer
         return OrganizerSerializer
 
+    @property
+    def paginator(self):
+        """Events of an organizer use the cursor pagination of the events feed"""
+        if self.action != 'events':
+            return super().paginator
+        if not hasattr(self, '_paginator'):
+            self._paginator = event_cursor_pagination(self.request)
+        return self._paginator
+
     def get_queryset(self):
         """Optimize queryset and allow filtering"""
         queryset = Organizer.objects.filter(is_active=True)
+        if self.action == 'events':
+            # Only looked up to 404 on unknown or inactive organizers
+            return queryset.only('id')
 
-        # Add prefetch for events count
-        queryset = queryset.prefetch_related('events')
+        # Only the columns and relations of ?fields= / ?omit=
+        serializer_class = self.get_serializer_class()
+        fields = sparse_fields.selected_fields(self.request, serializer_class.Meta.fields)
+        needs = sparse_fields.requirements(serializer_class, fields or serializer_class.Meta.fields)
+        if fields is not None:
+            queryset = sparse_fields.only_columns(queryset, needs, 'id', 'name')
+
+        # Event counts in the same query
+        if 'event_counts' in needs:
+            queryset = queryset.with_event_counts()
 
         # Optional: Filter by query parameter
         has_events = self.request.query_params.get('has_events', None)
         if has_events == 'true':
-            queryset = queryset.filter(events__isnull=False).distinct()
+            queryset = queryset.with_events()
 
         return queryset.order_by('name')
 
     @action(detail=True, methods=['get'])
+    @cache_response
     def events(self, request, pk=None):
         """
-        Get all events for a specific organizer.
+        Events of an organizer, as in /api/events/: same filters (upcoming=true,
+        past=true, category, dateFrom, search...), output and cursor pagination.
+        Ordered by next occurrence, or latest first with past=true.
         URL: /api/organizers/{id}/events/
         """
         organizer = self.get_object()
-        events = organizer.events.all().order_by('-start_date')
-        serializer = EventListSerializer(events, many=True, context={'request': request})
-        return Response(serializer.data)
+        events = Event.objects.filter(organizer=organizer)
+        for backend in (EventSearchFilter, EventFilterBackend):
+            events = backend().filter_queryset(request, events, self)
+        return list_event_rows(self, events)
+
+
+class OccurrenceViewSet(CachedResponseMixin, viewsets.ReadOnlyModelViewSet):
+    """
+    Agenda / calendar feed: one row per EventDate with a compact event
+    summary and location, soonest first.
+    URL: /api/occurrences/?dateFrom=2026-07-10&dateTo=2026-07-12 (filters: see
+    OccurrenceFilterBackend), keyset-paginated on (start_date, id).
+
+    Each event is loaded once per page however many of its dates are on it.
+    """
+    serializer_class = OccurrenceSerializer
+    pagination_class = OccurrenceCursorPagination
+    filter_backends = [OccurrenceFilterBackend]
+    cache_models = EVENT_CACHE_MODELS
+
+    def get_queryset(self):
+        events = Event.objects.for_occurrences(self.request.query_params.get('lang', '').lower())
+        return EventDate.objects.select_related('location').prefetch_related(
+            Prefetch('event', queryset=events)
+        )
+
+
+class EventTileView(APIView):
+    """
+    Mapbox Vector Tile with upcoming events and their locations.
+    URL: /api/tiles/{z}/{x}/{y}.mvt (+ list filters in the query string)
+    """
+    renderer_classes = [MVTRenderer]
+
+    def get(self, request, z, x, y):
+        if not vector_tiles.is_valid_tile(z, x, y):
+            raise NotFound('Invalid tile')
+
+        cache_key = vector_tiles.cache_key(z, x, y, request.query_params)
+        tile = cache.get(cache_key)
+        if tile is None:
+            events = EventFilterBackend().filter_queryset(request, Event.objects.all(), self)
+            tile = vector_tiles.render_tile(events, z, x, y)
+            cache.set(cache_key, tile, vector_tiles.CACHE_TIMEOUT)
+
+        response = Response(tile)
+        response['Cache-Control'] = 'public, max-age=60'
+        return response
 
 
 @staff_member_required
 def import_events_json(request):
     """
     Admin view for importing events from JSON file.
-    Shows upload form and processes import.
+    Shows upload form; a posted file becomes an ImportJob run in the
+    background (manage.py run_import_jobs) and the admin goes to its progress page.
     """
     if request.method == 'POST':
         json_file = request.FILES.get('json_file')
         if json_file:
-            try:
-                # Read and parse JSON
-                json_string = json_file.read().decode('utf-8')
-
-                # Import events
-                importer = EventImporter()
-                result = importer.import_from_string(json_string)
-
-                # Build result message
-                if result.errors:
-                    error_list = '\n'.join([
-                        f"- [{e['index']}] {e['title']}: {e['error']}"
-                        for e in result.errors[:10]  # Show first 10 errors
-                    ])
-                    if len(result.errors) > 10:
-                        error_list += f"\n... i {len(result.errors) - 10} więcej błędów"
-
-                    messages.error(
-                        request,
-                        f'Import zakończony z błędami.\n'
-                        f'Zaimportowano: {result.imported}\n'
-                        f'Pominięto: {result.skipped}\n'
-                        f'Błędy:\n{error_list}'
-                    )
-                else:
-                    messages.success(
-                        request,
-                        f'Import zakończony pomyślnie!\n'
-                        f'Zaimportowano: {result.imported}\n'
-                        f'Pominięto: {result.skipped}'
-                    )
-
-            except Exception as e:
-                messages.error(request, f'Błąd podczas przetwarzania pliku: {e}')
-        else:
-            messages.error(request, 'Proszę wybrać plik JSON.')
+            job = import_jobs.submit(json_file, request.user)
+            messages.info(request, f'Plik {job.file_name} czeka na import.')
+            return HttpResponseRedirect(reverse('admin:events_event_import_job', args=[job.pk]))
 
+        messages.error(request, 'Proszę wybrać plik JSON.')
         return HttpResponseRedirect(reverse('admin:events_event_changelist'))
 
     # GET request - show upload form
     return render(request, 'admin/events/import_events_form.html')
+
+
+def import_job_data(job):
+    return {
+        'id': job.pk,
+        'file_name': job.file_name,
+        'status': job.status,
+        'status_display': job.get_status_display(),
+        'is_finished': job.is_finished,
+        'percent': job.percent,
+        'processed': job.processed,
+        'imported': job.imported,
+        'skipped': job.skipped,
+        'error_count': job.error_count,
+        'errors': job.errors[:10],
+        'message': job.message,
+        'duration': job.duration,
+    }
+
+
+@staff_member_required
+def import_job_progress(request, pk):
+    """Admin progress page of an import job (polls import_job_status)"""
+    job = get_object_or_404(ImportJob, pk=pk)
+    return render(request, 'admin/events/import_job.html', {
+        'job': job,
+        'job_data': import_job_data(job),
+    })
+
+
+@staff_member_required
+def import_job_status(request, pk):
+    """Import job state and counts as JSON"""
+    job = get_object_or_404(ImportJob, pk=pk)
+    response = JsonResponse(import_job_data(job))
+    response['Cache-Control'] = 'no-store'
+    return response
@@ -5,3 +5,6 @@ class GalleryConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.gallery'
     verbose_name = 'Galeria'
+
+    def ready(self):
+        from . import signals  # noqa: F401
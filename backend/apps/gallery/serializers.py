@@ -1,8 +1,10 @@
 from rest_framework import serializers
+
+from apps.common.sparse_fields import SparseFieldsetMixin
 from .models import Image
 
 
-class ImageSerializer(serializers.ModelSerializer):
+class ImageSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     """
     Full serializer for Image model
     Includes all fields for create/update/retrieve operations
@@ -46,7 +48,7 @@ class ImageSerializer(serializers.ModelSerializer):
         return value
 
 
-class ImageListSerializer(serializers.ModelSerializer):
+class ImageListSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     """
     Lightweight serializer for image listings
     Only includes essential fields for better performance
@@ -0,0 +1,19 @@
+"""
+Signal handlers for the gallery app.
+
+- Invalidates cached API responses that include images
+  (apps/common/response_cache.py).
+"""
+
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from apps.common import response_cache
+from .models import Image
+
+
+@receiver(post_save, sender=Image)
+@receiver(post_delete, sender=Image)
+def image_changed(sender, raw=False, **kwargs):
+    if not raw:
+        response_cache.invalidate(Image)
@@ -1,3 +1,4 @@
+from django.core.cache import cache
 from django.test import TestCase
 from django.core.files.uploadedfile import SimpleUploadedFile
 from rest_framework.test import APITestCase
@@ -33,6 +34,9 @@ class ImageModelTest(TestCase):
 class ImageAPITest(APITestCase):
     """Test Image API endpoints"""
 
+    def setUp(self):
+        cache.clear()
+
     def test_list_images(self):
         """Test GET /api/gallery/images/"""
         response = self.client.get('/api/gallery/images/')
@@ -70,3 +74,34 @@ class ImageAPITest(APITestCase):
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertIn('tags', response.data)
         self.assertIn('nature', response.data['tags'])
+
+
+class ImageCacheTest(APITestCase):
+    """Test that cached gallery responses follow Image changes"""
+
+    def test_new_image_invalidates_list(self):
+        cache.clear()
+        Image.objects.create(title='Połonina', tags=['mountains'])
+        response = self.client.get('/api/gallery/images/')
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertEqual(self.client.get('/api/gallery/images/')['X-Cache'], 'HIT')
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Image.objects.create(title='Solina', tags=['lake'])
+        response = self.client.get('/api/gallery/images/')
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertEqual(response.data['count'], 2)
+
+
+class ImageSparseFieldsetTest(APITestCase):
+    """Test ?fields= / ?omit= on /api/gallery/images/"""
+
+    def setUp(self):
+        cache.clear()
+
+    def test_fields_and_omit(self):
+        Image.objects.create(title='Połonina', tags=['mountains'])
+        response = self.client.get('/api/gallery/images/?fields=id,title')
+        self.assertEqual(list(response.data['results'][0]), ['id', 'title'])
+        response = self.client.get('/api/gallery/images/?omit=tags,image')
+        self.assertEqual(list(response.data['results'][0]), ['id', 'title', 'uploaded_at'])
@@ -2,11 +2,13 @@ from rest_framework import viewsets
 from rest_framework.decorators import action
 from rest_framework.response import Response
 
+from apps.common import sparse_fields
+from apps.common.response_cache import CachedResponseMixin, cache_response
 from .models import Image
 from .serializers import ImageSerializer, ImageListSerializer
 
 
-class ImageViewSet(viewsets.ModelViewSet):
+class ImageViewSet(CachedResponseMixin, viewsets.ModelViewSet):
     """
     ViewSet for Image model with tag filtering
 
@@ -18,9 +20,14 @@ class ImageViewSet(viewsets.ModelViewSet):
     - PUT/PATCH /api/gallery/images/:id/ - Update image
     - DELETE /api/gallery/images/:id/ - Delete image
     - GET /api/gallery/images/tags/ - Get all unique tags
+
+    Sparse fieldsets: ?fields=id,title,image or ?omit=tags
+
+    Anonymous GETs are cached until an Image changes (apps/common/response_cache.py).
     """
     queryset = Image.objects.all()
     serializer_class = ImageSerializer
+    cache_models = ('gallery.image',)
 
     def get_serializer_class(self):
         """Use lightweight serializer for list view"""
@@ -38,6 +45,13 @@ class ImageViewSet(viewsets.ModelViewSet):
         """
         queryset = Image.objects.all()
 
+        # Only the columns of ?fields= / ?omit=
+        serializer_class = self.get_serializer_class()
+        fields = sparse_fields.selected_fields(self.request, serializer_class.Meta.fields)
+        if fields is not None:
+            needs = sparse_fields.requirements(serializer_class, fields)
+            queryset = sparse_fields.only_columns(queryset, needs, 'id', 'uploaded_at')
+
         # Get tags from query params
         # Multiple tags can be provided: ?tag=mountains&tag=sunset
         tags = self.request.query_params.getlist('tag')
@@ -50,6 +64,7 @@ class ImageViewSet(viewsets.ModelViewSet):
         return queryset.order_by('-uploaded_at')
 
     @action(detail=False, methods=['get'])
+    @cache_response
     def tags(self, request):
         """
         Get all unique tags from all images
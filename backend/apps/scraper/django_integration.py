@@ -120,13 +120,7 @@ class Command(BaseCommand):
                     )
                 else:
                     # No Facebook ID, create new event with unique slug
-                    base_slug = slug
-                    counter = 1
-                    while Event.objects.filter(slug=slug).exists():
-                        slug = f"{base_slug}-{counter}"
-                        counter += 1
-
-                    event_defaults['slug'] = slug
+                    event_defaults['slug'] = Event.objects.allocate_slugs([slug])[0]
                     event = Event.objects.create(**event_defaults)
                     created = True
 
@@ -151,6 +151,34 @@ STATICFILES_DIRS = [
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
 
+# Cache: Redis when REDIS_URL is set (docker-compose), in-process memory otherwise
+REDIS_URL = os.environ.get('REDIS_URL')
+if REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_URL,
+            'KEY_PREFIX': 'bieszczady',
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        }
+    }
+
+# Seconds an anonymous API response stays cached (see apps/common/response_cache.py);
+# data changes invalidate earlier through model versions
+RESPONSE_CACHE_TIMEOUT = int(os.environ.get('RESPONSE_CACHE_TIMEOUT', 300))
+
+# Seconds a worker keeps its hit/miss counts in memory before adding them to
+# the shared counters of /api/cache/stats/ (0 writes them on every request)
+RESPONSE_CACHE_STATS_INTERVAL = float(os.environ.get('RESPONSE_CACHE_STATS_INTERVAL', 10))
+
+# Road graph for travel-time filtering, built with `manage.py build_road_graph`
+ROAD_GRAPH_PATH = os.environ.get('ROAD_GRAPH_PATH', str(BASE_DIR / 'data' / 'roads.graph'))
+
 # Default primary key field type
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
@@ -170,6 +198,8 @@ REST_FRAMEWORK = {
         'rest_framework.filters.OrderingFilter',
     ],
     'DEFAULT_RENDERER_CLASSES': [
-        'rest_framework.renderers.JSONRenderer',
+        # JSON (default) and application/msgpack via Accept, see apps/common/renderers.py
+        'apps.common.renderers.FastJSONRenderer',
+        'apps.common.renderers.MessagePackRenderer',
     ],
 }
@@ -19,10 +19,13 @@ from django.urls import path, include
 from django.conf import settings
 from django.conf.urls.static import static
 
+from apps.common.views import ResponseCacheStatsView
+
 urlpatterns = [
     path('admin/', admin.site.urls),
     path('api/', include('apps.events.urls')),
     path('api/gallery/', include('apps.gallery.urls')),
+    path('api/cache/stats/', ResponseCacheStatsView.as_view(), name='response-cache-stats'),
 ]
 
 # Serve static and media files in development